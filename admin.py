@@ -6,43 +6,95 @@ Kickboxing Scoring System – Admin Interface
 # ====================================================
 # IMPORTS
 # ====================================================
+import os
+import re
+import sys
+import hmac
+import hashlib
+import atexit
+import signal
+import argparse
+import subprocess
+import http.client
+import urllib.parse
+import glob
 import uuid
+import math
+import bisect
+import time
+import csv
+import sqlite3
+import json
+import queue
+import collections
 import tkinter as tk
 import threading
+import traceback
+import cProfile
+import pstats
+from array import array
 import random
-from tkinter import messagebox
 from flask import Flask, request
 from flask import Flask, render_template, jsonify  # ensure jsonify is imported
 from flask import Flask, render_template, request, jsonify
+from flask import Response, stream_with_context, g
+
+# Optional: persistent WebSocket channel for judge tablets (pip install flask-sock).
+# Without it the judge pages fall back to one HTTP request per tap.
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
+
+# Optional: production WSGI server for --server waitress (pip install waitress).
+try:
+    from waitress.server import create_server as create_waitress_server
+except ImportError:
+    create_waitress_server = None
 
 # ====================================================
 # GLOBAL VARIABLES & CONFIGURATIONS
 # ====================================================
+# Launcher options
+parser = argparse.ArgumentParser(description="Kickboxing Scoring System - Admin")
+parser.add_argument("--host", default="0.0.0.0", help="Address the web interface listens on")
+parser.add_argument("--port", type=int, default=5000, help="Port of the web interface")
+parser.add_argument("--ring", default="1", help="Ring shown at launch and served by the un-prefixed routes")
+parser.add_argument("--ring-workers", type=int, default=0, metavar="N",
+                    help="Run rings 1..N each in its own worker process behind a coordinator on --port")
+parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)  # Set by the coordinator
+parser.add_argument("--judges", type=int, default=3, choices=[3, 5, 7],
+                    help="Default judge panel size for new fights")
+parser.add_argument("--weigh-in", metavar="CSV",
+                    help="Classify a weigh-in CSV (name, gender, age, discipline, weight; - for stdin) and exit")
+parser.add_argument("--server", choices=["dev", "waitress"], default="dev",
+                    help="Web server: Werkzeug development server, or waitress for production use")
+parser.add_argument("--threads", type=int, default=32,
+                    help="waitress: worker threads (each open scoreboard stream holds one)")
+parser.add_argument("--max-streams", type=int, default=None, metavar="N",
+                    help="waitress: scoreboard streams served at once (default and maximum: --threads minus "
+                         "the 8 kept for judges and polling); extra screens get 503 and should poll state.json")
+parser.add_argument("--connection-limit", type=int, default=200,
+                    help="waitress: maximum simultaneous connections")
+parser.add_argument("--backlog", type=int, default=1024,
+                    help="waitress: pending connections queued by the OS before refusing new ones")
+parser.add_argument("--keepalive-timeout", type=int, default=120,
+                    help="waitress: seconds an idle keep-alive connection is kept open")
+parser.add_argument("--headless", action="store_true",
+                    help="Run only the scoring engine and web endpoints, without the admin window")
+parser.add_argument("--results-db", metavar="FILE",
+                    help="SQLite file for completed fights (default: results.sqlite3 next to this program)")
+ARGS = parser.parse_args([])   # Defaults for importers; main() parses the real command line
+
 # Flask application instance (used for the judge web interface)
 app = Flask(__name__)
+app.url_map.redirect_defaults = False   # /ring/1/public must not redirect to /public
+sock = Sock(app) if Sock else None
 
-# Global state variables
-judge_tokens = {}         # Unique tokens for each judge (generated when a new fight starts)
-fight_over = False        # Set to True when the winner is declared
-blinking = False          # Controls if the winner text is blinking
-winner_text_global = ""   # Winner announcement text
-winner_color_global = ""  # Winner announcement text color
-red_warning_count = 0
-blue_warning_count = 0
-
-# Indicator flags for the fight state
-fighters_validated = False
-settings_validated = False
-fight_started = False     # Set to True once the fight timer starts
+# Global state variables (per-fight state lives in each Ring, see below)
+loading_ring_view = False # Set while the admin window is being refilled from another ring
 winner_label = None       # Reference to the winner label (if any)
 
-# Judge scores: Each judge (1, 2, 3) has a score for Red and Blue
-judge_scores = {
-    1: {"red": 0, "blue": 0},
-    2: {"red": 0, "blue": 0},
-    3: {"red": 0, "blue": 0}
-}
-
 # Points mappings for tatami disciplines
 tatami_points = {
     "POINT RED": {"red": 1, "blue": 0},
@@ -61,61 +113,1876 @@ ring_points = {
     "POINT BLUE": {"red": 0, "blue": 1},
 }
 
+# ====================================================
+# DATA DICTIONARIES FOR AGE & WEIGHT CATEGORIES
+# ====================================================
+authorized_ages_tatami = {
+    "Children": "(7, 8, 9 years old)",
+    "Younger Cadets": "(10, 11, 12 years old)",
+    "Older Cadets": "(13, 14, 15 years old)",
+    "Juniors": "(16, 17, 18 years old)",
+    "Seniors": "(from age 19 to 40)",
+    "Masters": "(from age 41 to 55)"
+}
+authorized_ages_ring = {
+    "Younger Juniors": "(15, 16 years old)",
+    "Older Juniors": "(17, 18 years old)",
+    "Seniors": "(19–40 years old)"
+}
+
+ring_age_dict = {
+    "Full Contact": ["Younger Juniors", "Older Juniors", "Seniors"],
+    "Low Kick": ["Younger Juniors", "Older Juniors", "Seniors"],
+    "K-1": ["Younger Juniors", "Older Juniors", "Seniors"]
+}
+tatami_age_dict = {
+    "Point Fighting": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"],
+    "Light Contact": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"],
+    "Kick Light": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"],
+    "Forms": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"]
+}
+
+weight_dict = {
+    "Female_Ring": {
+        "Younger Juniors": ["-36 kg", "-40 kg", "-44 kg", "-48 kg", "-52 kg", "-56 kg", "-60 kg", "+60 kg"],
+        "Older Juniors": ["-48 kg", "-52 kg", "-56 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"],
+        "Seniors": ["-48 kg", "-52 kg", "-56 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"]
+    },
+    "Ring_Male": {
+        "Younger Juniors": ["-42 kg", "-45 kg", "-48 kg", "-51 kg", "-54 kg", "-57 kg", "-60 kg", "-63.5 kg", "-67 kg", "-71 kg", "-75 kg", "-81 kg", "+81 kg"],
+        "Older Juniors": ["-51 kg", "-54 kg", "-57 kg", "-60 kg", "-63.5 kg", "-67 kg", "-71 kg", "-75 kg", "-81 kg", "-86 kg", "-91 kg", "+91 kg"],
+        "Seniors": ["-51 kg", "-54 kg", "-57 kg", "-60 kg", "-63.5 kg", "-67 kg", "-71 kg", "-75 kg", "-81 kg", "-86 kg", "-91 kg", "+91 kg"]
+    },
+    "Tatami_Male": {
+        "Children": ["-18 kg", "-21 kg", "-24 kg", "-27 kg", "-30 kg", "-33 kg", "-36 kg", "+36 kg"],
+        "Younger Cadets": ["-28 kg", "-32 kg", "-37 kg", "-42 kg", "-47 kg", "+47 kg"],
+        "Older Cadets": ["-32 kg", "-37 kg", "-42 kg", "-47 kg", "-52 kg", "-57 kg", "-63 kg", "-69 kg", "+69 kg"],
+        "Juniors": ["-57 kg", "-63 kg", "-69 kg", "-74 kg", "-79 kg", "-84 kg", "-89 kg", "-94 kg", "+94 kg"],
+        "Seniors": ["-57 kg", "-63 kg", "-69 kg", "-74 kg", "-79 kg", "-84 kg", "-89 kg", "-94 kg", "+94 kg"],
+        "Masters": ["-63 kg", "-74 kg", "-84 kg", "-94 kg", "+94 kg"]
+    },
+    "Tatami_Female": {
+        "Children": ["-18 kg", "-21 kg", "-24 kg", "-27 kg", "-30 kg", "-33 kg", "-36 kg", "+36 kg"],
+        "Younger Cadets": ["-28 kg", "-32 kg", "-37 kg", "-42 kg", "-47 kg", "+47 kg"],
+        "Older Cadets": ["-32 kg", "-37 kg", "-42 kg", "-46 kg", "-50 kg", "-55 kg", "-60 kg", "-65 kg", "+65 kg"],
+        "Juniors": ["-50 kg", "-55 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"],
+        "Seniors": ["-50 kg", "-55 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"],
+        "Masters": ["-55 kg", "-65 kg", "+65 kg"]
+    }
+}
+
+def weight_table_key(discipline_name, gender):
+    """
+    Key of `weight_dict` for a discipline and gender.
+    """
+    if discipline_name in tatami_age_dict:
+        return "Tatami_Female" if gender == "Female" else "Tatami_Male"
+    return "Female_Ring" if gender == "Female" else "Ring_Male"
+
+def build_category_index():
+    """
+    Flatten the tables above into one lookup, built once at start-up:
+    (discipline, gender, age category) -> {"weights": [...], "authorized_ages": "..."}.
+    """
+    index = {}
+    for age_dict, authorized_ages in ((ring_age_dict, authorized_ages_ring),
+                                      (tatami_age_dict, authorized_ages_tatami)):
+        for discipline_name, ages in age_dict.items():
+            for gender in ("Male", "Female"):
+                weights = weight_dict[weight_table_key(discipline_name, gender)]
+                for age in ages:
+                    index[(discipline_name, gender, age)] = {
+                        "weights": weights.get(age, []),
+                        "authorized_ages": authorized_ages.get(age, "N/A"),
+                    }
+    return index
+
+CATEGORY_INDEX = build_category_index()
+DISCIPLINE_AGES = {**{name: ("ring", ages) for name, ages in ring_age_dict.items()},
+                   **{name: ("tatami", ages) for name, ages in tatami_age_dict.items()}}
+
+# The same catalogue for registration tools and tablets (GET /categories.json).
+CATEGORIES_JSON = json.dumps({
+    "disciplines": {name: {"layout": layout, "age_categories": ages}
+                    for name, (layout, ages) in DISCIPLINE_AGES.items()},
+    "categories": [{"discipline": discipline_name, "gender": gender, "age_category": age, **entry}
+                   for (discipline_name, gender, age), entry in CATEGORY_INDEX.items()],
+})
+CATEGORIES_ETAG = hashlib.sha1(CATEGORIES_JSON.encode("utf-8")).hexdigest()[:16]
+
+# ----------------------------------------------------
+# Weigh-in classifier (--weigh-in FILE.csv)
+# ----------------------------------------------------
+WEIGH_IN_FIELDS = ["name", "gender", "age", "discipline", "weight"]
+
+def parse_weight_label(label):
+    """
+    "-57 kg" -> ("-", 57.0), i.e. up to and including 57 kg; "+94 kg" -> ("+", 94.0), over 94 kg.
+    """
+    return label[0], float(label[1:].split()[0])
+
+def parse_age_range(text):
+    """
+    "(7, 8, 9 years old)" -> (7, 9); "(from age 19 to 40)" -> (19, 40).
+    """
+    ages = [int(age) for age in re.findall(r"\d+", text)]
+    return min(ages), max(ages)
+
+def build_weight_bounds():
+    """
+    Per CATEGORY_INDEX key: (sorted upper limits, their labels, open-ended "+" label and limit).
+    """
+    bounds = {}
+    for key, entry in CATEGORY_INDEX.items():
+        limits = []
+        heavy = None
+        for label in entry["weights"]:
+            sign, value = parse_weight_label(label)
+            if sign == "+":
+                heavy = (label, value)
+            else:
+                limits.append((value, label))
+        limits.sort()
+        bounds[key] = ([value for value, _ in limits], [label for _, label in limits], heavy)
+    return bounds
+
+def build_age_bounds():
+    """
+    Per discipline: (sorted lowest ages, (lowest, highest, age category) per category).
+    """
+    bounds = {}
+    for discipline_name, (layout, ages) in DISCIPLINE_AGES.items():
+        authorized_ages = authorized_ages_tatami if layout == "tatami" else authorized_ages_ring
+        ranges = sorted(parse_age_range(authorized_ages[age]) + (age,) for age in ages)
+        bounds[discipline_name] = ([low for low, _, _ in ranges], ranges)
+    return bounds
+
+WEIGHT_BOUNDS = build_weight_bounds()
+AGE_BOUNDS = build_age_bounds()
+
+def classify_athlete(discipline_name, gender, age, weight):
+    """
+    Age and weight category for one athlete, by binary search over the parsed
+    boundaries. Returns (age category, weight category, problem); problem is
+    "" when the athlete fits, otherwise why not (and the categories may be "").
+    """
+    if discipline_name not in AGE_BOUNDS:
+        return "", "", f"unknown discipline {discipline_name!r}"
+    lows, ranges = AGE_BOUNDS[discipline_name]
+    i = bisect.bisect_right(lows, age) - 1
+    if i < 0 or age > ranges[i][1]:
+        return "", "", f"no age category for age {age} in {discipline_name}"
+    age_category = ranges[i][2]
+    limits, labels, heavy = WEIGHT_BOUNDS[(discipline_name, gender, age_category)]
+    i = bisect.bisect_left(limits, weight)
+    if i < len(limits):
+        return age_category, labels[i], ""
+    if heavy and weight > heavy[1]:
+        return age_category, heavy[0], ""
+    return age_category, "", f"no weight category for {weight} kg in {age_category}"
+
+def classify_weigh_in(rows):
+    """
+    Classify a stream of weigh-in rows (dicts with WEIGH_IN_FIELDS, e.g. from
+    csv.DictReader); yields each row with age_category, weight_category and problem added.
+    """
+    genders = {"m": "Male", "f": "Female"}
+    for row in rows:
+        row = dict(row)
+        gender = genders.get((row.get("gender") or "").strip()[:1].lower())
+        try:
+            age = int(row.get("age") or "")
+            weight = float((row.get("weight") or "").replace(",", ".").lower().replace("kg", ""))
+        except ValueError:
+            age = weight = None
+        if gender is None:
+            row.update(age_category="", weight_category="", problem=f"unknown gender {row.get('gender')!r}")
+        elif age is None:
+            row.update(age_category="", weight_category="", problem="age or weight is not a number")
+        else:
+            age_category, weight_category, problem = classify_athlete(
+                (row.get("discipline") or "").strip(), gender, age, weight)
+            row.update(age_category=age_category, weight_category=weight_category, problem=problem)
+        yield row
+
+def run_weigh_in(path):
+    """
+    Classify a weigh-in CSV ("-" for stdin): the classified rows go to stdout as
+    CSV, athletes who fit no category are listed on stderr.
+    """
+    source = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    started = time.perf_counter()
+    total = unplaced = 0
+    with source:
+        reader = csv.DictReader(source)
+        fields = list(reader.fieldnames or WEIGH_IN_FIELDS) + ["age_category", "weight_category", "problem"]
+        writer = csv.DictWriter(sys.stdout, fieldnames=fields)
+        writer.writeheader()
+        for row in classify_weigh_in(reader):
+            writer.writerow(row)
+            total += 1
+            if row["problem"]:
+                unplaced += 1
+                print(f"Unplaced: {row.get('name', '')}: {row['problem']}", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    print(f"{total} athletes classified in {elapsed:.3f} s, {unplaced} unplaced", file=sys.stderr)
+
+
+# ====================================================
+# FIGHT STATE ENGINE (no Tk, safe to read from the Flask thread)
+# ====================================================
+class ScoreMatrix:
+    """
+    Every judge's points in one flat array of ints, indexed by judge, corner
+    and round: cell ((judge - 1) * 2 + corner) * rounds + (round - 1), with
+    corner 0 = red and 1 = blue. A judge's red and blue rows are contiguous,
+    so per-judge totals are slice sums and the panel is compared in one pass.
+    """
+    __slots__ = ("judges", "rounds", "cells")
+    CORNERS = {"red": 0, "blue": 1}
+
+    def __init__(self, judges, rounds):
+        self.judges = judges
+        self.rounds = rounds
+        self.cells = array("l", [0]) * (judges * 2 * rounds)
+
+    def add(self, judge_num, color, round_num, points):
+        round_num = min(round_num, self.rounds)
+        self.cells[((judge_num - 1) * 2 + self.CORNERS[color]) * self.rounds + round_num - 1] += points
+
+    def add_all(self, color, round_num, points):
+        for judge_num in range(1, self.judges + 1):
+            self.add(judge_num, color, round_num, points)
+
+    def corner_totals(self):
+        """
+        Fight totals as two lists, (red, blue), each with one entry per judge.
+        """
+        r = self.rounds
+        sums = [sum(self.cells[i:i + r]) for i in range(0, len(self.cells), r)]
+        return sums[0::2], sums[1::2]
+
+    def margins(self):
+        """
+        Red minus blue, per judge.
+        """
+        red, blue = self.corner_totals()
+        return [r - b for r, b in zip(red, blue)]
+
+class FightState:
+    """
+    Headless fight engine: judge scores, warnings, rounds, timer and result.
+
+    The Tk admin window and the Flask routes are both thin views over one
+    instance; nothing in here touches a widget. Every change is recorded to
+    `journal` (if set) so a crashed fight can be replayed.
+
+    The clock is a time.monotonic() deadline while running and a stored
+    remainder while paused; `time_left` is always derived from those, never
+    counted down, so slow frames cannot make the fight run long.
+    """
+    __slots__ = ("matrix", "red_warnings", "blue_warnings",
+                 "current_round", "total_rounds", "round_duration", "break_duration",
+                 "mode", "_deadline", "_remaining", "started", "over",
+                 "winner_text", "winner_color", "info", "judge_seq", "journal", "fight_id",
+                 "_checkpointed")
+
+    def __init__(self, total_rounds=3, round_duration=180, break_duration=45, judges=3):
+        self.journal = None
+        self.matrix = ScoreMatrix(judges, total_rounds)
+        self._deadline = None   # time.monotonic() at which the current phase ends, while running
+        self._remaining = 0.0   # Seconds left in the current phase, while paused
+        self.info = {"red_name": "", "red_club": "", "blue_name": "", "blue_club": "",
+                     "discipline": "", "age_category": "", "weight_category": ""}
+        self.reset(total_rounds, round_duration, break_duration)
+
+    def _record(self, kind, **fields):
+        if self.journal is not None:
+            self.journal.append(kind, time_left=round(self.remaining(), 3), **fields)
+
+    def reset(self, total_rounds=None, round_duration=None, break_duration=None, judges=None):
+        """
+        Clear scores, warnings, clock and result for a new fight.
+        Fighter and category info is kept; the admin refreshes it separately.
+        """
+        if total_rounds is not None:
+            self.total_rounds = total_rounds
+        if round_duration is not None:
+            self.round_duration = round_duration
+        if break_duration is not None:
+            self.break_duration = break_duration
+        self.matrix = ScoreMatrix(judges or self.judges, self.total_rounds)
+        self.red_warnings = 0
+        self.blue_warnings = 0
+        self.current_round = 1
+        self.mode = "round"   # Can be "round" or "break"
+        self.time_left = self.round_duration
+        self.timer_running = False
+        self.started = False
+        self.over = False
+        self.winner_text = ""
+        self.winner_color = ""
+        self.judge_seq = {}   # Judge number -> sequence number of the last batched score applied
+        self._checkpointed = None   # Clock second last written by checkpoint()
+        self.fight_id = uuid.uuid4().hex   # Identifies the fight in the results store
+        self._record("reset", total_rounds=self.total_rounds, round_duration=self.round_duration,
+                     break_duration=self.break_duration, judges=self.judges, info=dict(self.info),
+                     fight_id=self.fight_id)
+
+    def set_info(self, **fields):
+        """
+        Update fighter and category details (names, clubs, discipline, age, weight).
+        """
+        changed = {key: value for key, value in fields.items() if self.info.get(key) != value}
+        if changed:
+            self.info.update(changed)
+            self._record("info", **changed)
+
+    def configure(self, total_rounds, round_duration, break_duration, judges=None):
+        """
+        Apply validated fight settings; the clock and the judge panel (size and
+        number of rounds) are reset only before the fight starts.
+        """
+        self.total_rounds = total_rounds
+        self.round_duration = round_duration
+        self.break_duration = break_duration
+        if not self.started:
+            self.time_left = round_duration
+            self.matrix = ScoreMatrix(judges or self.judges, total_rounds)
+        self._record("configure", total_rounds=total_rounds, round_duration=round_duration,
+                     break_duration=break_duration, judges=self.judges)
+
+    # -- Clock --
+    def remaining(self):
+        """
+        Seconds left in the current round or break, with sub-second resolution.
+        """
+        if self._deadline is None:
+            return self._remaining
+        return max(0.0, self._deadline - time.monotonic())
+
+    @property
+    def time_left(self):
+        """
+        Whole seconds left, rounded up: the clock shows 00:01 until time is really out.
+        """
+        return math.ceil(self.remaining())
+
+    @time_left.setter
+    def time_left(self, seconds):
+        if self._deadline is None:
+            self._remaining = float(seconds)
+        else:
+            self._deadline = time.monotonic() + seconds
+
+    @property
+    def timer_running(self):
+        return self._deadline is not None
+
+    @timer_running.setter
+    def timer_running(self, running):
+        if running and self._deadline is None:
+            self._deadline = time.monotonic() + self._remaining
+        elif not running and self._deadline is not None:
+            self._remaining = self.remaining()
+            self._deadline = None
+
+    def _begin_phase(self, duration):
+        if self._deadline is None:
+            self._remaining = float(duration)
+        else:
+            # Measured from when the previous phase ended, not from when the tick noticed.
+            self._deadline += duration
+
+    def checkpoint(self):
+        """
+        Journal the running clock once per displayed second, so a crash during
+        a stretch without taps loses at most a second; replay takes the newest one.
+        """
+        if self.timer_running and self.time_left != self._checkpointed:
+            self._checkpointed = self.time_left
+            self._record("clock")
+
+    def next_display_change(self):
+        """
+        Seconds until the displayed clock changes, or None while it is paused.
+        """
+        if self._deadline is None:
+            return None
+        left = self.remaining()
+        return left - math.ceil(left) + 1
+
+    def start(self):
+        """
+        Start the fight on first use, then (re)start the clock.
+        Returns True if the clock was not already running.
+        """
+        if not self.started:
+            self.started = True
+            self.current_round = 1
+            self.time_left = self.round_duration
+        if self.timer_running:
+            return False
+        self.timer_running = True
+        self._record("start")
+        return True
+
+    def stop(self):
+        """
+        Pause the clock.
+        """
+        self.timer_running = False
+        self._record("stop")
+
+    def tick(self):
+        """
+        Bring the fight clock up to date; only the display depends on how often
+        this runs. At most one phase change per call, so call again after one.
+
+        Returns "tick" while counting down, "break" or "round" on a phase change,
+        "end" when the last round runs out, or None if the clock is idle.
+        """
+        if self.remaining() > 0:
+            return "tick" if self.timer_running else None
+        if self.mode == "round":
+            # If there is another round to be played, start a break period.
+            if self.current_round < self.total_rounds:
+                self.mode = "break"
+                self._begin_phase(self.break_duration)
+                self._record("phase", event="break")
+                return "break"
+            self.timer_running = False
+            self._record("phase", event="end")
+            return "end"
+        # Transition back to a new round after a break.
+        self.current_round += 1
+        self.mode = "round"
+        self._begin_phase(self.round_duration)
+        self._record("phase", event="round")
+        return "round"
+
+    def clock_text(self):
+        time_left = self.time_left
+        minutes = time_left // 60
+        seconds = time_left % 60
+        return f"{minutes:02d}:{seconds:02d}"
+
+    def round_text(self):
+        if self.mode == "break":
+            return f"Break after Round {self.current_round}"
+        return f"Round: {self.current_round} / {self.total_rounds}"
+
+    def display_text(self):
+        """
+        Text shown on the big clock: the winner once decided, the time otherwise.
+        """
+        return self.winner_text if self.winner_text else self.clock_text()
+
+    # -- Scoring --
+    @property
+    def judges(self):
+        return self.matrix.judges
+
+    @property
+    def scores(self):
+        """
+        Fight totals per judge: {judge number: {"red": points, "blue": points}}.
+        """
+        red, blue = self.matrix.corner_totals()
+        return {judge_num: {"red": r, "blue": b} for judge_num, (r, b) in enumerate(zip(red, blue), 1)}
+
+    def card(self, judge_num):
+        """
+        One judge's fight totals, {"red": points, "blue": points}.
+        """
+        return self.scores.get(judge_num, {})
+
+    def is_tatami(self):
+        return self.info["discipline"] in tatami_age_dict
+
+    def can_score(self):
+        """
+        Judges may only score while the fight is started, running and in a round
+        that has time left (even if the tick ending it has not run yet).
+        """
+        return self.started and self.timer_running and self.mode == "round" and self.remaining() > 0
+
+    def points_for(self, scoring_action):
+        table = tatami_points if self.is_tatami() else ring_points
+        return table.get(scoring_action)
+
+    def apply_score(self, judge_num, color, scoring_action, seq=None):
+        """
+        Add the points of a scoring action to one judge's card; `seq` is the
+        judge's sequence number for scores sent in batches.
+        Returns the points added, or None if the action is not valid for the discipline.
+        """
+        points = self.points_for(scoring_action)
+        if not points or not 1 <= judge_num <= self.judges:
+            return None
+        self.matrix.add(judge_num, color, self.current_round, points[color])
+        if seq is None:
+            self._record("score", judge=judge_num, color=color, action=scoring_action)
+        else:
+            self.judge_seq[judge_num] = max(seq, self.judge_seq.get(judge_num, 0))
+            self._record("score", judge=judge_num, color=color, action=scoring_action, seq=seq)
+        return points[color]
+
+    def favorable(self):
+        """
+        Count the judges currently favouring each corner; returns (red, blue).
+        """
+        margins = self.matrix.margins()
+        return sum(m > 0 for m in margins), sum(m < 0 for m in margins)
+
+    def early_stop_winner(self):
+        """
+        In kick light and light contact only: a corner ahead by at least 15 points
+        on a majority of the panel (2 of 3, 3 of 5, 4 of 7 judges) wins.
+        Returns "red", "blue" or None.
+        """
+        if self.info["discipline"].lower() not in ["kick light", "light contact"]:
+            return None
+        margins = self.matrix.margins()
+        needed = self.judges // 2 + 1
+        if sum(m >= 15 for m in margins) >= needed:
+            return "red"
+        if sum(m <= -15 for m in margins) >= needed:
+            return "blue"
+        return None
+
+    # -- Warnings & results --
+    def can_warn(self):
+        return self.started and not self.over and self.mode == "round"
+
+    def apply_warning(self, color):
+        """
+        Give a warning to one corner: every judge adds 3 points to the opponent.
+        Returns True if this was the fourth warning and the corner is disqualified.
+        """
+        opponent = "blue" if color == "red" else "red"
+        if color == "red":
+            self.red_warnings += 1
+            count = self.red_warnings
+        else:
+            self.blue_warnings += 1
+            count = self.blue_warnings
+        self.matrix.add_all(opponent, self.current_round, 3)
+        if count >= 4:
+            self.declare_winner(opponent, f"WINNER {opponent.upper()} (DISQUALIFIED)")
+        self._record("warning", color=color)
+        return count >= 4
+
+    def ko(self, loser):
+        """
+        Knockout of the given corner; victory goes to the opponent.
+        """
+        winner = "blue" if loser == "red" else "red"
+        self.declare_winner(winner, f"WINNER {winner.upper()} (KO)")
+        self._record("ko", loser=loser)
+
+    def end_by_points(self, winning_side):
+        self.declare_winner(winning_side, f"WINNER {winning_side.upper()}")
+        self._record("end_by_points", side=winning_side)
+
+    def decide_by_judges(self):
+        """
+        Decision at the end of the last round, by number of favourable judges.
+        """
+        favorable_red, favorable_blue = self.favorable()
+        if favorable_red > favorable_blue:
+            self.declare_winner("red", "WINNER RED")
+        elif favorable_blue > favorable_red:
+            self.declare_winner("blue", "WINNER BLUE")
+        else:
+            self.declare_winner("", "DRAW")
+        self._record("decision")
+
+    def declare_winner(self, color, text):
+        self.timer_running = False
+        self.over = True
+        self.winner_text = text
+        self.winner_color = color if color else "black"
+
+    def result(self):
+        """
+        Plain-data record of a decided fight for the results store, with every
+        judge's points per round as (judge, round, red, blue) rows.
+        """
+        m = self.matrix
+        rounds = [(judge_num, round_num,
+                   m.cells[((judge_num - 1) * 2) * m.rounds + round_num - 1],
+                   m.cells[((judge_num - 1) * 2 + 1) * m.rounds + round_num - 1])
+                  for judge_num in range(1, m.judges + 1) for round_num in range(1, m.rounds + 1)]
+        return {
+            "fight_id": self.fight_id,
+            "winner": self.winner_color if self.winner_color in ("red", "blue") else "",
+            "result": self.winner_text,
+            "red_warnings": self.red_warnings,
+            "blue_warnings": self.blue_warnings,
+            "total_rounds": self.total_rounds,
+            "judges": self.judges,
+            "scores": rounds,
+            **self.info,
+        }
+
+    def snapshot(self):
+        """
+        Plain-data copy of the state, for web views and other threads.
+        """
+        favorable_red, favorable_blue = self.favorable()
+        return {
+            "judges": self.judges,
+            "scores": self.scores,
+            "red_favorable": favorable_red,
+            "blue_favorable": favorable_blue,
+            "red_warnings": self.red_warnings,
+            "blue_warnings": self.blue_warnings,
+            "round": self.current_round,
+            "total_rounds": self.total_rounds,
+            "mode": self.mode,
+            "time_left": self.time_left,
+            "timer_running": self.timer_running,
+            "started": self.started,
+            "over": self.over,
+            "winner_text": self.winner_text,
+            "winner_color": self.winner_color,
+            "round_info": self.round_text(),
+            "timer_info": self.display_text(),
+            **self.info,
+        }
+
+# ====================================================
+# FIGHT JOURNAL (append-only, group commit, crash replay)
+# ====================================================
+JOURNAL_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class FightJournal:
+    """
+    Append-only JSON-lines log of every fight state change.
+
+    append() only queues the record; a writer thread writes everything pending
+    and fsyncs once per batch (group commit), so a burst of taps costs one disk
+    flush. replay() rebuilds a FightState from the last fight in the file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._cond = threading.Condition()
+        self._pending = []
+        self.appended = 0
+        self.written = 0
+        self.commits = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def append(self, kind, **fields):
+        line = json.dumps({"ts": time.time(), "kind": kind, **fields}) + "\n"
+        with self._cond:
+            self._pending.append(line)
+            self.appended += 1
+            self._cond.notify_all()
+
+    def _writer(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, []
+            # Everything queued while the previous fsync ran goes out in this one.
+            self._file.write("".join(batch))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            with self._cond:
+                self.written += len(batch)
+                self.commits += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Block until every appended record is on disk; returns False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self.written >= self.appended, timeout)
+
+    def close(self):
+        """
+        Write whatever is pending, then stop the writer and close the file.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self._file.close()
+
+    def replay(self, state):
+        """
+        Rebuild `state` from the last fight recorded in the journal.
+
+        Returns that fight's judge tokens ({} if the journal holds no fight). The clock
+        is restored to the last recorded time (every record carries it, "clock"
+        checkpoints included) and left paused for the official to restart.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return {}
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break   # Torn last line from a crash mid-write
+        starts = [i for i, record in enumerate(records) if record["kind"] == "reset"]
+        if not starts:
+            return {}
+
+        tokens = {}
+        journal, state.journal = state.journal, None
+        try:
+            for record in records[starts[-1]:]:
+                kind = record["kind"]
+                if kind == "reset":
+                    state.info.update(record["info"])
+                    state.reset(record["total_rounds"], record["round_duration"], record["break_duration"],
+                                record.get("judges"))
+                    state.fight_id = record.get("fight_id", state.fight_id)
+                elif kind == "tokens":
+                    tokens = {int(judge): token for judge, token in record["tokens"].items()}
+                elif kind == "info":
+                    state.set_info(**{key: value for key, value in record.items() if key in state.info})
+                elif kind == "configure":
+                    state.configure(record["total_rounds"], record["round_duration"], record["break_duration"],
+                                    record.get("judges"))
+                elif kind == "start":
+                    state.start()
+                elif kind == "stop":
+                    state.stop()
+                elif kind == "phase":
+                    state.time_left = 0
+                    state.tick()
+                elif kind == "score":
+                    state.apply_score(record["judge"], record["color"], record["action"], record.get("seq"))
+                elif kind == "warning":
+                    state.apply_warning(record["color"])
+                elif kind == "ko":
+                    state.ko(record["loser"])
+                elif kind == "end_by_points":
+                    state.end_by_points(record["side"])
+                elif kind == "decision":
+                    state.decide_by_judges()
+                state.time_left = record.get("time_left", state.time_left)
+        finally:
+            state.journal = journal
+        state.timer_running = False
+        return tokens
+
+# ====================================================
+# RESULTS STORE (SQLite in WAL mode, batched background writes)
+# ====================================================
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fights (
+    fight_id        TEXT PRIMARY KEY,
+    ring            TEXT NOT NULL,
+    finished_at     REAL NOT NULL,   -- Unix time
+    discipline      TEXT NOT NULL,
+    age_category    TEXT NOT NULL,
+    weight_category TEXT NOT NULL,
+    red_name        TEXT NOT NULL,
+    red_club        TEXT NOT NULL,
+    blue_name       TEXT NOT NULL,
+    blue_club       TEXT NOT NULL,
+    winner          TEXT NOT NULL,   -- "red", "blue", or "" for a draw
+    result          TEXT NOT NULL,   -- As shown on the clock, e.g. "WINNER RED (KO)"
+    red_warnings    INTEGER NOT NULL,
+    blue_warnings   INTEGER NOT NULL,
+    total_rounds    INTEGER NOT NULL,
+    judges          INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS judge_scores (
+    fight_id TEXT NOT NULL REFERENCES fights (fight_id),
+    judge    INTEGER NOT NULL,
+    round    INTEGER NOT NULL,
+    red      INTEGER NOT NULL,
+    blue     INTEGER NOT NULL,
+    PRIMARY KEY (fight_id, judge, round)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fights_red_name ON fights (red_name);
+CREATE INDEX IF NOT EXISTS fights_blue_name ON fights (blue_name);
+CREATE INDEX IF NOT EXISTS fights_category ON fights (discipline, age_category, weight_category);
+CREATE INDEX IF NOT EXISTS fights_ring ON fights (ring, finished_at);
+"""
+RESULTS_COLUMNS = ("fight_id", "ring", "finished_at", "discipline", "age_category", "weight_category",
+                   "red_name", "red_club", "blue_name", "blue_club", "winner", "result",
+                   "red_warnings", "blue_warnings", "total_rounds", "judges")
+RESULTS_BUSY_TIMEOUT_SEC = 10   # Ring workers share the file, so a writer may wait for another's lock
+
+class ResultsStore:
+    """
+    Every completed fight, kept in SQLite: one row per fight (fighters,
+    category, ring, result) and one per judge and round.
+
+    save() only queues the result; a writer thread owns the connection and
+    commits everything pending in one transaction, so the Tk and Flask threads
+    never wait on disk. WAL mode lets exports and reports read while fights
+    are being written. Saving is keyed on fight_id, so a finished fight
+    replayed from its journal is not stored twice.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._cond = threading.Condition()
+        self._pending = []
+        self.queued = 0
+        self.written = 0
+        self.commits = 0
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=RESULTS_BUSY_TIMEOUT_SEC)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # Durable at each WAL checkpoint; fast commits
+        return conn
+
+    def save(self, ring_id, result):
+        """
+        Queue a FightState.result() for writing.
+        """
+        row = dict(result, ring=ring_id, finished_at=time.time())
+        with self._cond:
+            self._pending.append(row)
+            self.queued += 1
+            self._cond.notify_all()
+
+    def _writer(self):
+        conn = self.connect()
+        conn.executescript(RESULTS_SCHEMA)
+        insert_fight = (f"INSERT OR IGNORE INTO fights ({', '.join(RESULTS_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' * len(RESULTS_COLUMNS))})")
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                batch, self._pending = self._pending, []
+            try:
+                with conn:
+                    for row in batch:
+                        if conn.execute(insert_fight, [row[column] for column in RESULTS_COLUMNS]).rowcount:
+                            conn.executemany("INSERT INTO judge_scores (fight_id, judge, round, red, blue) "
+                                             "VALUES (?, ?, ?, ?, ?)",
+                                             [(row["fight_id"], *score) for score in row["scores"]])
+            except sqlite3.Error as e:
+                print(f"Could not save {len(batch)} fight result(s) to {self.path}: {e}", file=sys.stderr)
+            with self._cond:
+                self.written += len(batch)
+                self.commits += 1
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued result has been written; returns False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self.written >= self.queued, timeout)
+
+results_store = None   # ResultsStore, opened by main()
+
+# ====================================================
+# SCORE INGESTION QUEUE (Flask threads -> Tk loop)
+# ====================================================
+DRAIN_INTERVAL_MS = 16    # One drain per display frame (~60 Hz)
+
+class ScoreQueue:
+    """
+    Thread-safe inbox of judge score events.
+
+    Flask handlers only append; the Tk loop drains everything pending once per
+    frame, applies it to the fight state and redraws once. The counters let us
+    check that every accepted tap was applied, or else rejected or discarded.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = collections.deque()
+        self.enqueued = 0
+        self.applied = 0
+        self.discarded = 0           # Taps still pending when a new fight was started
+        self.rejected = 0            # Taps refused when drained: the round or fight ended after they were queued
+        self.max_depth = 0
+        self.last_latency_ms = 0.0   # Age of the oldest event in the last non-empty drain
+        self.max_latency_ms = 0.0
+
+    def put(self, judge_num, color, scoring_action, done=None, seq=None):
+        """
+        Queue one score; `done` (a threading.Event) is set once it has been applied.
+        """
+        with self._lock:
+            self._events.append((judge_num, color, scoring_action, time.monotonic(), done, seq))
+            self.enqueued += 1
+            if len(self._events) > self.max_depth:
+                self.max_depth = len(self._events)
+
+    def drain(self):
+        """
+        Remove and return every pending event, oldest first.
+        """
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        if events:
+            latency_ms = (time.monotonic() - events[0][3]) * 1000
+            self.last_latency_ms = latency_ms
+            self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        return events
+
+    def discard(self):
+        """
+        Drop pending events (used when the fight they belong to is reset).
+        """
+        with self._lock:
+            self.discarded += len(self._events)
+            self._events.clear()
+
+    def depth(self):
+        return len(self._events)
+
+    def stats(self):
+        return {
+            "depth": self.depth(),
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "applied": self.applied,
+            "discarded": self.discarded,
+            "rejected": self.rejected,
+            "last_drain_latency_ms": round(self.last_latency_ms, 2),
+            "max_drain_latency_ms": round(self.max_latency_ms, 2),
+        }
+
+# ====================================================
+# METRICS (GET /metrics, Prometheus text format)
+# ====================================================
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Why a score was refused, by the message the judge gets back.
+REJECTION_REASONS = {
+    "Unauthorized access: invalid token": "invalid_token",
+    "Scoring not allowed at this time.": "not_scoring",
+    "Invalid input": "invalid_input",
+    "Invalid scoring action": "invalid_action",
+}
+
+class Metrics:
+    """
+    Counters and histograms for /metrics, kept in plain dicts keyed by label values.
+
+    Updates take one lock and touch one entry, so they are cheap enough for the
+    request and drain hot paths. render() writes the Prometheus text format;
+    gauges that are just current state (spectators, queue depth) are read at
+    scrape time instead of being tracked.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}   # Metric name -> {label values: [bucket counts..., sum, count]}
+        self._counters = {}     # Metric name -> {label values: count}
+        self._gauges = {}       # Metric name -> {label values: value}
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            counts = series.get(labels)
+            if counts is None:
+                counts = series[labels] = [0] * (len(buckets) + 3)   # Buckets, +Inf, sum, count
+            counts[bisect.bisect_left(buckets, value)] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    def set(self, name, labels, value):
+        with self._lock:
+            self._gauges.setdefault(name, {})[labels] = value
+
+    def render(self, families, current_gauges, buckets=LATENCY_BUCKETS):
+        """
+        The exposition text. `families` maps each name to (label names, help);
+        `current_gauges` is {name: {label values: value}} for the gauges computed
+        at scrape time.
+        """
+        with self._lock:
+            histograms = {name: {labels: list(counts) for labels, counts in series.items()}
+                          for name, series in self._histograms.items()}
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+        gauges.update(current_gauges)
+        lines = []
+        for name, series in histograms.items():
+            label_names, help_text = families[name]
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for labels, counts in sorted(series.items()):
+                pairs = list(zip(label_names, labels))
+                cumulative = 0
+                for bound, count in zip(buckets + (math.inf,), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f"{name}_bucket{metric_labels(pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{name}_sum{metric_labels(pairs)} {counts[-2]:.6f}")
+                lines.append(f"{name}_count{metric_labels(pairs)} {counts[-1]}")
+        for kind, series_by_name in (("counter", counters), ("gauge", gauges)):
+            for name, series in series_by_name.items():
+                label_names, help_text = families[name]
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{metric_labels(zip(label_names, labels))} {value}")
+        return "\n".join(lines) + "\n"
+
+def metric_labels(pairs):
+    """
+    {name="value",...} for a series, or "" if it has no labels.
+    """
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in pairs]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+metrics = Metrics()
+
+# Every metric family: name -> (label names, help text).
+METRIC_FAMILIES = {
+    "kickboxing_http_request_duration_seconds": (("route", "method"),
+        "Time to produce a response (for streams, until the stream starts)."),
+    "kickboxing_http_requests_total": (("route", "method", "status"), "HTTP responses sent."),
+    "kickboxing_score_events_total": (("ring", "judge"), "Judge scores applied to a fight."),
+    "kickboxing_scores_rejected_total": (("reason",), "Judge scores refused, by reason."),
+    "kickboxing_spectators": (("ring",), "Scoreboards connected to the live stream."),
+    "kickboxing_score_queue_depth": (("ring",), "Judge scores waiting for the next drain."),
+    "kickboxing_tk_loop_lag_seconds": (("callback",),
+        "How late a scheduled callback ran after it was due (Tk loop, or the --headless engine loop)."),
+    "kickboxing_tk_loop_lag_last_seconds": (("callback",), "Lag of the most recent run of each callback."),
+    "kickboxing_tk_callback_seconds": (("callback",), "Time spent inside each scheduled Tk callback."),
+    "kickboxing_tk_loop_stalls_total": ((), "Times the Tk loop was blocked for longer than LOOP_STALL_MS."),
+    "kickboxing_streams_refused_total": ((), "Scoreboard streams answered 503 because every stream slot was taken."),
+}
+
+def count_rejection(message):
+    metrics.inc("kickboxing_scores_rejected_total", (REJECTION_REASONS.get(message, "other"),))
+
+def observe_loop_lag(callback, lag):
+    lag = max(0.0, lag)
+    metrics.observe("kickboxing_tk_loop_lag_seconds", (callback,), lag)
+    metrics.set("kickboxing_tk_loop_lag_last_seconds", (callback,), round(lag, 6))
+
+# ====================================================
+# PUBLIC STATE BROADCAST (Server-Sent Events)
+# ====================================================
+SSE_KEEPALIVE_SEC = 15    # Comment line sent to idle streams so proxies keep them open
+SSE_CLIENT_BACKLOG = 256  # Deltas buffered per screen before a stalled one is dropped
+# waitress serves each open stream from one thread of its fixed pool. Streams
+# may only take what is left after this reserve, so judges' taps and polling
+# screens always find a free thread; see stream_slots.
+STREAM_THREAD_RESERVE = 8
+
+class StateBroadcaster:
+    """
+    Fan-out of fight state deltas to every connected /public/stream client.
+
+    publish() is called from the Tk loop whenever the state may have changed; it
+    diffs against the last published state and only sends the keys that moved.
+    Every change bumps a version number, which polling screens get as an ETag;
+    the epoch keeps versions from a previous run from matching after a restart.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._last = {}
+        self.epoch = uuid.uuid4().hex[:8]
+        self._current = (0, {}, "{}")   # (version, state, state as JSON), replaced as one
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=SSE_CLIENT_BACKLOG)
+        with self._lock:
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def client_count(self):
+        return len(self._subscribers)
+
+    def publish(self, state):
+        delta = {key: value for key, value in state.items() if self._last.get(key) != value}
+        if not delta:
+            return
+        self._last = state
+        version = self._current[0] + 1
+        delta["version"] = version
+        self._current = (version, state, json.dumps(dict(state, version=version)))
+        message = json.dumps(delta)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                # Screen is not reading; drop it; EventSource reconnects and gets a full state.
+                self.unsubscribe(q)
+
+    def current(self):
+        """
+        The last published (version, state, state JSON).
+        """
+        return self._current
+
+    def etag(self, version):
+        return f"{self.epoch}-{version}"
+
+# ====================================================
+# RINGS (one isolated fight per mat/tatami, all in one server)
+# ====================================================
+DEFAULT_RING = ARGS.ring  # Ring served by the original un-prefixed routes (/public, /judge_login, ...)
+RING_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+rings = {}                # Ring id -> Ring
+token_index = {}          # Judge token -> (ring id, judge number), across every ring
+
+class Ring:
+    """
+    One mat: its fight state, judge tokens, score inbox, scoreboard feed and journal.
+    Rings share no state, so each one can be run and viewed on its own.
+    """
+    def __init__(self, ring_id):
+        self.ring_id = ring_id
+        self.fight = FightState()
+        self.judge_tokens = {}    # Judge number -> token (generated when a new fight starts)
+        self.score_queue = ScoreQueue()
+        self.broadcaster = StateBroadcaster()
+        self.journal = FightJournal(journal_path(ring_id))
+        # Admin workflow flags, kept here so switching rings in the admin window keeps them
+        self.fighters_validated = False
+        self.settings_validated = False
+        self.public_page = (None, None)   # (state version, rendered /public page)
+        self.seq_lock = threading.Lock()
+        self.judge_seq = {}       # Judge number -> last batched sequence number accepted
+        self.saved_fight_id = None   # Last fight handed to the results store
+        self.publish()
+
+    def set_judge_tokens(self, tokens):
+        """
+        Replace this ring's judge tokens ({judge number: token}) and update the reverse index.
+        """
+        for token in self.judge_tokens.values():
+            token_index.pop(token, None)
+        self.judge_tokens = dict(tokens)
+        for judge_num, token in self.judge_tokens.items():
+            token_index[token] = (self.ring_id, judge_num)
+
+    def new_fight(self, total_rounds, round_duration, break_duration, judges=None):
+        """
+        Reset the fight and issue fresh judge tokens; fighter names are cleared.
+        """
+        self.score_queue.discard()
+        self.fight.set_info(red_name="", red_club="", blue_name="", blue_club="")
+        self.fight.reset(total_rounds, round_duration, break_duration, judges)
+        self.fighters_validated = False
+        self.settings_validated = False
+        self.set_judge_tokens({})
+        self.issue_judge_tokens()
+        with self.seq_lock:
+            self.judge_seq = {}
+
+    def configure(self, total_rounds, round_duration, break_duration, judges=None):
+        """
+        Apply validated fight settings; a changed panel size gets tokens for the
+        new judges, and judges who already logged in keep theirs.
+        """
+        self.fight.configure(total_rounds, round_duration, break_duration, judges)
+        if len(self.judge_tokens) != self.fight.judges:
+            self.issue_judge_tokens()
+
+    def issue_judge_tokens(self):
+        """
+        Make sure every judge on the panel has a token, and no one else does.
+        """
+        self.set_judge_tokens({judge_num: self.judge_tokens.get(judge_num) or str(uuid.uuid4())
+                               for judge_num in range(1, self.fight.judges + 1)})
+        if self.fight.journal is not None:
+            self.fight.journal.append("tokens", tokens=self.judge_tokens)
+
+    def resume(self):
+        """
+        Replay this ring's journal and start journalling.
+        Returns True if an interrupted fight was restored.
+        """
+        tokens = self.journal.replay(self.fight)
+        self.fight.journal = self.journal
+        self.judge_seq = dict(self.fight.judge_seq)
+        if self.fight.over:
+            self.publish()   # A fight decided just before a crash may not have reached the results store
+        if self.fight.started and not self.fight.over:
+            self.set_judge_tokens(tokens)
+            self.fighters_validated = True
+            self.settings_validated = True
+            return True
+        return False
+
+    def publish(self):
+        """
+        Push whatever changed in this ring's fight to its public scoreboards,
+        and hand a newly decided fight to the results store.
+        """
+        self.broadcaster.publish(self.fight.snapshot())
+        if self.fight.over and self.saved_fight_id != self.fight.fight_id and results_store is not None:
+            self.saved_fight_id = self.fight.fight_id
+            results_store.save(self.ring_id, self.fight.result())
+
+    def archive_journal(self, reopen=True):
+        """
+        Move this ring's journal, which holds no fight left to resume, to the
+        archive, so later launches neither re-read it nor bring the ring back.
+        With `reopen`, journalling goes on in a fresh file.
+        """
+        self.journal.close()
+        if os.path.getsize(self.journal.path):
+            os.makedirs(journal_archive_dir(), exist_ok=True)
+            archived = f"fight_journal_{self.ring_id}.{time.strftime('%Y%m%d-%H%M%S')}.jsonl"
+            os.replace(self.journal.path, os.path.join(journal_archive_dir(), archived))
+        if reopen:
+            self.journal = FightJournal(self.journal.path)
+            self.fight.journal = self.journal
+
+def journal_path(ring_id):
+    return os.path.join(JOURNAL_DIR, f"fight_journal_{ring_id}.jsonl")
+
+def journal_archive_dir():
+    return os.path.join(JOURNAL_DIR, "journal_archive")
+
+def journalled_ring_ids():
+    """
+    Ring ids that have a journal on disk, i.e. rings that existed before a restart.
+    """
+    ring_ids = []
+    for path in glob.glob(journal_path("*")):
+        ring_id = os.path.basename(path)[len("fight_journal_"):-len(".jsonl")]
+        if RING_ID_PATTERN.match(ring_id):
+            ring_ids.append(ring_id)
+    return ring_ids
+
+def add_ring(ring_id):
+    """
+    Create and register a ring (or return it if it already exists).
+    """
+    if not RING_ID_PATTERN.match(ring_id):
+        raise ValueError(f"Invalid ring id: {ring_id!r}")
+    if ring_id not in rings:
+        rings[ring_id] = Ring(ring_id)
+    return rings[ring_id]
+
+def judge_for_token(token):
+    """
+    Return (ring, judge number) for a judge token, or (None, None).
+    One dict lookup regardless of how many rings and judges are active, then a
+    constant-time comparison against the issued token.
+    """
+    ring_id, judge_num = token_index.get(token, (None, None))
+    ring = rings.get(ring_id)
+    if ring is None or not hmac.compare_digest(ring.judge_tokens.get(judge_num, ""), token):
+        return None, None
+    return ring, judge_num
+
+# ====================================================
+# RING WORKER PROCESSES & COORDINATOR (--ring-workers N)
+# ====================================================
+# Each worker is this program pinned to one ring (--worker --ring ID), with its
+# own admin window, scoring engine and journal, serving HTTP on a loopback port.
+# The coordinator has no Tk: it starts the workers, restarts any that die (the
+# journal resumes the fight) and forwards each request to the right worker.
+WORKER_HOST = "127.0.0.1"
+WORKER_TIMEOUT_SEC = 5
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+                      "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length"}
+
+class RingWorker:
+    """
+    One ring's worker process, as seen from the coordinator.
+    """
+    def __init__(self, ring_id, port):
+        self.ring_id = ring_id
+        self.port = port
+        self.process = None
+        self.restarts = 0
+        self._local = threading.local()   # One keep-alive connection per coordinator thread
+
+    def start(self):
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--ring", self.ring_id,
+                   "--host", WORKER_HOST, "--port", str(self.port),
+                   "--judges", str(ARGS.judges), "--server", ARGS.server, "--threads", str(ARGS.threads),
+                   "--connection-limit", str(ARGS.connection_limit), "--backlog", str(ARGS.backlog),
+                   "--keepalive-timeout", str(ARGS.keepalive_timeout)]
+        if ARGS.max_streams is not None:
+            command += ["--max-streams", str(ARGS.max_streams)]
+        env = None
+        if ARGS.headless:
+            command.append("--headless")
+            env = dict(os.environ, **{ADMIN_TOKEN_ENV: admin_token})   # One admin token for every ring
+        if ARGS.results_db:
+            command += ["--results-db", ARGS.results_db]   # Every worker writes to the same store
+        self.process = subprocess.Popen(command, env=env)
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.alive():
+            self.process.terminate()
+
+    def connection(self, streaming=False):
+        """
+        Loopback HTTP connection to the worker. Streams get their own connection
+        since they hold it open; everything else reuses a per-thread one.
+        """
+        if streaming:
+            return http.client.HTTPConnection(WORKER_HOST, self.port)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(WORKER_HOST, self.port, timeout=WORKER_TIMEOUT_SEC)
+            self._local.conn = conn
+        return conn
+
+    def request(self, method, path, body=None, headers=None, streaming=False):
+        """
+        Send one request to the worker. It is retried once on a fresh connection
+        only when a reused keep-alive connection turns out to be dead (the worker
+        restarted or timed it out), as then the worker never saw it. Timeouts are
+        never retried, and neither are single taps, which would count twice.
+        """
+        while True:
+            conn = self.connection(streaming)
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                return conn.getresponse()
+            except (ConnectionResetError, BrokenPipeError, http.client.RemoteDisconnected):
+                self.drop_connection(conn, streaming)
+                if not reused or "/judge_score/" in path:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self.drop_connection(conn, streaming)
+                raise
+
+    def drop_connection(self, conn, streaming):
+        conn.close()
+        if not streaming:
+            self._local.conn = None
+
+class WebServer:
+    """
+    The HTTP server for a WSGI app, chosen by --server: the Werkzeug development
+    server, or waitress with a bounded thread pool, connection limit, accept
+    backlog and keep-alive timeout. Either way it runs with serve_forever() and
+    stops with shutdown().
+
+    With waitress, each open /public/stream holds a pool thread, so at most
+    --threads minus STREAM_THREAD_RESERVE streams are served (fewer with
+    --max-streams), by a ring process and by the coordinator relaying them;
+    further screens get a 503 and should poll state.json.
+    Size --threads for the expected scoreboards plus that reserve.
+    """
+    def __init__(self, wsgi_app, host, port):
+        self.kind = ARGS.server
+        if self.kind == "waitress":
+            if create_waitress_server is None:
+                sys.exit("--server waitress needs the waitress package (pip install waitress).")
+            self._server = create_waitress_server(
+                wsgi_app, host=host, port=port, threads=ARGS.threads,
+                connection_limit=ARGS.connection_limit, backlog=ARGS.backlog,
+                channel_timeout=ARGS.keepalive_timeout,
+                send_bytes=1,   # Flush small writes at once, or scoreboard streams stall
+                ident="kickboxing-scoring")
+        else:
+            from werkzeug.serving import make_server
+            self._server = make_server(host, port, wsgi_app, threaded=True)
+
+    @property
+    def port(self):
+        """
+        The port actually bound (useful with --port 0).
+        """
+        if self.kind == "waitress":
+            return self._server.effective_port
+        return self._server.server_port
+
+    def serve_forever(self):
+        if self.kind == "waitress":
+            self._server.run()
+        else:
+            self._server.serve_forever()
+
+    def shutdown(self):
+        """
+        Stop accepting connections and let running requests finish.
+        """
+        if self.kind == "waitress":
+            self._server.close()
+            self._server.task_dispatcher.shutdown(cancel_pending=True, timeout=2)
+        else:
+            self._server.shutdown()
+
+workers = {}              # Ring id -> RingWorker (coordinator only)
+coordinator_app = Flask(__name__ + ".coordinator")
+
+def forward_to_worker(ring_id):
+    """
+    Relay the current request to a ring's worker and relay its answer back.
+    """
+    worker = workers.get(ring_id)
+    if worker is None:
+        return "Unknown ring", 404
+    streaming = request.path.endswith("/stream")
+    # A relayed stream holds a coordinator pool thread just as a served one does.
+    if streaming and stream_slots is not None and not stream_slots.acquire(blocking=False):
+        return refuse_stream()
+    path = urllib.parse.quote(request.path)
+    if request.query_string:
+        path += "?" + request.query_string.decode("latin-1")
+    headers = {key: value for key, value in request.headers.items() if key.lower() not in HOP_BY_HOP_HEADERS}
+    try:
+        resp = worker.request(request.method, path, request.get_data(), headers, streaming)
+    except (OSError, http.client.HTTPException):
+        if streaming and stream_slots is not None:
+            stream_slots.release()
+        return f"Ring {ring_id} is not available", 503
+    out_headers = [(key, value) for key, value in resp.getheaders() if key.lower() not in HOP_BY_HOP_HEADERS]
+    if not streaming:
+        return Response(resp.read(), status=resp.status, headers=out_headers)
+
+    def relay():
+        try:
+            while True:
+                chunk = resp.read1(65536)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            resp.close()
+
+    def closed():
+        resp.close()
+        if stream_slots is not None:
+            stream_slots.release()
+
+    response = Response(relay(), status=resp.status, headers=out_headers)
+    response.call_on_close(closed)
+    return response
+
+@coordinator_app.route("/ring/<ring_id>/<path:rest>", methods=["GET", "POST"])
+def coordinator_ring_route(ring_id, rest):
+    return forward_to_worker(ring_id)
+
+@coordinator_app.route("/rings")
+def coordinator_rings():
+    """
+    Status of every ring, collected from the workers.
+    """
+    overview = []
+    for ring_id, worker in sorted(workers.items()):
+        try:
+            resp = worker.request("GET", "/rings")
+            overview.extend(json.loads(resp.read()))
+        except (OSError, http.client.HTTPException, ValueError):
+            overview.append({"ring": ring_id, "available": False, "restarts": worker.restarts})
+    return jsonify(overview)
+
+@coordinator_app.route("/", defaults={"rest": ""}, methods=["GET", "POST"])
+@coordinator_app.route("/<path:rest>", methods=["GET", "POST"])
+def coordinator_default_route(rest):
+    # Un-prefixed routes (/public, /judge_login, /judge_score/<token>/...) go to the default ring.
+    return forward_to_worker(DEFAULT_RING)
+
+def run_coordinator(ring_count):
+    """
+    Start one worker per ring (rings 1..ring_count), watch them, and serve the
+    public port. Blocks until the coordinator is stopped.
+    """
+    global admin_token
+    if ARGS.headless:
+        admin_token = os.environ.get(ADMIN_TOKEN_ENV) or str(uuid.uuid4())
+        print(f"Admin token (X-Admin-Token header for /ring/<id>/control/...): {admin_token}")
+    for number in range(1, ring_count + 1):
+        worker = RingWorker(str(number), ARGS.port + number)
+        worker.start()
+        workers[worker.ring_id] = worker
+    atexit.register(lambda: [worker.stop() for worker in workers.values()])
+    # Make a plain `kill` of the coordinator run the atexit cleanup as well.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    def supervise():
+        while True:
+            time.sleep(1)
+            for worker in workers.values():
+                if not worker.alive():
+                    worker.restarts += 1
+                    worker.start()
+
+    threading.Thread(target=supervise, daemon=True).start()
+    open_stream_slots()
+    WebServer(coordinator_app, ARGS.host, ARGS.port).serve_forever()
+
+# The ring shown and controlled in the admin window; `fight` is its FightState.
+# Both are set by use_ring() once main() has created the launch ring.
+current_ring = None
+fight = None
+
+def use_ring(ring):
+    global current_ring, fight
+    current_ring = ring
+    fight = ring.fight
+
+def shown_in_admin(ring):
+    """
+    True if `ring` is the one on screen in the admin window (never in --headless mode).
+    """
+    return root is not None and ring is current_ring
+
+def publish_state():
+    """
+    Push whatever changed in the displayed fight to its public scoreboards.
+    """
+    current_ring.publish()
+
 # ====================================================
 # TKINTER SETUP & MAIN WINDOW
 # ====================================================
-root = tk.Tk()
-root.title("Kickboxing Scoring System - Admin")
-root.geometry("1200x900")
-root.option_add("*Font", ("Arial", 12))
-
-# Timer & round variables
-round_duration = tk.IntVar(root, value=180)  # Default: 180 sec (3 minutes)
-break_duration = tk.IntVar(root, value=45)     # Default: 45 sec
-current_round = tk.IntVar(root, value=1)
-total_rounds = tk.IntVar(root, value=3)
-timer_running = False
-mode_timer = "round"  # Can be "round" or "break"
-time_left = round_duration.get()
+root = None   # The admin window (tk.Tk); stays None in --headless mode, see main()
+
+# ====================================================
+# TK SCHEDULER, LOOP MONITOR & FIGHT PROFILER
+# ====================================================
+TICK_MS = 16                         # Scheduler cadence (one display frame); task times are rounded up to it
+LOOP_STALL_MS = 250                  # A gap this long between ticks counts as a stall
+PROFILE_ENV = "KICKBOXING_PROFILE"   # Set to 1 to profile every fight from launch
+PROFILE_DIR = os.path.join(JOURNAL_DIR, "profiles")
+
+class Scheduler:
+    """
+    The admin window's one Tk timer: a fixed-cadence tick that runs every
+    periodic UI task (score drain, clock, widget flush, winner blink, notices).
+
+    Tasks are named. every() and once() replace a task of the same name, so
+    starting something twice never stacks a second loop, and cancel() stops
+    it. A periodic task may return the milliseconds until its next run, to
+    override its interval once. A task that falls behind runs once and is
+    rescheduled from now rather than catching up in a burst, and one that
+    raises is reported without stopping the others.
+    """
+    def __init__(self, tick_ms):
+        self.tick_ms = tick_ms
+        self._tasks = {}   # Name -> [function, interval in s (None: run once), due], run in this order
+        self._timer = None
+
+    def every(self, name, interval_ms, func, delay_ms=None):
+        delay_ms = interval_ms if delay_ms is None else delay_ms
+        self._tasks[name] = [func, interval_ms / 1000, time.monotonic() + delay_ms / 1000]
+
+    def once(self, name, delay_ms, func):
+        self._tasks[name] = [func, None, time.monotonic() + delay_ms / 1000]
+
+    def cancel(self, name):
+        self._tasks.pop(name, None)
+
+    def scheduled(self, name):
+        return name in self._tasks
+
+    def start(self):
+        if self._timer is None:
+            self._timer = root.after(self.tick_ms, self._tick)
+
+    def _tick(self):
+        self._timer = root.after(self.tick_ms, self._tick)
+        now = time.monotonic()
+        loop_monitor.last_beat = now
+        # Watch from the first tick: building the window and starting the server are not stalls.
+        loop_monitor.start_watchdog()
+        for name, task in list(self._tasks.items()):
+            func, interval, due = task
+            # Skip tasks not due yet, or cancelled/replaced by a task run earlier in this tick.
+            if due > now or self._tasks.get(name) is not task:
+                continue
+            if interval is None:
+                del self._tasks[name]
+            started = time.monotonic()
+            next_ms = None
+            try:
+                next_ms = func()
+            except Exception:
+                traceback.print_exc()
+            finished = time.monotonic()
+            loop_monitor.record(name, started - due, finished - started)
+            if interval is not None and self._tasks.get(name) is task:
+                if next_ms is not None:
+                    task[2] = finished + next_ms / 1000
+                else:
+                    task[2] = due + interval if due + interval > finished else finished + interval
+        loop_monitor.last_beat = time.monotonic()
+
+scheduler = Scheduler(TICK_MS)
+
+class LoopMonitor:
+    """
+    Records how late every scheduler task runs and how long it takes.
+
+    The scheduler ticks every frame, so a watchdog thread that sees no tick
+    for LOOP_STALL_MS knows the loop is blocked (a slow handler, a dialog)
+    and saves the Tk thread's stack at that moment: the handler to blame.
+    """
+    def __init__(self):
+        self.callbacks = {}   # Callback name -> [runs, total lag, max lag, total run time, max run time]
+        self.stalls = collections.deque(maxlen=50)   # {"at", "duration_ms", "stack"}, newest last
+        self.stall_count = 0
+        self.last_beat = time.monotonic()
+        self._watchdog = None
+        self._stop = threading.Event()
+
+    def record(self, name, lag, run_time):
+        lag = max(0.0, lag)
+        stats = self.callbacks.setdefault(name, [0, 0.0, 0.0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += lag
+        stats[2] = max(stats[2], lag)
+        stats[3] += run_time
+        stats[4] = max(stats[4], run_time)
+        observe_loop_lag(name, lag)
+        metrics.observe("kickboxing_tk_callback_seconds", (name,), run_time)
+
+    def start_watchdog(self):
+        if self._watchdog is None:
+            self.last_beat = time.monotonic()   # Start-up before the first tick is not a stall
+            self._watchdog = threading.Thread(target=self._watch, args=(threading.main_thread().ident,),
+                                              daemon=True)
+            self._watchdog.start()
+
+    def stop_watchdog(self):
+        self._stop.set()
+
+    def _watch(self, tk_thread):
+        stall = None
+        while not self._stop.wait(LOOP_STALL_MS / 1000 / 5):
+            beat = self.last_beat
+            blocked = time.monotonic() - beat
+            if stall is None and blocked * 1000 >= LOOP_STALL_MS:
+                frame = sys._current_frames().get(tk_thread)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                stall = {"at": time.time() - blocked, "duration_ms": None, "stack": stack, "beat": beat}
+                self.stalls.append(stall)
+                self.stall_count += 1
+                metrics.inc("kickboxing_tk_loop_stalls_total", ())
+                where = stack[-1].strip().splitlines()[0] if stack else "unknown"
+                print(f"Tk loop blocked for {blocked * 1000:.0f} ms, at {where}", file=sys.stderr)
+            elif stall is not None and self.last_beat != stall["beat"]:
+                stall["duration_ms"] = round((self.last_beat - stall["beat"]) * 1000)
+                stall = None
+
+    def report(self):
+        """
+        Per-callback lag and run time, worst first, followed by the recorded stalls.
+        """
+        lines = [f"{'callback':<24}{'runs':>8}{'avg lag ms':>12}{'max lag ms':>12}"
+                 f"{'avg run ms':>12}{'max run ms':>12}"]
+        for name, (runs, lag, max_lag, run_time, max_run) in sorted(
+                self.callbacks.items(), key=lambda item: item[1][2], reverse=True):
+            lines.append(f"{name:<24}{runs:>8}{lag / runs * 1000:>12.2f}{max_lag * 1000:>12.2f}"
+                         f"{run_time / runs * 1000:>12.2f}{max_run * 1000:>12.2f}")
+        lines.append(f"\n{self.stall_count} stalls over {LOOP_STALL_MS} ms")
+        for stall in list(self.stalls):
+            started = time.strftime("%H:%M:%S", time.localtime(stall["at"]))
+            lines.append(f"\n-- {started}, {stall['duration_ms'] or 'still blocked'} ms, Tk thread was in:")
+            lines.extend(line.rstrip() for line in stall["stack"][-8:])
+        return "\n".join(lines) + "\n"
+
+loop_monitor = LoopMonitor()
+
+class FightProfiler:
+    """
+    Opt-in cProfile of the Tk thread, one dump per fight: FILE.prof for
+    pstats/snakeviz and FILE.txt with the loop report and the top functions.
+    Switched on by the KICKBOXING_PROFILE environment variable or the Tools menu.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0")
+        self._profile = None
+        self._name = None
+
+    def begin(self, ring_id):
+        """
+        Start profiling a new fight on `ring_id`, dumping the previous one.
+        """
+        self.end()
+        if self.enabled:
+            self._name = f"fight_ring{ring_id}_{time.strftime('%Y%m%d-%H%M%S')}"
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def end(self):
+        """
+        Stop profiling and write the dumps; returns the .prof path, or None.
+        """
+        if self._profile is None:
+            return None
+        profile, self._profile = self._profile, None
+        profile.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, self._name)
+        profile.dump_stats(path + ".prof")
+        with open(path + ".txt", "w", encoding="utf-8") as f:
+            f.write(loop_monitor.report() + "\n")
+            pstats.Stats(profile, stream=f).sort_stats("cumulative").print_stats(40)
+        print(f"Profile written to {path}.prof", file=sys.stderr)
+        return path + ".prof"
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.begin(current_ring.ring_id)
+        else:
+            self.end()
+
+profiler = FightProfiler(PROFILE_DIR)
+
+def save_loop_report():
+    """
+    Tools menu: write the loop monitor report next to the profiles.
+    """
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"loop_report_{time.strftime('%Y%m%d-%H%M%S')}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(loop_monitor.report())
+    print(f"Loop report written to {path}", file=sys.stderr)
+
+class WidgetView:
+    """
+    Dirty-tracked widget updates for the admin window's busiest labels.
+
+    set() only records the wanted options; once per frame flush() calls
+    .config() on the widgets whose options differ from what they already show.
+    A burst of taps then costs one redraw of the labels that actually moved.
+    Widgets handled here must not be configured directly, or the cache goes stale.
+    """
+    def __init__(self, frame_ms):
+        self.frame_ms = frame_ms
+        self._shown = {}     # Widget -> options it currently shows
+        self._wanted = {}    # Widget -> options to show at the next flush
+        self.configs = 0     # .config() calls made, for the curious
+
+    def set(self, widget, **options):
+        self._wanted.setdefault(widget, {}).update(options)
+
+    def forget(self, widget):
+        """
+        Stop tracking a widget that is about to be destroyed.
+        """
+        self._shown.pop(widget, None)
+        self._wanted.pop(widget, None)
+
+    def flush(self):
+        """
+        Scheduler task "widget_view", every frame_ms.
+        """
+        wanted, self._wanted = self._wanted, {}
+        for widget, options in wanted.items():
+            shown = self._shown.setdefault(widget, {})
+            changed = {key: value for key, value in options.items() if shown.get(key) != value}
+            if changed:
+                widget.config(**changed)
+                shown.update(changed)
+                self.configs += 1
+
+view = WidgetView(DRAIN_INTERVAL_MS)
+
+
+# ====================================================
+# IN-WINDOW CONFIRMATIONS (non-modal: the Tk loop keeps running)
+# ====================================================
+NOTICE_MS = 5000   # How long a notice stays on the bar
+
+class ConfirmBar:
+    """
+    A strip at the top of the admin window for yes/no questions and notices,
+    in place of modal message boxes: judge scores, the clock and the
+    scoreboards keep updating while the official decides.
+
+    ask() returns at once and calls `on_yes` only if Yes is clicked. One
+    question is pending at a time; a new question, a notice, a ring switch or a
+    new fight withdraws it. Since time passes before the answer, `on_yes`
+    must re-check whatever it relies on.
+    """
+    COLORS = {"question": "#fff3cd", "info": "#d1ecf1", "error": "#f8d7da"}
+
+    def __init__(self, master):
+        self.frame = tk.Frame(master)
+        self.frame.pack(side="top", fill="x")
+        self.label = tk.Label(self.frame, text="", font=("Arial", 12, "bold"))
+        self.label.pack(side="left", expand=True, fill="x", padx=10, pady=4)
+        self.no_button = tk.Button(self.frame, text="No", width=8, command=self.dismiss)
+        self.yes_button = tk.Button(self.frame, text="Yes", width=8, command=self._answer_yes)
+        self._on_yes = None
+
+    def ask(self, message, on_yes):
+        self._show(message, "question")
+        self._on_yes = on_yes
+        self.no_button.pack(side="right", padx=5, pady=4)
+        self.yes_button.pack(side="right", padx=5, pady=4)
+
+    def notify(self, message, level="info"):
+        self._show(message, level)
+        scheduler.once("hide_notice", NOTICE_MS, self.dismiss)
+
+    def dismiss(self):
+        scheduler.cancel("hide_notice")
+        self._on_yes = None
+        self.yes_button.pack_forget()
+        self.no_button.pack_forget()
+        self.label.config(text="")
+        self.frame.config(bg=self.default_bg)
+        self.label.config(bg=self.default_bg)
+
+    def _show(self, message, level):
+        self.dismiss()
+        self.frame.config(bg=self.COLORS[level])
+        self.label.config(text=message, bg=self.COLORS[level])
+
+    def _answer_yes(self):
+        on_yes = self._on_yes
+        self.dismiss()
+        if on_yes is not None:
+            on_yes()
+
+    @property
+    def default_bg(self):
+        return root.cget("bg")
 
 # ====================================================
 # NEW FIGHT SETUP FUNCTION (Reinitialize all fight variables)
 # ====================================================
 def new_fight(confirm=True):
-    global fight_started, timer_running, fighters_validated, settings_validated, fight_over, blinking, time_left
-    global judge_tokens, judge_scores, red_warning_count, blue_warning_count
-
     # Ask for confirmation to reset everything.
-    answer = messagebox.askyesno("Confirm New Fight", "Do you really want to start a new fight? All current data will be lost.")
-    if not answer:
+    if confirm:
+        confirm_bar.ask(f"Start a new fight on Ring {current_ring.ring_id}? All current data will be lost.",
+                        lambda: new_fight(confirm=False))
         return
+    confirm_bar.dismiss()
 
-    # Reset all fight state flags.
-    fight_started    = False
-    timer_running    = False
-    fighters_validated = False
-    settings_validated = False
-    fight_over       = False
-    blinking         = False
-
-    # Reset round and time variables.
-    current_round.set(1)
-    time_left = round_duration.get()  # round_duration is assumed to be a global control holding the base round time.
-
-    # Reset judge tokens and judge scores.
-    judge_tokens.clear()
-    judge_scores = {
-        1: {"red": 0, "blue": 0},
-        2: {"red": 0, "blue": 0},
-        3: {"red": 0, "blue": 0}
-    }
-    red_warning_count = 0
-    blue_warning_count = 0
-
-    # Generate new tokens for each judge.
-    judge_tokens[1] = str(uuid.uuid4())
-    judge_tokens[2] = str(uuid.uuid4())
-    judge_tokens[3] = str(uuid.uuid4())
+    # Reset all fight state (scores, warnings, round, clock and result) and
+    # generate new tokens for each judge.
+    current_ring.new_fight(total_rounds.get(), round_duration.get(), break_duration.get(), judge_count.get())
+    profiler.begin(current_ring.ring_id)
+    stop_blinking()
 
     # Reset fighter data fields (name, country, etc.).
     for entry in (red_name, red_country, blue_name, blue_country):
@@ -125,32 +1992,21 @@ def new_fight(confirm=True):
     blue_gender.set("Male")
     red_gender_optionmenu.config(state="normal")
     blue_gender_optionmenu.config(state="normal")
+    sync_fight_info()
 
     # Reset fight settings controls (total rounds, round duration, break duration, etc.).
     om_total_rounds.config(state="normal")
     om_round_duration.config(state="normal")
     om_break_duration.config(state="normal")
+    om_judge_count.config(state="normal")
 
     # Reset timer (clock) display.
-    minutes = time_left // 60
-    seconds = time_left % 60
-    timer_label.config(text=f"{minutes:02d}:{seconds:02d}", fg="black", font=("Arial", 20))
-    round_label.config(text=f"Round: {current_round.get()} / {total_rounds.get()}")
-
-    # Reset judge score labels.
-    judge1_red_label.config(text="0")
-    judge1_blue_label.config(text="0")
-    judge2_red_label.config(text="0")
-    judge2_blue_label.config(text="0")
-    judge3_red_label.config(text="0")
-    judge3_blue_label.config(text="0")
-
-    # Reset the warning counter labels.
-    warning_red_label.config(text="0")
-    warning_blue_label.config(text="0")
-
-    # Reset any winner display (if present).
-    timer_label.config(font=("Arial", 20), fg="black")
+    timer_label.config(text=fight.clock_text(), fg="black", font=("Arial", 20))
+    round_label.config(text=fight.round_text())
+
+    # Reset judge score labels, favorable counters and warning counters.
+    update_judge_details()
+    update_warning_labels()
 
     # Re-enable all control buttons as they would be at a new launch.
     # Disable the fight button until fighters and settings are properly validated.
@@ -165,35 +2021,30 @@ def new_fight(confirm=True):
 # UI COMPONENTS: BUTTONS & FRAMES
 # ====================================================
 
-# -- Top Frame: New Fight Button --
-frame_top = tk.Frame(root)
-frame_top.pack(side="top", fill="x", pady=5)
-new_fight_btn = tk.Button(frame_top, text="New Fight", fg="black", command=lambda: new_fight())
-new_fight_btn.pack(expand=True)
+# -- Top Frame: Ring Selector & New Fight Button --
+def build_top_section():
+    """
+    Ring selector and New Fight button.
+    """
+    global ring_choice, ring_menu, add_ring_btn
+    frame_top = tk.Frame(root)
+    frame_top.pack(side="top", fill="x", pady=5)
+    frame_ring = tk.Frame(frame_top)
+    frame_ring.pack(side="top")
+    tk.Label(frame_ring, text="Ring:", font=("Arial", 10)).pack(side="left")
+    ring_choice = tk.StringVar(value=DEFAULT_RING)
+    ring_menu = tk.OptionMenu(frame_ring, ring_choice, DEFAULT_RING)
+    ring_menu.config(font=("Arial", 10))
+    ring_menu.pack(side="left", padx=5)
+    add_ring_btn = tk.Button(frame_ring, text="Add Ring", font=("Arial", 10), command=lambda: add_ring_clicked())
+    add_ring_btn.pack(side="left", padx=5)
+    if ARGS.worker:
+        # Rings are assigned by the coordinator in worker mode.
+        add_ring_btn.config(state="disabled")
+    new_fight_btn = tk.Button(frame_top, text="New Fight", fg="black", command=lambda: new_fight())
+    new_fight_btn.pack(expand=True)
 
 # -- Fighter Data Section --
-frame_fighter = tk.Frame(root)
-frame_fighter.pack(pady=10)
-tk.Label(frame_fighter, text="Red Corner", fg="red", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2)
-tk.Label(frame_fighter, text="Name:", font=("Arial", 10)).grid(row=1, column=0)
-red_name = tk.Entry(frame_fighter, font=("Arial", 10))
-red_name.grid(row=1, column=1)
-tk.Label(frame_fighter, text="Country/Club:", font=("Arial", 10)).grid(row=2, column=0)
-red_country = tk.Entry(frame_fighter, font=("Arial", 10))
-red_country.grid(row=2, column=1)
-
-tk.Label(frame_fighter, text="Blue Corner", fg="blue", font=("Arial", 14, "bold")).grid(row=0, column=2, columnspan=2)
-tk.Label(frame_fighter, text="Name:", font=("Arial", 10)).grid(row=1, column=2)
-blue_name = tk.Entry(frame_fighter, font=("Arial", 10))
-blue_name.grid(row=1, column=3)
-tk.Label(frame_fighter, text="Country/Club:", font=("Arial", 10)).grid(row=2, column=2)
-blue_country = tk.Entry(frame_fighter, font=("Arial", 10))
-blue_country.grid(row=2, column=3)
-
-# Gender variables and option menus
-red_gender = tk.StringVar(value="Male")
-blue_gender = tk.StringVar(value="Male")
-
 def update_blue_gender(*args):
     """
     Update the Blue fighter gender: if Red is Female, set Blue to Female; otherwise set Blue to Male;
@@ -202,126 +2053,110 @@ def update_blue_gender(*args):
     blue_gender.set("Female" if red_gender.get() == "Female" else "Male")
     update_weights()
 
-red_gender_optionmenu = tk.OptionMenu(frame_fighter, red_gender, "Male", "Female", command=update_blue_gender)
-red_gender_optionmenu.config(font=("Arial", 10))
-red_gender_optionmenu.grid(row=3, column=1)
-blue_gender_optionmenu = tk.OptionMenu(frame_fighter, blue_gender, "Male", "Female", command=lambda v: update_weights())
-blue_gender_optionmenu.config(font=("Arial", 10))
-blue_gender_optionmenu.grid(row=3, column=3)
-
-# -- Validate Fighter Data Section --
-frame_validate_fighter = tk.Frame(root)
-frame_validate_fighter.pack(pady=10)
 def validate_fighter_data():
     """
     Validate fighter information and lock the inputs.
     """
-    global fighters_validated
+    if fighter_data_complete():
+        confirm_bar.ask("Finalize fighter data? (Inputs will be locked)", lock_fighter_data)
+
+def fighter_data_complete():
     if not red_name.get() or not red_country.get() or not blue_name.get() or not blue_country.get():
-        messagebox.showerror("Error", "All fighter data fields must be filled.")
+        confirm_bar.notify("All fighter data fields must be filled.", "error")
+        return False
+    return True
+
+def lock_fighter_data():
+    # The fields stayed editable while the question was open.
+    if not fighter_data_complete():
         return
-    answer = messagebox.askyesno("Confirm Fighter Data", "Finalize fighter data? (Inputs will be locked)")
-    if answer:
-        red_name.config(state="disabled")
-        red_country.config(state="disabled")
-        blue_name.config(state="disabled")
-        blue_country.config(state="disabled")
-        red_gender_optionmenu.config(state="disabled")
-        blue_gender_optionmenu.config(state="disabled")
-        fighters_validated = True
-        enable_start_if_valid()
-
-btn_validate_fighter = tk.Button(frame_validate_fighter, text="Validate Fighter Data", command=validate_fighter_data, font=("Arial", 10))
-btn_validate_fighter.pack()
+    red_name.config(state="disabled")
+    red_country.config(state="disabled")
+    blue_name.config(state="disabled")
+    blue_country.config(state="disabled")
+    red_gender_optionmenu.config(state="disabled")
+    blue_gender_optionmenu.config(state="disabled")
+    current_ring.fighters_validated = True
+    sync_fight_info()
+    enable_start_if_valid()
+
+def build_fighter_section():
+    """
+    Name and club entries, genders and the Validate Fighter Data button.
+    """
+    global red_name, red_country, blue_name, blue_country
+    global red_gender, blue_gender, red_gender_optionmenu, blue_gender_optionmenu
+    frame_fighter = tk.Frame(root)
+    frame_fighter.pack(pady=10)
+    tk.Label(frame_fighter, text="Red Corner", fg="red", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2)
+    tk.Label(frame_fighter, text="Name:", font=("Arial", 10)).grid(row=1, column=0)
+    red_name = tk.Entry(frame_fighter, font=("Arial", 10))
+    red_name.grid(row=1, column=1)
+    tk.Label(frame_fighter, text="Country/Club:", font=("Arial", 10)).grid(row=2, column=0)
+    red_country = tk.Entry(frame_fighter, font=("Arial", 10))
+    red_country.grid(row=2, column=1)
+
+    tk.Label(frame_fighter, text="Blue Corner", fg="blue", font=("Arial", 14, "bold")).grid(row=0, column=2, columnspan=2)
+    tk.Label(frame_fighter, text="Name:", font=("Arial", 10)).grid(row=1, column=2)
+    blue_name = tk.Entry(frame_fighter, font=("Arial", 10))
+    blue_name.grid(row=1, column=3)
+    tk.Label(frame_fighter, text="Country/Club:", font=("Arial", 10)).grid(row=2, column=2)
+    blue_country = tk.Entry(frame_fighter, font=("Arial", 10))
+    blue_country.grid(row=2, column=3)
+
+    # Gender variables and option menus
+    red_gender = tk.StringVar(value="Male")
+    blue_gender = tk.StringVar(value="Male")
+
+    red_gender_optionmenu = tk.OptionMenu(frame_fighter, red_gender, "Male", "Female", command=update_blue_gender)
+    red_gender_optionmenu.config(font=("Arial", 10))
+    red_gender_optionmenu.grid(row=3, column=1)
+    blue_gender_optionmenu = tk.OptionMenu(frame_fighter, blue_gender, "Male", "Female", command=lambda v: update_weights())
+    blue_gender_optionmenu.config(font=("Arial", 10))
+    blue_gender_optionmenu.grid(row=3, column=3)
+
+    # -- Validate Fighter Data Section --
+    frame_validate_fighter = tk.Frame(root)
+    frame_validate_fighter.pack(pady=10)
+    btn_validate_fighter = tk.Button(frame_validate_fighter, text="Validate Fighter Data", command=validate_fighter_data, font=("Arial", 10))
+    btn_validate_fighter.pack()
 
 # -- Discipline, Categories, and Weight Options Section --
-frame_options = tk.Frame(root)
-frame_options.pack(pady=10)
-tk.Label(frame_options, text="Discipline:", font=("Arial", 10)).grid(row=0, column=0)
-
-# Discipline option menu (exact string values required for age dictionaries)
-discipline = tk.StringVar(value="Full Contact")
-discipline_menu = tk.OptionMenu(frame_options, discipline,
-                                "Full Contact", "Low Kick", "K-1", "Point Fighting",
-                                "Light Contact", "Kick Light", "Forms")
-discipline_menu.config(font=("Arial", 10))
-discipline_menu.grid(row=0, column=1)
-discipline_label = tk.Label(frame_options, text="Discipline: N/A", font=("Arial", 10))
-discipline_label.grid(row=1, column=1)
-
-tk.Label(frame_options, text="Age Category:", font=("Arial", 10)).grid(row=2, column=0)
-age_categories = tk.StringVar()
-age_menu = tk.OptionMenu(frame_options, age_categories, "")
-age_menu.config(font=("Arial", 10))
-age_menu.grid(row=2, column=1)
-
-tk.Label(frame_options, text="Weight Category:", font=("Arial", 10)).grid(row=3, column=0)
-weight_categories = tk.StringVar()
-weight_menu = tk.OptionMenu(frame_options, weight_categories, "")
-weight_menu.config(font=("Arial", 10))
-weight_menu.grid(row=3, column=1)
-
-tk.Label(frame_options, text="Authorized Ages:", font=("Arial", 10)).grid(row=2, column=2)
-authorized_ages_label = tk.Label(frame_options, text="N/A", font=("Arial", 10))
-authorized_ages_label.grid(row=2, column=3, padx=10)
-
-# ====================================================
-# DATA DICTIONARIES FOR AGE & WEIGHT CATEGORIES
-# ====================================================
-authorized_ages_tatami = {
-    "Children": "(7, 8, 9 years old)",
-    "Younger Cadets": "(10, 11, 12 years old)",
-    "Older Cadets": "(13, 14, 15 years old)",
-    "Juniors": "(16, 17, 18 years old)",
-    "Seniors": "(from age 19 to 40)",
-    "Masters": "(from age 41 to 55)"
-}
-authorized_ages_ring = {
-    "Younger Juniors": "(15, 16 years old)",
-    "Older Juniors": "(17, 18 years old)",
-    "Seniors": "(19–40 years old)"
-}
-
-ring_age_dict = {
-    "Full Contact": ["Younger Juniors", "Older Juniors", "Seniors"],
-    "Low Kick": ["Younger Juniors", "Older Juniors", "Seniors"],
-    "K-1": ["Younger Juniors", "Older Juniors", "Seniors"]
-}
-tatami_age_dict = {
-    "Point Fighting": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"],
-    "Light Contact": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"],
-    "Kick Light": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"],
-    "Forms": ["Children", "Younger Cadets", "Older Cadets", "Juniors", "Seniors", "Masters"]
-}
-
-weight_dict = {
-    "Female_Ring": {
-        "Younger Juniors": ["-36 kg", "-40 kg", "-44 kg", "-48 kg", "-52 kg", "-56 kg", "-60 kg", "+60 kg"],
-        "Older Juniors": ["-48 kg", "-52 kg", "-56 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"],
-        "Seniors": ["-48 kg", "-52 kg", "-56 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"]
-    },
-    "Ring_Male": {
-        "Younger Juniors": ["-42 kg", "-45 kg", "-48 kg", "-51 kg", "-54 kg", "-57 kg", "-60 kg", "-63.5 kg", "-67 kg", "-71 kg", "-75 kg", "-81 kg", "+81 kg"],
-        "Older Juniors": ["-51 kg", "-54 kg", "-57 kg", "-60 kg", "-63.5 kg", "-67 kg", "-71 kg", "-75 kg", "-81 kg", "-86 kg", "-91 kg", "+91 kg"],
-        "Seniors": ["-51 kg", "-54 kg", "-57 kg", "-60 kg", "-63.5 kg", "-67 kg", "-71 kg", "-75 kg", "-81 kg", "-86 kg", "-91 kg", "+91 kg"]
-    },
-    "Tatami_Male": {
-        "Children": ["-18 kg", "-21 kg", "-24 kg", "-27 kg", "-30 kg", "-33 kg", "-36 kg", "+36 kg"],
-        "Younger Cadets": ["-28 kg", "-32 kg", "-37 kg", "-42 kg", "-47 kg", "+47 kg"],
-        "Older Cadets": ["-32 kg", "-37 kg", "-42 kg", "-47 kg", "-52 kg", "-57 kg", "-63 kg", "-69 kg", "+69 kg"],
-        "Juniors": ["-57 kg", "-63 kg", "-69 kg", "-74 kg", "-79 kg", "-84 kg", "-89 kg", "-94 kg", "+94 kg"],
-        "Seniors": ["-57 kg", "-63 kg", "-69 kg", "-74 kg", "-79 kg", "-84 kg", "-89 kg", "-94 kg", "+94 kg"],
-        "Masters": ["-63 kg", "-74 kg", "-84 kg", "-94 kg", "+94 kg"]
-    },
-    "Tatami_Female": {
-        "Children": ["-18 kg", "-21 kg", "-24 kg", "-27 kg", "-30 kg", "-33 kg", "-36 kg", "+36 kg"],
-        "Younger Cadets": ["-28 kg", "-32 kg", "-37 kg", "-42 kg", "-47 kg", "+47 kg"],
-        "Older Cadets": ["-32 kg", "-37 kg", "-42 kg", "-46 kg", "-50 kg", "-55 kg", "-60 kg", "-65 kg", "+65 kg"],
-        "Juniors": ["-50 kg", "-55 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"],
-        "Seniors": ["-50 kg", "-55 kg", "-60 kg", "-65 kg", "-70 kg", "+70 kg"],
-        "Masters": ["-55 kg", "-65 kg", "+65 kg"]
-    }
-}
+def build_options_section():
+    """
+    Discipline, age category and weight category menus.
+    """
+    global discipline, discipline_label, age_categories, age_menu
+    global weight_categories, weight_menu, authorized_ages_label
+    frame_options = tk.Frame(root)
+    frame_options.pack(pady=10)
+    tk.Label(frame_options, text="Discipline:", font=("Arial", 10)).grid(row=0, column=0)
+
+    # Discipline option menu (exact string values required for age dictionaries)
+    discipline = tk.StringVar(value="Full Contact")
+    discipline_menu = tk.OptionMenu(frame_options, discipline,
+                                    "Full Contact", "Low Kick", "K-1", "Point Fighting",
+                                    "Light Contact", "Kick Light", "Forms")
+    discipline_menu.config(font=("Arial", 10))
+    discipline_menu.grid(row=0, column=1)
+    discipline_label = tk.Label(frame_options, text="Discipline: N/A", font=("Arial", 10))
+    discipline_label.grid(row=1, column=1)
+
+    tk.Label(frame_options, text="Age Category:", font=("Arial", 10)).grid(row=2, column=0)
+    age_categories = tk.StringVar()
+    age_menu = tk.OptionMenu(frame_options, age_categories, "")
+    age_menu.config(font=("Arial", 10))
+    age_menu.grid(row=2, column=1)
+
+    tk.Label(frame_options, text="Weight Category:", font=("Arial", 10)).grid(row=3, column=0)
+    weight_categories = tk.StringVar()
+    weight_menu = tk.OptionMenu(frame_options, weight_categories, "")
+    weight_menu.config(font=("Arial", 10))
+    weight_menu.grid(row=3, column=1)
+
+    tk.Label(frame_options, text="Authorized Ages:", font=("Arial", 10)).grid(row=2, column=2)
+    authorized_ages_label = tk.Label(frame_options, text="N/A", font=("Arial", 10))
+    authorized_ages_label.grid(row=2, column=3, padx=10)
 
 # ====================================================
 # FUNCTIONS FOR UPDATING OPTIONS & VALIDATING SETTINGS
@@ -331,43 +2166,43 @@ def update_weights(*args):
     """
     Update weight options based on discipline, selected age category, and fighter gender.
     """
-    selected_age = age_categories.get().strip()
-    red_category_key = ("Tatami_Male" if discipline.get() in tatami_age_dict and red_gender.get() == "Male"
-                        else "Tatami_Female" if discipline.get() in tatami_age_dict and red_gender.get() == "Female"
-                        else "Ring_Male" if discipline.get() not in tatami_age_dict and red_gender.get() == "Male"
-                        else "Female_Ring")
-    blue_category_key = ("Tatami_Male" if discipline.get() in tatami_age_dict and blue_gender.get() == "Male"
-                         else "Tatami_Female" if discipline.get() in tatami_age_dict and blue_gender.get() == "Female"
-                         else "Ring_Male" if discipline.get() not in tatami_age_dict and blue_gender.get() == "Male"
-                         else "Female_Ring")
-    weight_menu['menu'].delete(0, 'end')
-    if selected_age in weight_dict.get(red_category_key, {}):
-        for weight in weight_dict[red_category_key][selected_age]:
-            weight_menu['menu'].add_command(label=weight, command=lambda v=weight: weight_categories.set(v))
-        weight_categories.set(weight_dict[red_category_key][selected_age][0])
-    elif selected_age in weight_dict.get(blue_category_key, {}):
-        for weight in weight_dict[blue_category_key][selected_age]:
-            weight_menu['menu'].add_command(label=weight, command=lambda v=weight: weight_categories.set(v))
-        weight_categories.set(weight_dict[blue_category_key][selected_age][0])
-    else:
-        weight_categories.set("N/A")
+    entry = selected_category()
+    weights = entry["weights"] if entry else []
+    set_menu_options(weight_menu, weight_categories, weights)
+    weight_categories.set(weights[0] if weights else "N/A")
     update_authorized_ages()
+    sync_fight_info()
+
+def selected_category():
+    """
+    CATEGORY_INDEX entry for the selected discipline and age category (red
+    corner's gender first, then blue's), or None.
+    """
+    key = (discipline.get().strip(), red_gender.get(), age_categories.get().strip())
+    entry = CATEGORY_INDEX.get(key)
+    if entry is None:
+        entry = CATEGORY_INDEX.get((key[0], blue_gender.get(), key[2]))
+    return entry
+
+menu_options = {}   # OptionMenu -> the labels it currently lists
+
+def set_menu_options(menu, variable, labels):
+    """
+    Fill an OptionMenu with `labels`; left alone if it already lists exactly those.
+    """
+    if menu_options.get(menu) == labels:
+        return
+    menu_options[menu] = labels
+    menu['menu'].delete(0, 'end')
+    for label in labels:
+        menu['menu'].add_command(label=label, command=lambda v=label: variable.set(v))
 
 def update_authorized_ages():
     """
     Update the 'Authorized Ages' label based on the selected age category.
     """
-    cat = age_categories.get().strip()
-    if discipline.get() in tatami_age_dict:
-        if cat in authorized_ages_tatami:
-            authorized_ages_label.config(text=authorized_ages_tatami[cat], font=("Arial", 10))
-        else:
-            authorized_ages_label.config(text="N/A", font=("Arial", 10))
-    else:
-        if cat in authorized_ages_ring:
-            authorized_ages_label.config(text=authorized_ages_ring[cat], font=("Arial", 10))
-        else:
-            authorized_ages_label.config(text="N/A", font=("Arial", 10))
+    entry = selected_category()
+    authorized_ages_label.config(text=entry["authorized_ages"] if entry else "N/A", font=("Arial", 10))
 
 def update_options(*args):
     """
@@ -376,284 +2211,281 @@ def update_options(*args):
     selected_discipline = discipline.get().strip()
     print("Selected discipline:", selected_discipline)  # Debug output
     
-    if selected_discipline in tatami_age_dict:
-        discipline_label.config(text=f"Tatami Discipline ({selected_discipline})", font=("Arial", 10))
-        age_dict = tatami_age_dict
-    else:
-        discipline_label.config(text=f"Ring Discipline ({selected_discipline})", font=("Arial", 10))
-        age_dict = ring_age_dict
-        
-    age_menu['menu'].delete(0, 'end')
-    if selected_discipline in age_dict:
-        for category in age_dict[selected_discipline]:
-            age_menu['menu'].add_command(label=category, command=lambda v=category: age_categories.set(v))
-        age_categories.set(age_dict[selected_discipline][0])
+    layout, ages = DISCIPLINE_AGES.get(selected_discipline, ("ring", []))
+    discipline_label.config(text=f"{layout.capitalize()} Discipline ({selected_discipline})", font=("Arial", 10))
+    set_menu_options(age_menu, age_categories, ages)
+    if ages:
+        age_categories.set(ages[0])
     update_weights()
 
-# Set up traces to automatically update options when discipline or age category changes
-discipline.trace_add("write", lambda *args: update_options())
-age_categories.trace_add("write", lambda *args: update_weights())
-
-# Initialize options with default values so that they no longer show "N/A"
-update_options()
+def sync_fight_info():
+    """
+    Copy fighter and category details from the Tk widgets into the fight state,
+    so the web views never have to read a widget.
+    """
+    if loading_ring_view:
+        return
+    fight.set_info(red_name=red_name.get(), red_club=red_country.get(),
+                   blue_name=blue_name.get(), blue_club=blue_country.get(),
+                   discipline=discipline.get(), age_category=age_categories.get(),
+                   weight_category=weight_categories.get())
+    publish_state()
 
 def validate_fight_settings():
     """
     Finalize fight settings and lock editing.
     """
-    global settings_validated, time_left
-    answer = messagebox.askyesno("Confirm Fight Settings", "Are you sure you want to finalize fight settings? They will be locked for editing.")
-    if answer:
-        om_total_rounds.config(state="disabled")
-        om_round_duration.config(state="disabled")
-        om_break_duration.config(state="disabled")
-        settings_validated = True
-        enable_start_if_valid()
-        if not fight_started:
-            time_left = round_duration.get()
-            minutes = time_left // 60
-            seconds = time_left % 60
-            timer_label.config(text=f"{minutes:02d}:{seconds:02d}", fg="black")
-            round_label.config(text=f"Round: {current_round.get()} / {total_rounds.get()}")
+    confirm_bar.ask("Finalize fight settings? They will be locked for editing.", lock_fight_settings)
+
+def lock_fight_settings():
+    om_total_rounds.config(state="disabled")
+    om_round_duration.config(state="disabled")
+    om_break_duration.config(state="disabled")
+    om_judge_count.config(state="disabled")
+    current_ring.settings_validated = True
+    enable_start_if_valid()
+    current_ring.configure(total_rounds.get(), round_duration.get(), break_duration.get(), judge_count.get())
+    if not fight.started:
+        timer_label.config(text=fight.clock_text(), fg="black")
+        round_label.config(text=fight.round_text())
+        update_judge_details()
 
 # ====================================================
 # FIGHT SETTINGS UI SECTION
 # ====================================================
-frame_settings = tk.Frame(root)
-frame_settings.pack(pady=10)
-tk.Label(frame_settings, text="Fight Settings", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2)
-tk.Label(frame_settings, text="Number of Rounds:", font=("Arial", 10)).grid(row=1, column=0)
-om_total_rounds = tk.OptionMenu(frame_settings, total_rounds, 3, 5, 7)
-om_total_rounds.config(font=("Arial", 10))
-om_total_rounds.grid(row=1, column=1)
-tk.Label(frame_settings, text="Round Duration (sec):", font=("Arial", 10)).grid(row=2, column=0)
-om_round_duration = tk.OptionMenu(frame_settings, round_duration, 60, 90, 120, 180)
-om_round_duration.config(font=("Arial", 10))
-om_round_duration.grid(row=2, column=1)
-tk.Label(frame_settings, text="Break Duration (sec):", font=("Arial", 10)).grid(row=3, column=0)
-om_break_duration = tk.OptionMenu(frame_settings, break_duration, 45, 60)
-om_break_duration.config(font=("Arial", 10))
-om_break_duration.grid(row=3, column=1)
-
-btn_validate_settings = tk.Button(frame_settings, text="Validate Fight Settings", command=validate_fight_settings, font=("Arial", 10))
-btn_validate_settings.grid(row=4, column=0, columnspan=2, pady=5)
+def build_settings_section():
+    """
+    Rounds, durations and panel size, with the Validate Fight Settings button.
+    """
+    global om_total_rounds, om_round_duration, om_break_duration, om_judge_count
+    frame_settings = tk.Frame(root)
+    frame_settings.pack(pady=10)
+    tk.Label(frame_settings, text="Fight Settings", font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2)
+    tk.Label(frame_settings, text="Number of Rounds:", font=("Arial", 10)).grid(row=1, column=0)
+    om_total_rounds = tk.OptionMenu(frame_settings, total_rounds, 3, 5, 7)
+    om_total_rounds.config(font=("Arial", 10))
+    om_total_rounds.grid(row=1, column=1)
+    tk.Label(frame_settings, text="Round Duration (sec):", font=("Arial", 10)).grid(row=2, column=0)
+    om_round_duration = tk.OptionMenu(frame_settings, round_duration, 60, 90, 120, 180)
+    om_round_duration.config(font=("Arial", 10))
+    om_round_duration.grid(row=2, column=1)
+    tk.Label(frame_settings, text="Break Duration (sec):", font=("Arial", 10)).grid(row=3, column=0)
+    om_break_duration = tk.OptionMenu(frame_settings, break_duration, 45, 60)
+    om_break_duration.config(font=("Arial", 10))
+    om_break_duration.grid(row=3, column=1)
+    tk.Label(frame_settings, text="Number of Judges:", font=("Arial", 10)).grid(row=4, column=0)
+    om_judge_count = tk.OptionMenu(frame_settings, judge_count, 3, 5, 7)
+    om_judge_count.config(font=("Arial", 10))
+    om_judge_count.grid(row=4, column=1)
+
+    btn_validate_settings = tk.Button(frame_settings, text="Validate Fight Settings", command=validate_fight_settings, font=("Arial", 10))
+    btn_validate_settings.grid(row=5, column=0, columnspan=2, pady=5)
 
 # ====================================================
 # TIMER & ROUND DISPLAY SECTION
 # ====================================================
-frame_timer = tk.Frame(root)
-frame_timer.pack(pady=10)
-round_label = tk.Label(frame_timer, text=f"Round: {current_round.get()} / {total_rounds.get()}", font=("Arial", 14))
-round_label.pack(pady=5)
-timer_label = tk.Label(frame_timer, text="00:00", font=("Arial", 20))
-timer_label.pack(pady=5)
+def build_timer_section():
+    """
+    Round and clock labels.
+    """
+    global frame_timer, round_label, timer_label
+    frame_timer = tk.Frame(root)
+    frame_timer.pack(pady=10)
+    round_label = tk.Label(frame_timer, text=fight.round_text(), font=("Arial", 14))
+    round_label.pack(pady=5)
+    timer_label = tk.Label(frame_timer, text="00:00", font=("Arial", 20))
+    timer_label.pack(pady=5)
+
+CLOCK_MIN_REFRESH_MS = 20  # Floor on the clock refresh interval
 
 def update_timer():
     """
-    Update the countdown timer and manage round transitions.
-    
+    Refresh every ring's clock and manage round transitions. The time itself
+    comes from each fight's deadline; this loop only decides when to redraw,
+    waking just after the next displayed second changes (at least once a second).
+    """
+    delay = refresh_clocks()
+    return max(CLOCK_MIN_REFRESH_MS, int(delay * 1000) + 5)   # Scheduler task "clock": ms to its next run
+
+def refresh_clocks():
+    """
+    Tick every running ring; returns the seconds until a displayed clock next changes.
+    """
+    delay = 1.0
+    for ring in list(rings.values()):
+        if ring.fight.started and not ring.fight.over:
+            tick_ring(ring)
+            step = ring.fight.next_display_change()
+            if step is not None:
+                delay = min(delay, step)
+    return delay
+
+def tick_ring(ring):
+    """
+    Tick one ring's clock.
+
     When the fight time expires during a round:
       - If there are rounds remaining, the timer switches to break mode.
       - Else, the fight stops and the winner is determined based on the favorable judges.
+    Only the ring shown in the admin window is redrawn; the others just publish.
+    After a stalled frame several phase changes may be due, so keep going until
+    the clock is current.
     """
-    global time_left, timer_running, mode_timer, current_round, total_rounds
-    if timer_running and time_left > 0:
-        minutes = time_left // 60
-        seconds = time_left % 60
-        timer_label.config(text=f"{minutes:02d}:{seconds:02d}")
-        time_left -= 1
-        root.after(1000, update_timer)
-    elif time_left <= 0:
-        if mode_timer == "round":
-            # If there is another round to be played, start a break period.
-            if current_round.get() < total_rounds.get():
-                mode_timer = "break"
-                time_left = break_duration.get()
-                timer_label.config(fg="red")
-                round_label.config(text=f"Break after Round {current_round.get()}")
-                root.after(1000, update_timer)
-            else:
-                # No more rounds: stop the fight and determine the winner by favorable judges.
-                timer_running = False
-                declare_winner_by_judges()
-        elif mode_timer == "break":
-            # Transition back to a new round after a break.
-            current_round.set(current_round.get() + 1)
-            mode_timer = "round"
-            time_left = round_duration.get()
-            timer_label.config(fg="black")
-            round_label.config(text=f"Round: {current_round.get()} / {total_rounds.get()}")
-            root.after(1000, update_timer)
+    event = ring.fight.tick()
+    if event is None:
+        return
+    while event in ("break", "round"):
+        show_tick(ring, event)
+        event = ring.fight.tick()
+    show_tick(ring, event)
+    ring.fight.checkpoint()
+
+def show_tick(ring, event):
+    if event is None:
+        return
+    if not shown_in_admin(ring):
+        if event == "end":
+            ring.fight.decide_by_judges()
+        ring.publish()
+        return
+    timer_label.config(text=fight.clock_text())
+    if event == "break":
+        timer_label.config(fg="red")
+        round_label.config(text=fight.round_text())
+    elif event == "round":
+        timer_label.config(fg="black")
+        round_label.config(text=fight.round_text())
+    elif event == "end":
+        # No more rounds: stop the fight and determine the winner by favorable judges.
+        declare_winner_by_judges()
+    publish_state()
 
 def start_fight():
     """
     Initialize and start the fight timer; tokens have already been generated in new_fight().
     """
-    global timer_running, fight_started, current_round, total_rounds, time_left, judge_tokens
-    if not fight_started:
-        fight_started = True
-        current_round.set(1)
-        time_left = round_duration.get()
-        round_label.config(text=f"Round: {current_round.get()} / {total_rounds.get()}")
-        # Note: No new token generation here
-        
-    if not timer_running:
-        timer_running = True
-        update_timer()
+    if not fight.started:
+        sync_fight_info()
+    if fight.start():
+        round_label.config(text=fight.round_text())
+        timer_label.config(text=fight.clock_text())
     enable_fight_controls()
+    publish_state()
 
 def stop_fight():
     """
     Stop (pause) the fight timer; if fight is over, stop blinking.
     """
-    global timer_running, blinking, fight_over
-    if fight_over:
-        blinking = False
-        timer_label.config(fg=winner_color_global)
+    if fight.over:
+        stop_blinking()
+        timer_label.config(fg=fight.winner_color)
     else:
-        timer_running = False
+        fight.stop()
+    publish_state()
 
-def warning_blue():
+def show_winner():
     """
-    When the admin clicks the Blue warning button:
-      - Verify that the fight is active (started, not over, and in a round).
-      - If the timer is still running, show an error and exit.
-      - Otherwise, ask for confirmation.
-      - If confirmed, apply the warning: add 3 points (per judge) in favor of Red.
-      - If the Blue fighter receives 4 warnings, disqualify Blue.
+    Display the decided result on the big clock label.
     """
-    global blue_warning_count, judge_scores, timer_running, winner_text_global, winner_color_global
-
-    # Check if warnings can be given (only active round, fight started, not over)
-    if not fight_started or fight_over or mode_timer != "round":
-        messagebox.showerror("Warning", "Warnings can only be given during an active round.")
-        return
-
-    # If the timer is still running, stop the admin from giving a warning.
-    if timer_running:
-        messagebox.showerror("Warning", "Please stop time before giving warning.")
-        return
-
-    # Confirm if the admin wants to apply the warning.
-    if not messagebox.askyesno("Confirm Warning", "Are you sure you want to give a Blue warning?"):
-        return
+    timer_label.config(text=fight.winner_text, fg=fight.winner_color, font=("Arial", 36, "bold"))
+    publish_state()
 
-    # Apply the warning.
-    blue_warning_count += 1
-    for judge in judge_scores:
-        judge_scores[judge]["red"] += 3
-    update_judge_details()
-    # Update the warning counter label for Blue
-    warning_blue_label.config(text=str(blue_warning_count))
-    
-    # Check if Blue has reached 4 warnings and disqualify if so.
-    if blue_warning_count >= 4:
-        timer_running = False
-        winner_text_global = "WINNER RED (DISQUALIFIED)"
-        winner_color_global = "red"
-        timer_label.config(text=winner_text_global, fg=winner_color_global, font=("Arial", 36, "bold"))
-        messagebox.showinfo("Disqualification", "The Blue fighter received 4 warnings and is disqualified.")
-        lock_interface_final()
+def update_warning_labels():
+    view.set(warning_red_label, text=str(fight.red_warnings))
+    view.set(warning_blue_label, text=str(fight.blue_warnings))
+    publish_state()
 
-def warning_red():
+def give_warning(color):
     """
-    When the admin clicks the Red warning button:
+    When the admin clicks a warning button:
       - Verify that the fight is active (started, not over, and in a round).
       - If the timer is still running, show an error and exit.
       - Otherwise, ask for confirmation.
-      - If confirmed, apply the warning: add 3 points (per judge) in favor of Blue.
-      - If the Red fighter receives 4 warnings, disqualify Red.
+      - If confirmed, apply the warning: add 3 points (per judge) in favor of the opponent.
+      - If the fighter receives 4 warnings, disqualify them.
     """
-    global red_warning_count, judge_scores, timer_running, winner_text_global, winner_color_global
+    if warning_allowed():
+        confirm_bar.ask(f"Give a {color.capitalize()} warning?", lambda: apply_warning(color))
 
+def warning_allowed():
+    """
+    Warnings need an active round with the clock stopped; tells the official otherwise.
+    """
     # Check if warnings can be given (only active round, fight started, not over)
-    if not fight_started or fight_over or mode_timer != "round":
-        messagebox.showerror("Warning", "Warnings can only be given during an active round.")
-        return
-
-    # Ensure the chronometer is stopped.
-    if timer_running:
-        messagebox.showerror("Warning", "Please stop time before giving warning.")
-        return
+    if not fight.can_warn():
+        confirm_bar.notify("Warnings can only be given during an active round.", "error")
+        return False
 
-    # Confirm if the admin wants to give the warning.
-    if not messagebox.askyesno("Confirm Warning", "Are you sure you want to give a Red warning?"):
+    # If the timer is still running, stop the admin from giving a warning.
+    if fight.timer_running:
+        confirm_bar.notify("Please stop time before giving warning.", "error")
+        return False
+    return True
+
+def apply_warning(color):
+    # The clock may have been restarted while the question was open.
+    if not warning_allowed():
         return
-
-    # Apply the warning.
-    red_warning_count += 1
-    for judge in judge_scores:
-        judge_scores[judge]["blue"] += 3
+    disqualified = fight.apply_warning(color)
     update_judge_details()
-    # Update the warning counter label for Red
-    warning_red_label.config(text=str(red_warning_count))
+    update_warning_labels()
 
+    # Check if the fighter has reached 4 warnings and was disqualified.
+    if disqualified:
+        show_winner()
+        confirm_bar.notify(f"The {color.capitalize()} fighter received 4 warnings and is disqualified.")
+        lock_interface_final()
 
+def warning_blue():
+    give_warning("blue")
 
-    # Check if Red has reached 4 warnings and disqualify if so.
-    if red_warning_count >= 4:
-        timer_running = False
-        winner_text_global = "WINNER BLUE (DISQUALIFIED)"
-        winner_color_global = "blue"
-        timer_label.config(text=winner_text_global, fg=winner_color_global, font=("Arial", 36, "bold"))
-        messagebox.showinfo("Disqualification", "The Red fighter received 4 warnings and is disqualified.")
-        lock_interface_final()
+def warning_red():
+    give_warning("red")
 
-def ko_red():
+def knockout(loser):
     """
-    Trigger a Knockout (KO) for Red, awarding victory to Blue.
+    Trigger a Knockout (KO) for one corner, awarding victory to the opponent.
     """
-    global timer_running, fight_over, blinking, winner_text_global, winner_color_global
-    if not fight_started:
-        messagebox.showwarning("Warning", "Fight has not started yet.")
+    if not fight.started:
+        confirm_bar.notify("Fight has not started yet.", "error")
         return
-    answer = messagebox.askyesno("Confirmation", "Confirm KO for Red? (This will award victory to Blue)")
-    if not answer:
+    winner = "Blue" if loser == "red" else "Red"
+    confirm_bar.ask(f"Confirm KO for {loser.capitalize()}? (This will award victory to {winner})",
+                    lambda: apply_knockout(loser))
+
+def apply_knockout(loser):
+    # The fight may have been decided while the question was open.
+    if fight.over:
         return
-    timer_running = False
-    winner_text_global = "WINNER BLUE (KO)"
-    winner_color_global = "blue"
-    timer_label.config(text=winner_text_global, fg=winner_color_global, font=("Arial", 36, "bold"))
-    fight_over = True
-    blinking = True
+    fight.ko(loser)
+    show_winner()
     start_blinking()
     lock_interface_final()
 
+def ko_red():
+    knockout("red")
+
 def ko_blue():
-    """
-    Trigger a Knockout (KO) for Blue, awarding victory to Red.
-    """
-    global timer_running, fight_over, blinking, winner_text_global, winner_color_global
-    if not fight_started:
-        messagebox.showwarning("Warning", "Fight has not started yet.")
-        return
-    answer = messagebox.askyesno("Confirmation", "Confirm KO for Blue? (This will award victory to Red)")
-    if not answer:
-        return
-    timer_running = False
-    winner_text_global = "WINNER RED (KO)"
-    winner_color_global = "red"
-    timer_label.config(text=winner_text_global, fg=winner_color_global, font=("Arial", 36, "bold"))
-    fight_over = True
-    blinking = True
-    start_blinking()
-    lock_interface_final()
+    knockout("blue")
+
+BLINK_MS = 500
 
 def start_blinking():
     """
-    Begin the blinking routine for the winner display.
+    Begin the blinking routine for the winner display (a no-op if it already blinks).
     """
-    blink_winner()
+    if not scheduler.scheduled("blink_winner"):
+        scheduler.every("blink_winner", BLINK_MS, blink_winner, delay_ms=0)
+
+def stop_blinking():
+    scheduler.cancel("blink_winner")
 
 def blink_winner():
     """
     Toggle the timer label's color to create a blinking effect.
     """
-    global blinking, winner_color_global
-    if blinking:
-        current_fg = timer_label.cget("fg")
-        timer_label.config(fg="white" if current_fg == winner_color_global else winner_color_global)
-        root.after(500, blink_winner)
+    current_fg = timer_label.cget("fg")
+    timer_label.config(fg="white" if current_fg == fight.winner_color else fight.winner_color)
 
 def enable_fight_controls():
     """
@@ -681,7 +2513,7 @@ def enable_start_if_valid():
     """
     Enable the 'Fight' button if both fighter data and fight settings are validated.
     """
-    if fighters_validated and settings_validated:
+    if current_ring.fighters_validated and current_ring.settings_validated:
         btn_fight.config(state="normal")
 
 def lock_interface_final():
@@ -696,86 +2528,123 @@ def lock_interface_final():
 # ====================================================
 # TIMER CONTROL BUTTONS
 # ====================================================
-timer_buttons_frame = tk.Frame(frame_timer)
-timer_buttons_frame.pack(pady=5)
-btn_fight = tk.Button(timer_buttons_frame, text="Fight", command=start_fight, font=("Arial", 12),
-                      bg="green", fg="white", state="disabled")
-btn_fight.pack(side="left", padx=5)
-btn_stop = tk.Button(timer_buttons_frame, text="Stop", command=stop_fight, font=("Arial", 12),
-                     bg="black", fg="white")
-btn_stop.pack(side="left", padx=5)
-
-btn_warning_red = tk.Button(timer_buttons_frame, text="WARNING RED", command=warning_red, font=("Arial", 12), bg="red", fg="white")
-btn_warning_red.pack(side="left", padx=5)
-
-btn_warning_blue = tk.Button(timer_buttons_frame, text="WARNING BLUE", command=warning_blue, font=("Arial", 12), bg="blue", fg="white")
-btn_warning_blue.pack(side="left", padx=5)
-
-btn_ko_red = tk.Button(timer_buttons_frame, text="K.O RED", command=ko_red, font=("Arial", 12),
-                       bg="red", fg="white")
-btn_ko_red.pack(side="left", padx=5)
-
-btn_ko_blue = tk.Button(timer_buttons_frame, text="K.O BLUE", command=ko_blue, font=("Arial", 12),
-                        bg="blue", fg="white")
-btn_ko_blue.pack(side="left", padx=5)
+def build_timer_buttons():
+    """
+    Fight, Stop, warning and K.O buttons under the clock.
+    """
+    global btn_fight, btn_stop, btn_warning_red, btn_warning_blue, btn_ko_red, btn_ko_blue
+    timer_buttons_frame = tk.Frame(frame_timer)
+    timer_buttons_frame.pack(pady=5)
+    btn_fight = tk.Button(timer_buttons_frame, text="Fight", command=start_fight, font=("Arial", 12),
+                          bg="green", fg="white", state="disabled")
+    btn_fight.pack(side="left", padx=5)
+    btn_stop = tk.Button(timer_buttons_frame, text="Stop", command=stop_fight, font=("Arial", 12),
+                         bg="black", fg="white")
+    btn_stop.pack(side="left", padx=5)
+
+    btn_warning_red = tk.Button(timer_buttons_frame, text="WARNING RED", command=warning_red, font=("Arial", 12), bg="red", fg="white")
+    btn_warning_red.pack(side="left", padx=5)
+
+    btn_warning_blue = tk.Button(timer_buttons_frame, text="WARNING BLUE", command=warning_blue, font=("Arial", 12), bg="blue", fg="white")
+    btn_warning_blue.pack(side="left", padx=5)
+
+    btn_ko_red = tk.Button(timer_buttons_frame, text="K.O RED", command=ko_red, font=("Arial", 12),
+                           bg="red", fg="white")
+    btn_ko_red.pack(side="left", padx=5)
+
+    btn_ko_blue = tk.Button(timer_buttons_frame, text="K.O BLUE", command=ko_blue, font=("Arial", 12),
+                            bg="blue", fg="white")
+    btn_ko_blue.pack(side="left", padx=5)
 
 # ====================================================
 # JUDGE INTERFACE DISPLAY (Favorability Counter & Detailed Scores)
 # ====================================================
-# Judge Favorability Counter Section
-frame_judge_counts = tk.Frame(root)
-frame_judge_counts.pack(pady=10)
-label_red_judges = tk.Label(frame_judge_counts, text="0", fg="red", font=("Arial", 24, "bold"))
-label_red_judges.pack(side="left", padx=20)
-label_blue_judges = tk.Label(frame_judge_counts, text="0", fg="blue", font=("Arial", 24, "bold"))
-label_blue_judges.pack(side="left", padx=20)
-
-# Detailed Judge Scores Section
-frame_judge_details = tk.Frame(root)
-frame_judge_details.pack(pady=10)
-tk.Label(frame_judge_details, text="Judge 1 Red:", font=("Arial", 10), fg="red").grid(row=0, column=0, padx=5)
-judge1_red_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="red")
-judge1_red_label.grid(row=0, column=1, padx=5)
-tk.Label(frame_judge_details, text="Judge 1 Blue:", font=("Arial", 10), fg="blue").grid(row=0, column=2, padx=5)
-judge1_blue_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="blue")
-judge1_blue_label.grid(row=0, column=3, padx=5)
-
-tk.Label(frame_judge_details, text="Judge 2 Red:", font=("Arial", 10), fg="red").grid(row=1, column=0, padx=5)
-judge2_red_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="red")
-judge2_red_label.grid(row=1, column=1, padx=5)
-tk.Label(frame_judge_details, text="Judge 2 Blue:", font=("Arial", 10), fg="blue").grid(row=1, column=2, padx=5)
-judge2_blue_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="blue")
-judge2_blue_label.grid(row=1, column=3, padx=5)
-
-tk.Label(frame_judge_details, text="Judge 3 Red:", font=("Arial", 10), fg="red").grid(row=2, column=0, padx=5)
-judge3_red_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="red")
-judge3_red_label.grid(row=2, column=1, padx=5)
-tk.Label(frame_judge_details, text="Judge 3 Blue:", font=("Arial", 10), fg="blue").grid(row=2, column=2, padx=5)
-judge3_blue_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="blue")
-judge3_blue_label.grid(row=2, column=3, padx=5)
-
-# Warning counter labels for each corner (placed in row 3, just under Judge 3 scoring)
-tk.Label(frame_judge_details, text="Warnings Red:", font=("Arial", 10), fg="red").grid(row=3, column=0, padx=5)
-warning_red_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="red")
-warning_red_label.grid(row=3, column=1, padx=5)
-
-tk.Label(frame_judge_details, text="Warnings Blue:", font=("Arial", 10), fg="blue").grid(row=3, column=2, padx=5)
-warning_blue_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="blue")
-warning_blue_label.grid(row=3, column=3, padx=5)
+judge_score_labels = []   # (red label, blue label) per judge
+judge_grid_widgets = []   # Every widget in the judge rows, to rebuild for another panel size
+
+def build_judge_section():
+    """
+    Favourable-judge counters, then the per-judge scores (see build_judge_grid),
+    warnings and queue status.
+    """
+    global label_red_judges, label_blue_judges, frame_judge_details
+    global warning_red_title, warning_red_label, warning_blue_title, warning_blue_label, queue_status_label
+    # Judge Favorability Counter Section
+    frame_judge_counts = tk.Frame(root)
+    frame_judge_counts.pack(pady=10)
+    label_red_judges = tk.Label(frame_judge_counts, text="0", fg="red", font=("Arial", 24, "bold"))
+    label_red_judges.pack(side="left", padx=20)
+    label_blue_judges = tk.Label(frame_judge_counts, text="0", fg="blue", font=("Arial", 24, "bold"))
+    label_blue_judges.pack(side="left", padx=20)
+
+    # Detailed Judge Scores Section: one row per judge (built by build_judge_grid),
+    # then the warning counters and the score queue status.
+    frame_judge_details = tk.Frame(root)
+    frame_judge_details.pack(pady=10)
+    warning_red_title = tk.Label(frame_judge_details, text="Warnings Red:", font=("Arial", 10), fg="red")
+    warning_red_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="red")
+    warning_blue_title = tk.Label(frame_judge_details, text="Warnings Blue:", font=("Arial", 10), fg="blue")
+    warning_blue_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="blue")
+
+    # Score queue status (depth, applied/enqueued, drain latency)
+    queue_status_label = tk.Label(frame_judge_details, text="", font=("Arial", 8), fg="gray")
+
+def build_judge_grid(judges):
+    """
+    Lay out a red and blue score label per judge; does nothing if the grid
+    already has that many rows.
+    """
+    if len(judge_score_labels) == judges:
+        return
+    for widget in judge_grid_widgets:
+        view.forget(widget)
+        widget.destroy()
+    judge_grid_widgets.clear()
+    judge_score_labels.clear()
+    for row, judge_num in enumerate(range(1, judges + 1)):
+        red_title = tk.Label(frame_judge_details, text=f"Judge {judge_num} Red:", font=("Arial", 10), fg="red")
+        red_title.grid(row=row, column=0, padx=5)
+        red_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="red")
+        red_label.grid(row=row, column=1, padx=5)
+        blue_title = tk.Label(frame_judge_details, text=f"Judge {judge_num} Blue:", font=("Arial", 10), fg="blue")
+        blue_title.grid(row=row, column=2, padx=5)
+        blue_label = tk.Label(frame_judge_details, text="0", font=("Arial", 12), fg="blue")
+        blue_label.grid(row=row, column=3, padx=5)
+        judge_grid_widgets.extend((red_title, red_label, blue_title, blue_label))
+        judge_score_labels.append((red_label, blue_label))
+    # Warning counters just under the last judge, queue status below them.
+    warning_red_title.grid(row=judges, column=0, padx=5)
+    warning_red_label.grid(row=judges, column=1, padx=5)
+    warning_blue_title.grid(row=judges, column=2, padx=5)
+    warning_blue_label.grid(row=judges, column=3, padx=5)
+    queue_status_label.grid(row=judges + 1, column=0, columnspan=4, pady=5)
 
 # ====================================================
 # FLASK ROUTES: WEB-BASED JUDGE INTERFACE
 # ====================================================
-@app.route("/judge_login", methods=["GET", "POST"])
-def judge_login():
+def get_ring(ring_id):
     """
-    Display a common judge login page.
+    Look up a ring named in a URL; None if there is no such ring.
+    The un-prefixed routes pass None, meaning the launch ring (--ring).
+    """
+    return rings.get(DEFAULT_RING if ring_id is None else ring_id)
+
+@app.route("/judge_login", methods=["GET", "POST"], defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/judge_login", methods=["GET", "POST"])
+def judge_login(ring_id):
+    """
+    Display a common judge login page for one ring.
     Lock login once the fight starts.
     """
-    if fight_started:
+    ring = get_ring(ring_id)
+    if ring is None:
+        return "Unknown ring", 404
+    if ring.fight.started:
         return "Judge login is locked because the fight has started.", 403
     if request.method == "GET":
-        return '''
+        options = "".join(f'<option value="{judge_num}">Judge {judge_num}</option>'
+                          for judge_num in sorted(ring.judge_tokens))
+        return f'''
         <!DOCTYPE html>
         <html>
         <head>
@@ -787,9 +2656,7 @@ def judge_login():
           <form method="post">
             <label>Select your judge role:</label>
             <select name="judge_num">
-              <option value="1">Judge 1</option>
-              <option value="2">Judge 2</option>
-              <option value="3">Judge 3</option>
+              {options}
             </select>
             <input type="submit" value="Login">
           </form>
@@ -797,17 +2664,19 @@ def judge_login():
         </html>
         '''
     else:
-        judge_num = request.form.get("judge_num")
-        if judge_num not in ['1', '2', '3']:
+        judge_num = request.form.get("judge_num", "")
+        if not judge_num.isdigit() or int(judge_num) not in ring.judge_tokens:
             return "Invalid judge selection", 400
-        token = judge_tokens.get(int(judge_num))
+        token = ring.judge_tokens.get(int(judge_num))
         if not token:
             return "Judge token not available. Has a new fight been started?", 400
+        # Keep the ring prefix: behind the coordinator it is what routes the judge to this ring's worker
+        target = f"/final_judge/{token}" if ring_id is None else f"/ring/{ring.ring_id}/final_judge/{token}"
         return f'''
         <!DOCTYPE html>
         <html>
         <head>
-          <meta http-equiv="refresh" content="0; url=/final_judge/{token}" />
+          <meta http-equiv="refresh" content="0; url={target}" />
           <title>Redirecting...</title>
         </head>
         <body>
@@ -816,346 +2685,1164 @@ def judge_login():
         </html>
         '''
 
-@app.route("/final_judge/<token>")
-def final_judge(token):
+# Judge interface assets. The page differs between judges only by ring, judge
+# number, token and layout, so the HTML shell, CSS and JS are rendered once at
+# start-up and served with ETags; each tablet then fetches a small bootstrap
+# document with its own data.
+JUDGE_ASSET_MAX_AGE = 365 * 24 * 3600  # Asset URLs carry a content hash, so cache "forever"
+
+# Scoring buttons per layout: one row per (red label, red action, blue label, blue action).
+JUDGE_BUTTONS = {
+    "tatami": [
+        ("3 - Head Jump Kick", "HI-JUMP KICK RED", "3 - Head Jump Kick", "HI-JUMP KICK BLUE"),
+        ("2 - Jump/Head Kick", "JUMP KICK RED", "2 - Jump/Head Kick", "JUMP KICK BLUE"),
+        ("1 - Point Red", "POINT RED", "1 - Point Blue", "POINT BLUE"),
+    ],
+    "ring": [
+        ("1 - Point Red", "POINT RED", "1 - Point Blue", "POINT BLUE"),
+    ],
+}
+
+JUDGE_CSS = """
+body {
+  font-family: Arial, sans-serif;
+  text-align: center;
+  background-color: #f7f7f7;
+}
+h1 {
+  margin-top: 20px;
+  font-size: 16px;
+}
+.button {
+  display: block;
+  padding: 10px;
+  font-size: 16px;
+  margin: 10px auto;
+  border: none;
+  border-radius: 5px;
+  color: #fff;
+  cursor: pointer;
+  width: 90%;
+}
+.ring .button {
+  padding: 15px 0;
+  font-size: 20px;
+  margin: 15px auto;
+  border-radius: 10px;
+}
+.red {
+  background-color: #e74c3c;
+}
+.blue {
+  background-color: #3498db;
+}
+table {
+  width: 100%;
+  border-collapse: collapse;
+}
+td {
+  vertical-align: top;
+  width: 50%;
+}
+.ring td {
+  vertical-align: middle;
+}
+#status {
+  font-size: 12px;
+}
+.pending {
+  color: #e67e22;
+}
+.confirmed {
+  color: #27ae60;
+}
+"""
+
+# Loads the bootstrap from the URL the page was served under (final_judge ->
+# judge_bootstrap) and builds the buttons. Taps go into a local queue (kept in
+# localStorage, so a reload loses nothing) with a per-judge sequence number and
+# are shown at once in the totals; the queue is flushed in order as batches to
+# judge_scores (over the WebSocket when there is one) until the server acks them.
+JUDGE_JS = """
+var judge = null;
+var socket = null;
+var outbox = {next_seq: 1, queue: []};   // Taps not yet acknowledged by the server
+var confirmed = {red: 0, blue: 0};       // Totals as last reported by the server
+var inflight = false;
+var ackTimer = null;                     // Pending WebSocket batch: give up on its ack after ACK_TIMEOUT_MS
+var ACK_TIMEOUT_MS = 5000;
+var lastError = "";
+var totals = document.getElementById("totals");
+var statusLine = document.getElementById("status");
+
+function storageKey() { return "judge-outbox:" + judge.token; }
+
+function save() {
+  try { localStorage.setItem(storageKey(), JSON.stringify(outbox)); } catch (e) {}
+}
+
+function load() {
+  try {
+    var saved = JSON.parse(localStorage.getItem(storageKey()));
+    if (saved && saved.queue) outbox = saved;
+  } catch (e) {}
+  // Never reuse a number the server has already seen.
+  outbox.next_seq = Math.max(outbox.next_seq, judge.acked + 1);
+  outbox.queue = outbox.queue.filter(function(item) { return item.seq > judge.acked; });
+}
+
+function show() {
+  var red = confirmed.red, blue = confirmed.blue;
+  outbox.queue.forEach(function(item) {
+    var points = judge.points[item.action];
+    if (points) { red += points.red; blue += points.blue; }
+  });
+  totals.textContent = "Red " + red + " - Blue " + blue;
+  if (outbox.queue.length) {
+    statusLine.className = "pending";
+    statusLine.textContent = outbox.queue.length + " pending" + (navigator.onLine === false ? " (offline)" : "");
+  } else {
+    statusLine.className = "confirmed";
+    statusLine.textContent = "All scores confirmed";
+  }
+  if (lastError) statusLine.textContent += " - " + lastError;
+}
+
+function onAck(ack) {
+  clearTimeout(ackTimer);
+  inflight = false;
+  if (!ack.ok) {
+    lastError = ack.error;
+    show();
+    return;
+  }
+  outbox.queue = outbox.queue.filter(function(item) { return item.seq > ack.acked; });
+  confirmed = ack.totals;
+  lastError = ack.rejected.length ? ack.rejected[ack.rejected.length - 1].error : "";
+  save();
+  show();
+  if (outbox.queue.length) flush();
+}
+
+function flush() {
+  if (inflight || !outbox.queue.length) return;
+  inflight = true;
+  var batch = JSON.stringify({actions: outbox.queue.slice(0, 50)});
+  if (socket && socket.readyState === WebSocket.OPEN) {
+    socket.send(batch);
+    ackTimer = setTimeout(ackTimedOut, ACK_TIMEOUT_MS);
+    return;
+  }
+  var xhr = new XMLHttpRequest();
+  xhr.open("POST", "/ring/" + judge.ring_id + "/judge_scores/" + judge.token, true);
+  xhr.setRequestHeader("Content-Type", "application/json");
+  xhr.timeout = 5000;
+  xhr.onload = function() {
+    try { onAck(JSON.parse(xhr.responseText)); } catch (e) { inflight = false; }
+  };
+  xhr.onerror = xhr.ontimeout = function() { inflight = false; show(); };
+  xhr.send(batch);
+}
+
+function ackTimedOut() {
+  // The socket looks open but nothing comes back: drop it and resend by POST.
+  // Resending is safe, the server skips sequence numbers it has already seen.
+  var stale = socket;
+  socket = null;
+  inflight = false;
+  if (stale) {
+    stale.onmessage = null;
+    stale.onclose = function() { setTimeout(connect, 1000); };
+    stale.close();
+  }
+  flush();
+}
+
+function connect() {
+  if (!judge.use_ws || !window.WebSocket) return;
+  var scheme = location.protocol === "https:" ? "wss://" : "ws://";
+  socket = new WebSocket(scheme + location.host + "/ring/" + judge.ring_id + "/judge_ws/" + judge.token);
+  socket.onopen = function() { inflight = false; flush(); };
+  socket.onmessage = function(event) { onAck(JSON.parse(event.data)); };
+  socket.onclose = function() {
+    clearTimeout(ackTimer);
+    socket = null;
+    inflight = false;
+    setTimeout(connect, 1000);
+  };
+}
+
+function sendScore(color, scoring_action) {
+  outbox.queue.push({seq: outbox.next_seq++, color: color, action: scoring_action});
+  save();
+  show();
+  flush();
+}
+
+function button(color, label, scoring_action) {
+  var cell = document.createElement("td");
+  var b = document.createElement("button");
+  b.className = "button " + color;
+  b.textContent = label;
+  b.onclick = function() { sendScore(color, scoring_action); };
+  cell.appendChild(b);
+  return cell;
+}
+
+function render() {
+  var title = "Judge Interface - Ring " + judge.ring_id + " - Judge " + judge.judge;
+  document.title = title;
+  document.getElementById("title").textContent = title;
+  document.body.className = judge.layout;
+  var table = document.getElementById("buttons");
+  table.innerHTML = "";
+  judge.buttons.forEach(function(row) {
+    var tr = document.createElement("tr");
+    tr.appendChild(button("red", row[0], row[1]));
+    tr.appendChild(button("blue", row[2], row[3]));
+    table.appendChild(tr);
+  });
+}
+
+var xhr = new XMLHttpRequest();
+xhr.open("GET", location.pathname.replace("/final_judge/", "/judge_bootstrap/"), true);
+xhr.onload = function() {
+  if (xhr.status !== 200) {
+    document.getElementById("title").textContent = xhr.responseText;
+    return;
+  }
+  judge = JSON.parse(xhr.responseText);
+  confirmed = judge.totals;
+  load();
+  render();
+  show();
+  connect();
+  flush();
+  // Retry whatever is still queued: on a timer, and as soon as the network is back.
+  setInterval(function() { if (!inflight) flush(); }, 1000);
+  window.addEventListener("online", flush);
+  window.addEventListener("offline", show);
+};
+xhr.send();
+"""
+
+def judge_asset_etag(body):
+    return hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]
+
+JUDGE_CSS_ETAG = judge_asset_etag(JUDGE_CSS)
+JUDGE_JS_ETAG = judge_asset_etag(JUDGE_JS)
+
+JUDGE_SHELL = f"""<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <title>Judge Interface</title>
+  <link rel="stylesheet" href="/judge_assets/judge.css?v={JUDGE_CSS_ETAG}">
+</head>
+<body>
+  <h1 id="title">Judge Interface</h1>
+  <div id="totals"></div>
+  <div id="status"></div>
+  <table id="buttons"></table>
+  <script src="/judge_assets/judge.js?v={JUDGE_JS_ETAG}"></script>
+</body>
+</html>
+"""
+JUDGE_SHELL_ETAG = judge_asset_etag(JUDGE_SHELL)
+
+JUDGE_ASSETS = {
+    "judge.css": (JUDGE_CSS, "text/css", JUDGE_CSS_ETAG),
+    "judge.js": (JUDGE_JS, "application/javascript", JUDGE_JS_ETAG),
+}
+
+def conditional_response(body, mimetype, etag, cache_control):
+    """
+    Build a response carrying an ETag; answers 304 Not Modified when the
+    client already holds this version (If-None-Match).
+    """
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = cache_control
+    return response.make_conditional(request)
+
+@app.route("/judge_assets/<name>")
+def judge_asset(name):
+    """
+    Static judge CSS/JS. The URLs in the shell carry the content hash, so the
+    files can be cached for good and a new build simply gets new URLs.
+    """
+    if name not in JUDGE_ASSETS:
+        return "Not found", 404
+    body, mimetype, etag = JUDGE_ASSETS[name]
+    return conditional_response(body, mimetype, etag,
+                                f"public, max-age={JUDGE_ASSET_MAX_AGE}, immutable")
+
+@app.route("/categories.json")
+def categories_catalogue():
+    """
+    Disciplines, age categories, authorised ages and weight categories, as one
+    JSON document built at start-up.
+    """
+    return conditional_response(CATEGORIES_JSON, "application/json", CATEGORIES_ETAG,
+                                "public, max-age=3600")
+
+@app.route("/final_judge/<token>", defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/final_judge/<token>")
+def final_judge(ring_id, token):
     """
     Display the final judge interface after validating the judge token.
+    The token identifies the ring, so the un-prefixed route works for every ring.
+    Every judge gets the same pre-rendered shell; it is revalidated on each
+    load (so a stale token is still refused) and answered with 304 when unchanged.
     """
-    judge_num = None
-    for num, tok in judge_tokens.items():
-        if tok == token:
-            judge_num = num
-            break
-    if judge_num is None:
+    ring, judge_num = judge_for_token(token)
+    if ring is None or ring_id not in (None, ring.ring_id):
         return "Unauthorized: Invalid token", 403
-    if discipline.get() in tatami_age_dict:
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-          <meta charset="UTF-8">
-          <title>Judge Interface - Judge {judge_num}</title>
-          <style>
-            body {{
-              font-family: Arial, sans-serif;
-              text-align: center;
-              background-color: #f7f7f7;
-            }}
-            h1 {{
-              margin-top: 20px;
-              font-size: 16px;
-            }}
-            .button {{
-              display: block;
-              padding: 10px;
-              font-size: 16px;
-              margin: 10px auto;
-              border: none;
-              border-radius: 5px;
-              color: #fff;
-              cursor: pointer;
-              width: 90%;
-            }}
-            .red {{
-              background-color: #e74c3c;
-            }}
-            .blue {{
-              background-color: #3498db;
-            }}
-            table {{
-              width: 100%;
-              border-collapse: collapse;
-            }}
-            td {{
-              vertical-align: top;
-              width: 50%;
-            }}
-          </style>
-        </head>
-        <body>
-          <h1>Judge Interface - Judge {judge_num}</h1>
-          <table>
-            <tr>
-              <td>
-                <button class="button red" onclick="sendScore('red', 'HI-JUMP KICK RED')">3 - Head Jump Kick</button>
-              </td>
-              <td>
-                <button class="button blue" onclick="sendScore('blue', 'HI-JUMP KICK BLUE')">3 - Head Jump Kick</button>
-              </td>
-            </tr>
-            <tr>
-              <td>
-                <button class="button red" onclick="sendScore('red', 'JUMP KICK RED')">2 - Jump/Head Kick</button>
-              </td>
-              <td>
-                <button class="button blue" onclick="sendScore('blue', 'JUMP KICK BLUE')">2 - Jump/Head Kick</button>
-              </td>
-            </tr>
-            <tr>
-              <td>
-                <button class="button red" onclick="sendScore('red', 'POINT RED')">1 - Point Red</button>
-              </td>
-              <td>
-                <button class="button blue" onclick="sendScore('blue', 'POINT BLUE')">1 - Point Blue</button>
-              </td>
-            </tr>
-          </table>
-          <script>
-            function sendScore(color, scoring_action) {{
-              var xhr = new XMLHttpRequest();
-              xhr.open("GET", "/judge_score/{token}/" + color + "/" + scoring_action, true);
-              xhr.send();
-            }}
-          </script>
-        </body>
-        </html>
-        """
-    else:
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-          <meta charset="UTF-8">
-          <title>Judge Interface - Judge {judge_num}</title>
-          <style>
-            body {{
-              font-family: Arial, sans-serif;
-              text-align: center;
-              background-color: #f7f7f7;
-            }}
-            h1 {{
-              margin-top: 20px;
-              font-size: 16px;
-            }}
-            .button {{
-              display: block;
-              padding: 15px 0;
-              font-size: 20px;
-              margin: 15px auto;
-              border: none;
-              border-radius: 10px;
-              color: #fff;
-              cursor: pointer;
-              width: 90%;
-            }}
-            .red {{
-              background-color: #e74c3c;
-            }}
-            .blue {{
-              background-color: #3498db;
-            }}
-            table {{
-              width: 100%;
-              border-collapse: collapse;
-            }}
-            td {{
-              vertical-align: middle;
-              width: 50%;
-            }}
-          </style>
-        </head>
-        <body>
-          <h1>Judge Interface - Judge {judge_num}</h1>
-          <table>
-            <tr>
-              <td>
-                <button class="button red" onclick="sendScore('red', 'POINT RED')">1 - Point Red</button>
-              </td>
-              <td>
-                <button class="button blue" onclick="sendScore('blue', 'POINT BLUE')">1 - Point Blue</button>
-              </td>
-            </tr>
-          </table>
-          <script>
-            function sendScore(color, scoring_action) {{
-              var xhr = new XMLHttpRequest();
-              xhr.open("GET", "/judge_score/{token}/" + color + "/" + scoring_action, true);
-              xhr.send();
-            }}
-          </script>
-        </body>
-        </html>
-        """
-    return html
-
-@app.route("/judge_score/<token>/<color>/<scoring_action>", methods=["GET"])
-def judge_score(token, color, scoring_action):
-    global fight_started, timer_running, mode_timer, fight_over
+    return conditional_response(JUDGE_SHELL, "text/html", JUDGE_SHELL_ETAG, "no-cache")
 
+@app.route("/judge_bootstrap/<token>", defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/judge_bootstrap/<token>")
+def judge_bootstrap(ring_id, token):
+    """
+    The per-judge part of the judge interface: ring, judge number, token,
+    layout, its buttons and their points, whether the WebSocket channel is
+    available, and the judge's confirmed totals and sequence high-water mark.
+    """
+    ring, judge_num = judge_for_token(token)
+    if ring is None or ring_id not in (None, ring.ring_id):
+        return "Unauthorized: Invalid token", 403
+    layout = "tatami" if ring.fight.is_tatami() else "ring"
+    response = jsonify({
+        "ring_id": ring.ring_id,
+        "judge": judge_num,
+        "token": token,
+        "layout": layout,
+        "buttons": JUDGE_BUTTONS[layout],
+        "points": tatami_points if layout == "tatami" else ring_points,
+        "use_ws": sock is not None and not ARGS.worker,   # The coordinator does not proxy WebSockets
+        "totals": ring.fight.card(judge_num),
+        "acked": ring.judge_seq.get(judge_num, 0),
+    })
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+def check_score(ring_id, token, color, scoring_action):
+    """
+    Validate a judge's scoring request; `ring_id` is None for the un-prefixed routes.
+    Returns (ring, judge_num, None, 200) if it may be queued, else (None, None, message, status).
+    """
+    # Verify the judge token (it also tells us which ring the judge belongs to).
+    ring, judge_num = judge_for_token(token)
+    if ring is None or ring_id not in (None, ring.ring_id):
+        count_rejection("Unauthorized access: invalid token")
+        return None, None, "Unauthorized access: invalid token", 403
+    rejection = score_rejection(ring.fight, color, scoring_action)
+    if rejection:
+        count_rejection(rejection[0])
+        return None, None, *rejection
+    return ring, judge_num, None, 200
+
+def score_rejection(fight, color, scoring_action):
+    """
+    Why a score cannot be taken right now, as (message, status), or None if it can.
+    """
     # Only allow scoring if the fight has started, is actively running,
     # and is in the round phase.
-    if not fight_started or not timer_running or mode_timer != "round":
+    if not fight.can_score():
         return "Scoring not allowed at this time.", 403
 
-    # Verify the judge token.
-    judge_num = None
-    for num, tok in judge_tokens.items():
-        if tok == token:
-            judge_num = num
-            break
-    if judge_num is None:
-        return "Unauthorized access: invalid token", 403
-
     if color not in ["red", "blue"]:
         return "Invalid input", 400
 
-    global judge_scores, discipline
-    if discipline.get() in tatami_age_dict:
-        points = tatami_points.get(scoring_action, None)
-    else:
-        points = ring_points.get(scoring_action, None)
-
-    if points:
-        judge_scores[judge_num][color] += points[color]
-        root.after(0, update_judge_details)
-        return "OK", 200
-    else:
+    if fight.points_for(scoring_action) is None:
         return "Invalid scoring action", 400
+    return None
+
+@app.route("/judge_score/<token>/<color>/<scoring_action>", methods=["GET"], defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/judge_score/<token>/<color>/<scoring_action>", methods=["GET"])
+def judge_score(ring_id, token, color, scoring_action):
+    ring, judge_num, error, status = check_score(ring_id, token, color, scoring_action)
+    if error:
+        return error, status
+    # Validate here, apply later: the Tk loop drains the queue once per frame.
+    ring.score_queue.put(judge_num, color, scoring_action)
+    return "OK", 200
+
+SCORE_ACK_TIMEOUT_SEC = 1.0  # How long a WebSocket tap or a batch waits for the Tk drain before acking
+SCORE_BATCH_MAX = 200        # Actions accepted in one batch
+
+def submit_score_batch(ring, judge_num, actions):
+    """
+    Queue a batch of {"seq": n, "color": ..., "action": ...} from one judge,
+    each exactly once, and return the ack once the Tk loop has applied them.
+
+    Sequence numbers count up from 1 per judge and fight. A number at or below
+    the judge's high-water mark is a retry and is skipped, and the batch stops
+    at the first gap, so actions are taken in order. An action that cannot be
+    scored (clock stopped, bad input) still uses up its number and is listed
+    under "rejected"; "acked" is the new high-water mark.
+    """
+    rejected = []
+    pending = []
+    with ring.seq_lock:
+        acked = ring.judge_seq.get(judge_num, 0)
+        for item in actions:
+            seq = item.get("seq") if isinstance(item, dict) else None
+            if not isinstance(seq, int) or seq > acked + 1:
+                break
+            if seq <= acked:
+                continue
+            acked = seq
+            color, scoring_action = item.get("color"), item.get("action")
+            rejection = score_rejection(ring.fight, color, scoring_action)
+            if rejection:
+                count_rejection(rejection[0])
+                rejected.append({"seq": seq, "error": rejection[0], "status": rejection[1]})
+                continue
+            applied = threading.Event()
+            ring.score_queue.put(judge_num, color, scoring_action, done=applied, seq=seq)
+            pending.append(applied)
+        ring.judge_seq[judge_num] = acked
+    applied = all(event.wait(SCORE_ACK_TIMEOUT_SEC) for event in pending)
+    return {"ok": True, "judge": judge_num, "acked": acked, "applied": applied,
+            "rejected": rejected, "totals": ring.fight.card(judge_num)}
+
+@app.route("/judge_scores/<token>", methods=["POST"], defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/judge_scores/<token>", methods=["POST"])
+def judge_scores(ring_id, token):
+    """
+    Batched, idempotent scoring: POST {"actions": [{"seq", "color", "action"}, ...]}.
+    Safe to retry; see submit_score_batch() for the ack.
+    """
+    ring, judge_num = judge_for_token(token)
+    if ring is None or ring_id not in (None, ring.ring_id):
+        count_rejection("Unauthorized access: invalid token")
+        return jsonify({"ok": False, "error": "Unauthorized access: invalid token", "status": 403}), 403
+    body = request.get_json(silent=True)
+    actions = body.get("actions") if isinstance(body, dict) else None
+    if not isinstance(actions, list):
+        count_rejection("Invalid input")
+        return jsonify({"ok": False, "error": "Invalid input", "status": 400}), 400
+    if len(actions) > SCORE_BATCH_MAX:
+        return jsonify({"ok": False, "error": f"At most {SCORE_BATCH_MAX} actions per batch", "status": 413}), 413
+    return jsonify(submit_score_batch(ring, judge_num, actions))
+
+def judge_ws(ws, token, ring_id=None):
+    """
+    Long-lived scoring channel for one judge tablet.
+
+    The client sends {"color": ..., "action": ...} per tap and receives
+    {"ok": true, "judge": n, "totals": {"red": r, "blue": b}} once the score
+    has been applied, or {"ok": false, "error": ..., "status": ...}. A message
+    {"actions": [...]} is a sequenced batch, acked as by POST judge_scores.
+    """
+    ring, _judge_num = judge_for_token(token)
+    if ring is None or ring_id not in (None, ring.ring_id):
+        count_rejection("Unauthorized access: invalid token")
+        ws.send(json.dumps({"ok": False, "error": "Unauthorized access: invalid token", "status": 403}))
+        return
+    while True:
+        try:
+            message = json.loads(ws.receive())
+            if isinstance(message, dict) and isinstance(message.get("actions"), list):
+                ring, judge_num = judge_for_token(token)
+                if ring is None:
+                    count_rejection("Unauthorized access: invalid token")
+                    ws.send(json.dumps({"ok": False, "error": "Unauthorized access: invalid token", "status": 403}))
+                    continue
+                ws.send(json.dumps(submit_score_batch(ring, judge_num, message["actions"][:SCORE_BATCH_MAX])))
+                continue
+            color = message["color"]
+            scoring_action = message["action"]
+        except (ValueError, KeyError, TypeError):
+            count_rejection("Invalid input")
+            ws.send(json.dumps({"ok": False, "error": "Invalid input", "status": 400}))
+            continue
+        ring, judge_num, error, status = check_score(ring_id, token, color, scoring_action)
+        if error:
+            ws.send(json.dumps({"ok": False, "error": error, "status": status}))
+            continue
+        applied = threading.Event()
+        ring.score_queue.put(judge_num, color, scoring_action, done=applied)
+        ack = {"ok": True, "judge": judge_num, "applied": applied.wait(SCORE_ACK_TIMEOUT_SEC)}
+        ack["totals"] = ring.fight.card(judge_num)
+        ws.send(json.dumps(ack))
+
+if sock:
+    sock.route("/judge_ws/<token>")(judge_ws)
+    sock.route("/ring/<ring_id>/judge_ws/<token>", endpoint="ring_judge_ws")(judge_ws)
+
+@app.route("/score_queue")
+def score_queue_stats():
+    """
+    Ingestion queue counters per ring, to check that nothing is lost under burst load.
+    """
+    return jsonify({ring_id: ring.score_queue.stats() for ring_id, ring in list(rings.items())})
+
+@app.before_request
+def start_request_timer():
+    g.started_at = time.perf_counter()
+
+@app.after_request
+def time_request(response):
+    """
+    Feed the per-route latency histogram and response counter for /metrics.
+    """
+    started = g.get("started_at")
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        metrics.observe("kickboxing_http_request_duration_seconds", (route, request.method),
+                        time.perf_counter() - started)
+        metrics.inc("kickboxing_http_requests_total", (route, request.method, response.status_code))
+    return response
+
+@app.route("/metrics")
+def prometheus_metrics():
+    """
+    Scoring server metrics in Prometheus text format, for a scraper or curl.
+    """
+    ring_list = list(rings.items())
+    current = {
+        "kickboxing_spectators": {(ring_id,): ring.broadcaster.client_count() for ring_id, ring in ring_list},
+        "kickboxing_score_queue_depth": {(ring_id,): ring.score_queue.depth() for ring_id, ring in ring_list},
+    }
+    return Response(metrics.render(METRIC_FAMILIES, current), mimetype="text/plain; version=0.0.4")
+
+@app.route("/rings")
+def rings_overview():
+    """
+    One line of status per ring, for whoever coordinates the mats.
+    """
+    overview = []
+    for ring_id, ring in list(rings.items()):
+        state = ring.fight.snapshot()
+        overview.append({"ring": ring_id, "started": state["started"], "over": state["over"],
+                         "red_name": state["red_name"], "blue_name": state["blue_name"],
+                         "round_info": state["round_info"], "timer_info": state["timer_info"],
+                         "spectators": ring.broadcaster.client_count()})
+    return jsonify(overview)
+
+def drain_score_queue():
+    """
+    Apply every pending judge score in one go, for every ring, and redraw the
+    judge details of the displayed ring at most once.
+    Runs on the Tk loop every DRAIN_INTERVAL_MS.
+    """
+    drain_rings()
+
+def drain_rings():
+    for ring in list(rings.values()):
+        events = ring.score_queue.drain()
+        if not events:
+            continue
+        for judge_num, color, scoring_action, _queued_at, _done, seq in events:
+            # Checked again: a KO, the end of the round or an earlier tap in this
+            # drain reaching the early stop margin may have ended scoring since.
+            if not ring.fight.can_score() or ring.fight.early_stop_winner():
+                count_rejection("Scoring not allowed at this time.")
+                ring.score_queue.rejected += 1
+                continue
+            if ring.fight.apply_score(judge_num, color, scoring_action, seq) is not None:
+                metrics.inc("kickboxing_score_events_total", (ring.ring_id, judge_num))
+            ring.score_queue.applied += 1
+        if shown_in_admin(ring):
+            update_judge_details()
+            stats = ring.score_queue.stats()
+            view.set(queue_status_label, text=(f"Queue: {stats['applied']}/{stats['enqueued']} applied, "
+                                               f"max depth {stats['max_depth']}, "
+                                               f"last drain {stats['last_drain_latency_ms']:.1f} ms"))
+        else:
+            winning_side = ring.fight.early_stop_winner()
+            if winning_side and not ring.fight.over:
+                ring.fight.end_by_points(winning_side)
+            ring.publish()
+        for event in events:
+            if event[4] is not None:
+                event[4].set()
 
 def update_judge_details():
     """
     Update the detailed judge scores displayed on the admin interface,
     update the main favorable judges counter based on which judge favors which fighter,
-    and in kick light/light contact check for a 15-point advantage on at least two judges.
+    and in kick light/light contact check for a 15-point advantage on a majority of the panel.
     """
     # Update the detailed individual scores for each judge.
-    judge1_red_label.config(text=str(judge_scores[1]["red"]))
-    judge1_blue_label.config(text=str(judge_scores[1]["blue"]))
-    judge2_red_label.config(text=str(judge_scores[2]["red"]))
-    judge2_blue_label.config(text=str(judge_scores[2]["blue"]))
-    judge3_red_label.config(text=str(judge_scores[3]["red"]))
-    judge3_blue_label.config(text=str(judge_scores[3]["blue"]))
-
-    # Calculate favorable judges for each side.
-    favorable_red = 0
-    favorable_blue = 0
-    for judge in judge_scores:
-        red_points = judge_scores[judge]["red"]
-        blue_points = judge_scores[judge]["blue"]
-        if red_points > blue_points:
-            favorable_red += 1
-        elif blue_points > red_points:
-            favorable_blue += 1
+    build_judge_grid(fight.judges)
+    red_totals, blue_totals = fight.matrix.corner_totals()
+    for (red_label, blue_label), red, blue in zip(judge_score_labels, red_totals, blue_totals):
+        view.set(red_label, text=str(red))
+        view.set(blue_label, text=str(blue))
 
     # Update the main favorable counter labels.
-    label_red_judges.config(text=str(favorable_red))
-    label_blue_judges.config(text=str(favorable_blue))
+    favorable_red, favorable_blue = fight.favorable()
+    view.set(label_red_judges, text=str(favorable_red))
+    view.set(label_blue_judges, text=str(favorable_blue))
 
     # Check for the early stoppage condition (kick light and light contact only)
     check_early_stop_by_points()
+    publish_state()
 
 def check_early_stop_by_points():
     """
     In kick light and light contact only:
     If one opponent achieves an advantage of at least 15 points (for that judge)
-    in at least two of the judges, then stop the fight.
+    on a majority of the panel (2 of 3, 3 of 5, 4 of 7 judges), then stop the fight.
     The fighter ahead by points will be declared as winner,
     using the same display style and blinking effect as used for KO or disqualification.
     """
-    # Ensure the rule applies only to Kick Light and Light Contact disciplines.
-    # (Assuming discipline is a StringVar; adjust as needed.)
-    if discipline.get().lower() not in ["kick light", "light contact"]:
-        return
-
-    red_advantage_count = 0
-    blue_advantage_count = 0
-
-    for judge in judge_scores:
-        diff = judge_scores[judge]["red"] - judge_scores[judge]["blue"]
-        if diff >= 15:
-            red_advantage_count += 1
-        elif diff <= -15:
-            blue_advantage_count += 1
-
-    # If at least two judges have a 15+ advantage for one fighter, stop the fight.
-    if red_advantage_count >= 2:
-        end_fight_by_points("red")
-    elif blue_advantage_count >= 2:
-        end_fight_by_points("blue")
+    winning_side = fight.early_stop_winner()
+    # Redraws after the stoppage must not end the fight again.
+    if winning_side and not fight.over:
+        end_fight_by_points(winning_side)
 
 def end_fight_by_points(winning_side):
     """
     Stop the fight and display the winning fighter based on points advantage.
     The display will use the same style (font, size, blinking text) as in a KO/disqualification scenario.
     """
-    global timer_running, fight_over, winner_text_global, winner_color_global
-
-    timer_running = False
-    fight_over = True
-
-    if winning_side == "red":
-        winner_text_global = "WINNER RED"
-        winner_color_global = "red"
-    else:
-        winner_text_global = "WINNER BLUE"
-        winner_color_global = "blue"
-
-    timer_label.config(text=winner_text_global, fg=winner_color_global, font=("Arial", 36, "bold"))
-    blink_winner_text()
+    fight.end_by_points(winning_side)
+    show_winner()
+    start_blinking()
     lock_interface_final()
 
-
-def blink_winner_text():
+def declare_winner_by_judges():
     """
-    Toggle the text color of the timer_label to create a blinking effect.
+    At the end of the last round, award the fight to the corner with more favorable judges.
     """
-    current_fg = timer_label.cget("fg")
-    if current_fg == winner_color_global:
-        timer_label.config(fg="white")
-    else:
-        timer_label.config(fg=winner_color_global)
-    timer_label.after(500, blink_winner_text)
-
-@app.route('/public')
-def public_display():
-    # Retrieve fighter names.
-    red_fighter_name = red_name.get() if hasattr(red_name, 'get') else red_name
-    blue_fighter_name = blue_name.get() if hasattr(blue_name, 'get') else blue_name
-
-    # Retrieve club/country details.
-    red_club = red_country.get() if hasattr(red_country, 'get') else red_country
-    blue_club = blue_country.get() if hasattr(blue_country, 'get') else blue_country
-
-    # Retrieve discipline.
-    discipline_val = discipline.get() if hasattr(discipline, 'get') else discipline
-
-    # Retrieve age category using the variable 'age_categories'
-    age_categories_val = age_categories.get() if hasattr(age_categories, 'get') else age_categories
+    fight.decide_by_judges()
+    show_winner()
+    start_blinking()
+    lock_interface_final()
 
-    # Retrieve weight category using the variable 'weight_categories'
-    weight_categories_val = weight_categories.get() if hasattr(weight_categories, 'get') else weight_categories
+@app.route('/public', defaults={"ring_id": None})
+@app.route('/ring/<ring_id>/public')
+def public_display(ring_id):
+    ring = get_ring(ring_id)
+    if ring is None:
+        return "Unknown ring", 404
+    # Everything comes from the last published state; the page is rendered at
+    # most once per state version and screens that hold it get a 304.
+    version, state, _ = ring.broadcaster.current()
+    cached_version, html = ring.public_page
+    if cached_version != version:
+        html = render_public_page(ring.ring_id, state)
+        ring.public_page = (version, html)
+    return conditional_response(html, "text/html", ring.broadcaster.etag(version), "no-cache")
+
+def render_public_page(ring_id, state):
+    return render_template("public_display.html",
+                           ring_id=ring_id,
+                           red_name=state["red_name"],
+                           blue_name=state["blue_name"],
+                           red_club=state["red_club"],
+                           blue_club=state["blue_club"],
+                           red_favorable=state["red_favorable"],
+                           blue_favorable=state["blue_favorable"],
+                           judge_scores=state["scores"],
+                           red_warnings=state["red_warnings"],
+                           blue_warnings=state["blue_warnings"],
+                           discipline=state["discipline"],
+                           age_category=state["age_category"],
+                           weight_category=state["weight_category"],
+                           round_info=state["round_info"],
+                           timer_info=state["timer_info"])
+
+@app.route('/public/state.json', defaults={"ring_id": None})
+@app.route('/ring/<ring_id>/public/state.json')
+def public_state(ring_id):
+    """
+    Compact scoreboard state for polling screens, with its version as the ETag:
+    an unchanged state costs a 304 and no serialisation.
+    """
+    ring = get_ring(ring_id)
+    if ring is None:
+        return "Unknown ring", 404
+    version, _, body = ring.broadcaster.current()
+    return conditional_response(body, "application/json", ring.broadcaster.etag(version), "no-cache")
+
+@app.route('/public/stream', defaults={"ring_id": None})
+@app.route('/ring/<ring_id>/public/stream')
+def public_stream(ring_id):
+    """
+    Server-Sent Events feed for scoreboards: one full state on connect,
+    then a small JSON delta each time scores, clock, warnings or result change.
+    Both carry the state "version".
+    """
+    ring = get_ring(ring_id)
+    if ring is None:
+        return "Unknown ring", 404
+    # Under waitress every stream holds a pool thread; past the limit, screens poll instead.
+    if stream_slots is not None and not stream_slots.acquire(blocking=False):
+        return refuse_stream()
+    subscription = ring.broadcaster.subscribe()
+
+    def events():
+        yield "retry: 1000\n"
+        yield f"data: {ring.broadcaster.current()[2]}\n\n"
+        while True:
+            try:
+                message = subscription.get(timeout=SSE_KEEPALIVE_SEC)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {message}\n\n"
+
+    def closed():
+        # Runs when the server closes the response, even if the stream never started.
+        ring.broadcaster.unsubscribe(subscription)
+        if stream_slots is not None:
+            stream_slots.release()
+
+    response = Response(stream_with_context(events()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    response.call_on_close(closed)
+    return response
 
-    # Retrieve round and timer information from their labels.
-    round_info = round_label.cget("text")
-    timer_info = timer_label.cget("text")
+# ====================================================
+# HEADLESS CONTROL (POST /control/..., --headless only)
+# ====================================================
+# Without the admin window a fight is driven over HTTP with the admin token
+# printed at launch (or set with KICKBOXING_ADMIN_TOKEN), sent as X-Admin-Token.
+ADMIN_TOKEN_ENV = "KICKBOXING_ADMIN_TOKEN"
+CONTROL_TIMEOUT_SEC = 2.0
+CONTROL_SETTINGS = {          # Same choices as the admin window's Fight Settings menus
+    "total_rounds": (3, 5, 7),
+    "round_duration": (60, 90, 120, 180),
+    "break_duration": (45, 60),
+    "judges": (3, 5, 7),
+}
+admin_token = None            # Set by run_headless(); the control routes answer 404 while it is None
+control_queue = collections.deque()   # (command, done event, result list), run by run_engine()
 
-    # Build the context dictionary for your template.
-    return render_template("public_display.html",
-                           red_name=red_fighter_name,
-                           blue_name=blue_fighter_name,
-                           red_club=red_club,
-                           blue_club=blue_club,
-                           red_favorable=label_red_judges.cget("text"),
-                           blue_favorable=label_blue_judges.cget("text"),
-                           judge_scores=judge_scores,
-                           red_warnings=red_warning_count,
-                           blue_warnings=blue_warning_count,
-                           discipline=discipline_val,
-                           age_category=age_categories_val,  # using the plural variable
-                           weight_category=weight_categories_val,  # using the plural variable
-                           round_info=round_info,
-                           timer_info=timer_info)
+def run_on_engine(command):
+    """
+    Run command() on the engine thread, the only one that changes fight state,
+    and return its (body, status); 503 if the engine does not get to it in time.
+    """
+    done = threading.Event()
+    result = []
+    control_queue.append((command, done, result))
+    if not done.wait(CONTROL_TIMEOUT_SEC):
+        return {"ok": False, "error": "Engine busy, try again", "status": 503}, 503
+    return result[0]
+
+def drain_control():
+    while control_queue:
+        command, done, result = control_queue.popleft()
+        result.append(command())
+        done.set()
+
+def control_error(message, status):
+    return jsonify({"ok": False, "error": message, "status": status}), status
+
+def control_fields():
+    body = request.get_json(silent=True)
+    return body if isinstance(body, dict) else request.form.to_dict()
+
+def control_result(ring):
+    ring.publish()
+    return {"ok": True, "ring": ring.ring_id, "state": ring.fight.snapshot(),
+            "judges": {judge_num: f"/ring/{ring.ring_id}/final_judge/{token}"
+                       for judge_num, token in sorted(ring.judge_tokens.items())}}, 200
+
+@app.before_request
+def check_admin_token():
+    if request.endpoint not in ("control_new_fight", "control_info", "control_clock"):
+        return None
+    if admin_token is None:
+        return "Not found", 404
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), admin_token):
+        return control_error("Unauthorized access: invalid admin token", 403)
+    return None
+
+@app.route("/control/new_fight", methods=["POST"], defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/control/new_fight", methods=["POST"])
+def control_new_fight(ring_id):
+    """
+    Start a new fight: {"total_rounds", "round_duration", "break_duration", "judges"},
+    each optional (default: the ring's current settings). A ring that does not
+    exist yet is created. Replacing a fight in progress needs "force": true.
+    """
+    fields = control_fields()
+    settings = {}
+    for name, choices in CONTROL_SETTINGS.items():
+        value = fields.get(name)
+        if value is None:
+            continue
+        if str(value) not in [str(choice) for choice in choices]:
+            return control_error(f"{name} must be one of {', '.join(map(str, choices))}", 400)
+        settings[name] = int(value)
+    ring_id = DEFAULT_RING if ring_id is None else ring_id
+    if not RING_ID_PATTERN.match(ring_id):
+        return control_error("Invalid ring id", 400)
+    force = fields.get("force") in (True, "1", "true")
+
+    def command():
+        ring = rings.get(ring_id)
+        if ring is None:
+            ring = add_ring(ring_id)
+            ring.resume()
+        fight = ring.fight
+        if fight.started and not fight.over and not force:
+            return {"ok": False, "error": "A fight is in progress; send \"force\": true to replace it",
+                    "status": 409}, 409
+        ring.new_fight(settings.get("total_rounds", fight.total_rounds),
+                       settings.get("round_duration", fight.round_duration),
+                       settings.get("break_duration", fight.break_duration),
+                       settings.get("judges", fight.judges))
+        ring.settings_validated = True
+        return control_result(ring)
+    body, status = run_on_engine(command)
+    return jsonify(body), status
+
+@app.route("/control/info", methods=["POST"], defaults={"ring_id": None})
+@app.route("/ring/<ring_id>/control/info", methods=["POST"])
+def control_info(ring_id):
+    """
+    Set fighter and category details before the fight starts: any of red_name,
+    red_club, blue_name, blue_club, discipline, age_category, weight_category.
+    """
+    ring = get_ring(ring_id)
+    if ring is None:
+        return control_error("Unknown ring", 404)
+    fields = control_fields()
+    unknown = sorted(set(fields) - set(ring.fight.info))
+    if unknown:
+        return control_error(f"Unknown field(s): {', '.join(unknown)}", 400)
+    discipline = fields.get("discipline")
+    if discipline is not None and discipline not in ring_age_dict and discipline not in tatami_age_dict:
+        return control_error(f"Unknown discipline: {discipline}", 400)
+
+    def command():
+        if ring.fight.started:
+            return {"ok": False, "error": "Fighter data is locked once the fight has started",
+                    "status": 409}, 409
+        ring.fight.set_info(**{key: str(value) for key, value in fields.items()})
+        info = ring.fight.info
+        ring.fighters_validated = all(info[key] for key in ("red_name", "red_club", "blue_name", "blue_club"))
+        return control_result(ring)
+    body, status = run_on_engine(command)
+    return jsonify(body), status
+
+@app.route("/control/start", methods=["POST"], defaults={"ring_id": None, "action": "start"})
+@app.route("/control/stop", methods=["POST"], defaults={"ring_id": None, "action": "stop"})
+@app.route("/ring/<ring_id>/control/start", methods=["POST"], defaults={"action": "start"})
+@app.route("/ring/<ring_id>/control/stop", methods=["POST"], defaults={"action": "stop"})
+def control_clock(ring_id, action):
+    """
+    Start (or resume) and stop the fight clock. As in the admin window, the
+    fight starts only once the fighter data is complete.
+    """
+    ring = get_ring(ring_id)
+    if ring is None:
+        return control_error("Unknown ring", 404)
+
+    def command():
+        if ring.fight.over:
+            return {"ok": False, "error": "The fight is over", "status": 409}, 409
+        if action == "start":
+            if not ring.fighters_validated:
+                return {"ok": False, "error": "Fighter names and clubs must be set first", "status": 409}, 409
+            ring.fight.start()
+        elif ring.fight.timer_running:
+            ring.fight.stop()
+        return control_result(ring)
+    body, status = run_on_engine(command)
+    return jsonify(body), status
 
 # ====================================================
 # RUN FLASK IN A SEPARATE THREAD & START TKINTER MAIN LOOP
 # ====================================================
-def run_flask():
-    app.run(host="0.0.0.0", port=5000, debug=False, use_reloader=False)
+web_server = None
+stream_slots = None   # Semaphore bounding open scoreboard streams under waitress; None = unbounded
+
+def open_stream_slots():
+    """
+    Under waitress, bound the scoreboard streams this process serves (or, in
+    the coordinator, relays) so STREAM_THREAD_RESERVE pool threads stay free.
+    """
+    global stream_slots
+    if ARGS.server == "waitress":
+        limit = max(0, ARGS.threads - STREAM_THREAD_RESERVE)
+        if ARGS.max_streams is not None:
+            limit = min(limit, ARGS.max_streams)
+        stream_slots = threading.BoundedSemaphore(limit)
+
+def refuse_stream():
+    metrics.inc("kickboxing_streams_refused_total", ())
+    return Response("Too many live scoreboards; poll public/state.json instead.", status=503,
+                    mimetype="text/plain", headers={"Retry-After": "30"})
+
+def start_web_server():
+    """
+    Serve the judge and public endpoints from a daemon thread.
+    """
+    global web_server
+    open_stream_slots()
+    web_server = WebServer(app, ARGS.host, ARGS.port)
+    flask_thread = threading.Thread(target=web_server.serve_forever)
+    flask_thread.daemon = True
+    flask_thread.start()
+
+def on_close():
+    """
+    Closing the admin window: stop the web server, make sure every journal is
+    on disk, then end the Tk main loop.
+    """
+    loop_monitor.stop_watchdog()
+    profiler.end()
+    web_server.shutdown()
+    for ring in list(rings.values()):
+        ring.journal.flush(timeout=2)
+    results_store.flush(timeout=2)
+    root.destroy()
+
+def open_rings(total_rounds, round_duration, break_duration, judges):
+    """
+    On launch, replay every ring's journal: resume fights that were interrupted
+    mid-way, start a new fight (no confirmation) everywhere else.
+    A ring that only comes back from its journal is kept only if it has a
+    fight to resume. Journals with nothing left to resume are archived, so
+    rings from earlier events do not return and their history is read once.
+    """
+    restored = []
+    # A worker only ever runs its own ring.
+    if not ARGS.worker:
+        restored = [add_ring(ring_id) for ring_id in journalled_ring_ids() if ring_id not in rings]
+    for ring in list(rings.values()):
+        if ring.resume():
+            continue
+        if ring in restored:
+            ring.archive_journal(reopen=False)
+            ring.set_judge_tokens({})
+            del rings[ring.ring_id]
+            continue
+        ring.archive_journal()
+        ring.new_fight(total_rounds, round_duration, break_duration, judges)
+
+def resume_or_new_fight():
+    open_rings(total_rounds.get(), round_duration.get(), break_duration.get(), judge_count.get())
+    refresh_ring_menu()
+    show_ring()
+    profiler.begin(current_ring.ring_id)
+
+def refresh_ring_menu():
+    """
+    Rebuild the ring selector from the registered rings.
+    """
+    menu = ring_menu["menu"]
+    menu.delete(0, "end")
+    for ring_id in sorted(rings, key=lambda r: (not r.isdigit(), int(r) if r.isdigit() else 0, r)):
+        menu.add_command(label=f"Ring {ring_id}", command=lambda v=ring_id: select_ring(v))
+    ring_choice.set(current_ring.ring_id)
+
+def select_ring(ring_id):
+    """
+    Switch the admin window to another ring. Its fight keeps running in the background.
+    """
+    use_ring(rings[ring_id])
+    ring_choice.set(ring_id)
+    show_ring()
 
-flask_thread = threading.Thread(target=run_flask)
-flask_thread.daemon = True
-flask_thread.start()
+def add_ring_clicked():
+    """
+    Register the next numbered ring, with a fresh fight, and switch to it.
+    """
+    numbers = [int(ring_id) for ring_id in rings if ring_id.isdigit()]
+    ring = add_ring(str(max(numbers, default=0) + 1))
+    if not ring.resume():
+        ring.new_fight(total_rounds.get(), round_duration.get(), break_duration.get(), judge_count.get())
+    refresh_ring_menu()
+    select_ring(ring.ring_id)
+
+def show_ring():
+    """
+    Redraw the whole admin window from the current ring's state.
+    """
+    global loading_ring_view
+    stop_blinking()
+    confirm_bar.dismiss()   # A pending question was about the ring we are leaving
+    root.title(f"Kickboxing Scoring System - Admin - Ring {current_ring.ring_id}")
+
+    # Fighter data, locked once validated.
+    info = dict(fight.info)
+    entry_state = "disabled" if current_ring.fighters_validated else "normal"
+    for entry, key in ((red_name, "red_name"), (red_country, "red_club"),
+                       (blue_name, "blue_name"), (blue_country, "blue_club")):
+        entry.config(state="normal")
+        entry.delete(0, tk.END)
+        entry.insert(0, info[key])
+        entry.config(state=entry_state)
+    red_gender_optionmenu.config(state=entry_state)
+    blue_gender_optionmenu.config(state=entry_state)
+    # Each of these traces refreshes the next menu, so set them in order; the
+    # ring already holds the right values, so don't copy the in-between ones back.
+    loading_ring_view = True
+    try:
+        discipline.set(info["discipline"] or discipline.get())
+        age_categories.set(info["age_category"] or age_categories.get())
+        weight_categories.set(info["weight_category"] or weight_categories.get())
+    finally:
+        loading_ring_view = False
+    sync_fight_info()
+
+    # Fight settings, locked once validated.
+    total_rounds.set(fight.total_rounds)
+    round_duration.set(fight.round_duration)
+    break_duration.set(fight.break_duration)
+    judge_count.set(fight.judges)
+    settings_state = "disabled" if current_ring.settings_validated else "normal"
+    om_total_rounds.config(state=settings_state)
+    om_round_duration.config(state=settings_state)
+    om_break_duration.config(state=settings_state)
+    om_judge_count.config(state=settings_state)
+
+    # Clock, scores and controls.
+    round_label.config(text=fight.round_text())
+    update_judge_details()
+    update_warning_labels()
+    stats = current_ring.score_queue.stats()
+    view.set(queue_status_label, text=f"Queue: {stats['applied']}/{stats['enqueued']} applied")
+    if fight.over:
+        show_winner()
+        lock_interface_final()
+        return
+    timer_label.config(text=fight.clock_text(), fg="red" if fight.mode == "break" else "black",
+                       font=("Arial", 20))
+    btn_fight.config(state="disabled")
+    for button in (btn_stop, btn_ko_red, btn_ko_blue, btn_warning_red, btn_warning_blue):
+        button.config(state="normal")
+    enable_start_if_valid()
 
-# Automatically start a new fight when the program launches (no confirmation)
-root.after(0, lambda: new_fight(confirm=False))
-root.mainloop()
+def build_tools_menu():
+    """
+    Menu bar with the diagnostics: per-fight profiling and the loop lag report.
+    """
+    global profiling
+    profiling = tk.BooleanVar(root, value=profiler.enabled)
+    menubar = tk.Menu(root)
+    tools = tk.Menu(menubar, tearoff=0)
+    tools.add_checkbutton(label="Profile fights (cProfile)", variable=profiling,
+                          command=lambda: profiler.set_enabled(profiling.get()))
+    tools.add_command(label="Save loop lag report", command=save_loop_report)
+    menubar.add_cascade(label="Tools", menu=tools)
+    root.config(menu=menubar)
+
+def build_admin_window():
+    """
+    Create the Tk admin window and its setting variables, then lay out every section.
+    """
+    global root, confirm_bar, round_duration, break_duration, total_rounds, judge_count
+    root = tk.Tk()
+    root.title("Kickboxing Scoring System - Admin")
+    root.geometry("1200x900")
+    root.option_add("*Font", ("Arial", 12))
+    confirm_bar = ConfirmBar(root)
+
+    # Fight settings controls (the running clock itself lives in `fight`)
+    round_duration = tk.IntVar(root, value=180)  # Default: 180 sec (3 minutes)
+    break_duration = tk.IntVar(root, value=45)     # Default: 45 sec
+    total_rounds = tk.IntVar(root, value=3)
+    judge_count = tk.IntVar(root, value=ARGS.judges)
+
+    build_top_section()
+    build_fighter_section()
+    build_options_section()
+
+    # Set up traces to automatically update options when discipline or age category changes
+    discipline.trace_add("write", lambda *args: update_options())
+    age_categories.trace_add("write", lambda *args: update_weights())
+    weight_categories.trace_add("write", lambda *args: sync_fight_info())
+
+    # Initialize options with default values so that they no longer show "N/A"
+    update_options()
+
+    build_settings_section()
+    build_timer_section()
+    build_timer_buttons()
+    build_judge_section()
+    build_judge_grid(judge_count.get())
+    build_tools_menu()
+    root.protocol("WM_DELETE_WINDOW", on_close)
+
+def run_engine(stop):
+    """
+    Drain the score queues every frame and keep the clocks current, without Tk,
+    until the `stop` event is set.
+    """
+    next_clock_refresh = 0.0
+    due = None
+    while not stop.is_set():
+        if due is not None:
+            observe_loop_lag("engine", time.monotonic() - due)
+        drain_control()
+        drain_rings()
+        now = time.monotonic()
+        if now >= next_clock_refresh:
+            next_clock_refresh = now + refresh_clocks()
+        due = time.monotonic() + DRAIN_INTERVAL_MS / 1000
+        stop.wait(DRAIN_INTERVAL_MS / 1000)
+
+def run_headless():
+    """
+    --headless: the scoring engine and web endpoints without any Tk object.
+    run_engine() takes the place of the Tk loop; fights are resumed from their
+    journals or started with default settings. Fights are then driven with
+    POST requests carrying the admin token printed here in an X-Admin-Token header:
+      [/ring/<id>]/control/new_fight   settings, returns the judge URLs
+      [/ring/<id>]/control/info        fighter names, clubs and category
+      [/ring/<id>]/control/start|stop  the clock
+    The fight ends by itself after the last round, or early in kick light /
+    light contact; scores come from the judge tablets as usual.
+    """
+    global admin_token
+    admin_token = os.environ.get(ADMIN_TOKEN_ENV) or str(uuid.uuid4())
+    open_rings(3, 180, 45, ARGS.judges)
+    print(f"Admin token (X-Admin-Token header for /control/...): {admin_token}")
+    for ring in list(rings.values()):
+        for judge_num, token in sorted(ring.judge_tokens.items()):
+            print(f"Ring {ring.ring_id} judge {judge_num}: /ring/{ring.ring_id}/final_judge/{token}")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        run_engine(threading.Event())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        web_server.shutdown()
+        for ring in list(rings.values()):
+            ring.journal.flush(timeout=2)
+        results_store.flush(timeout=2)
+
+def main(argv=None):
+    """
+    Command-line entry point. Importing this module only defines things; the
+    window, the web server, the rings and their journals are all created here.
+    """
+    global ARGS, DEFAULT_RING, results_store
+    ARGS = parser.parse_args(argv)
+    DEFAULT_RING = ARGS.ring
+    if ARGS.weigh_in:
+        run_weigh_in(ARGS.weigh_in)
+        return
+    if ARGS.ring_workers and not ARGS.worker:
+        run_coordinator(ARGS.ring_workers)
+        return
+    results_store = ResultsStore(ARGS.results_db or os.path.join(JOURNAL_DIR, "results.sqlite3"))
+    use_ring(add_ring(DEFAULT_RING))
+    start_web_server()
+    if ARGS.headless:
+        run_headless()
+        return
+    build_admin_window()
+    publish_state()
+    # Automatically resume an interrupted fight or start a new one when the program launches
+    scheduler.every("score_drain", DRAIN_INTERVAL_MS, drain_score_queue)
+    scheduler.every("clock", 1000, update_timer)
+    scheduler.every("widget_view", view.frame_ms, view.flush)
+    scheduler.once("open_rings", 0, resume_or_new_fight)
+    scheduler.start()
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
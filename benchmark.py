@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Kickboxing Scoring System – Load Benchmark
+
+Runs the admin scoring engine headless in this process, then simulates
+M rings x N judges tapping /judge_score at a realistic rate while K spectators
+per ring poll or stream their scoreboard. Reports throughput and p50/p95/p99
+latency, and can save a run as a baseline or compare against one.
+
+    python benchmark.py --rings 4 --judges 5 --spectators 20 --duration 30
+    python benchmark.py --save-baseline bench_baseline.json
+    python benchmark.py --baseline bench_baseline.json
+"""
+
+# ====================================================
+# IMPORTS
+# ====================================================
+import sys
+import math
+import json
+import time
+import random
+import logging
+import shutil
+import argparse
+import tempfile
+import threading
+import http.client
+
+import admin
+
+# ====================================================
+# COMMAND LINE
+# ====================================================
+parser = argparse.ArgumentParser(description="Kickboxing Scoring System - Load Benchmark")
+parser.add_argument("--rings", type=int, default=2, metavar="M", help="Rings fighting at the same time")
+parser.add_argument("--judges", type=int, default=3, choices=[3, 5, 7], help="Judges per ring")
+parser.add_argument("--spectators", type=int, default=10, metavar="K", help="Scoreboard clients per ring")
+parser.add_argument("--spectator-mode", choices=["poll", "stream"], default="poll",
+                    help="Spectators poll /public/state.json or hold a /public/stream open")
+parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between spectator polls")
+parser.add_argument("--tap-rate", type=float, default=1.5,
+                    help="Mean taps per second per judge (taps arrive at random, Poisson-style)")
+parser.add_argument("--batch", action="store_true",
+                    help="Judges post to /judge_scores and wait for the ack, i.e. time until the tap is applied")
+parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+parser.add_argument("--server", choices=["dev", "waitress"], default="dev", help="HTTP server to benchmark")
+parser.add_argument("--threads", type=int, default=32, help="waitress: worker threads, as for admin.py")
+parser.add_argument("--seed", type=int, default=None, help="Random seed, for repeatable tap patterns")
+parser.add_argument("--save-baseline", metavar="JSON", help="Save this run's results as a baseline")
+parser.add_argument("--baseline", metavar="JSON", help="Compare this run against a saved baseline")
+parser.add_argument("--tolerance", type=float, default=0.10,
+                    help="Allowed relative slowdown before a metric counts as a regression")
+
+TAP_ACTIONS = ["POINT RED", "POINT BLUE", "HIGH KICK RED", "HIGH KICK BLUE"]
+CONNECT_TIMEOUT_SEC = 10
+
+# ====================================================
+# MEASUREMENTS
+# ====================================================
+class Recorder:
+    """
+    Latencies and outcome counts for one kind of client, shared by its threads.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.latencies = []   # Seconds, one per completed request
+        self.errors = 0
+        self.statuses = {}    # HTTP status -> count
+        self.events = 0       # Scoreboard updates received (streams only)
+        self.rejected = 0     # Taps the server refused to score (judges only)
+
+    def record(self, latency, status):
+        with self.lock:
+            self.latencies.append(latency)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+    def event(self):
+        with self.lock:
+            self.events += 1
+
+    def reject(self, count=1):
+        with self.lock:
+            self.rejected += count
+
+    def summary(self, elapsed):
+        with self.lock:
+            latencies = sorted(self.latencies)
+            result = {"requests": len(latencies), "errors": self.errors,
+                      "throughput": round(len(latencies) / elapsed, 1),
+                      "statuses": {str(status): count for status, count in sorted(self.statuses.items())}}
+            if self.rejected:
+                result["rejected"] = self.rejected
+            if self.events:
+                result["events"] = self.events
+                result["events_per_sec"] = round(self.events / elapsed, 1)
+        if latencies:
+            for name, q in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                result[name] = round(percentile(latencies, q) * 1000, 2)
+            result["max_ms"] = round(latencies[-1] * 1000, 2)
+        return result
+
+def percentile(ordered, q):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+# ====================================================
+# SIMULATED CLIENTS
+# ====================================================
+def judge_client(port, ring_id, token, args, stop, recorder):
+    """
+    One judge tapping at random intervals. Latency is measured from when the tap
+    was due, not when it was sent, so a stalled server is not hidden by the
+    client backing off (coordinated omission).
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=CONNECT_TIMEOUT_SEC)
+    seq = 0
+    due = time.monotonic() + random.expovariate(args.tap_rate)
+    while not stop.is_set():
+        wait = due - time.monotonic()
+        if wait > 0 and stop.wait(wait):
+            break
+        action = random.choice(TAP_ACTIONS)
+        try:
+            if args.batch:
+                seq += 1
+                body = json.dumps({"actions": [{"seq": seq, "color": action.rsplit(" ", 1)[1].lower(),
+                                                "action": action}]})
+                conn.request("POST", f"/ring/{ring_id}/judge_scores/{token}", body=body,
+                             headers={"Content-Type": "application/json"})
+            else:
+                color = action.rsplit(" ", 1)[1].lower()
+                path = f"/ring/{ring_id}/judge_score/{token}/{color}/{action.replace(' ', '%20')}"
+                conn.request("GET", path)
+            response = conn.getresponse()
+            body = response.read()
+            recorder.record(time.monotonic() - due, response.status)
+            # A refused tap is answered quickly without being scored, which would flatter the latencies.
+            if response.status != 200:
+                recorder.reject()
+            elif args.batch:
+                recorder.reject(len(json.loads(body).get("rejected", [])))
+        except (OSError, http.client.HTTPException):
+            recorder.error()
+            conn.close()
+        due += random.expovariate(args.tap_rate)
+    conn.close()
+
+def polling_spectator(port, ring_id, args, stop, recorder):
+    """
+    One scoreboard polling the state with If-None-Match, as the public page does.
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=CONNECT_TIMEOUT_SEC)
+    etag = None
+    # Spread the first polls so the spectators do not all arrive in lockstep.
+    if stop.wait(random.uniform(0, args.poll_interval)):
+        return
+    while not stop.is_set():
+        sent = time.monotonic()
+        try:
+            conn.request("GET", f"/ring/{ring_id}/public/state.json",
+                         headers={"If-None-Match": etag} if etag else {})
+            response = conn.getresponse()
+            response.read()
+            etag = response.getheader("ETag", etag)
+            recorder.record(time.monotonic() - sent, response.status)
+        except (OSError, http.client.HTTPException):
+            recorder.error()
+            conn.close()
+        stop.wait(args.poll_interval)
+    conn.close()
+
+def streaming_spectator(port, ring_id, args, stop, recorder):
+    """
+    One scoreboard holding the event stream open. The recorded latency is the
+    time to the first update; every update after that is counted. A screen
+    turned away with 503 (every stream slot taken) polls instead, as it should.
+    """
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=CONNECT_TIMEOUT_SEC)
+    sent = time.monotonic()
+    try:
+        conn.request("GET", f"/ring/{ring_id}/public/stream")
+        response = conn.getresponse()
+        if response.status == 503:
+            response.read()
+            conn.close()
+            recorder.record(time.monotonic() - sent, response.status)
+            polling_spectator(port, ring_id, args, stop, recorder)
+            return
+        first = True
+        while not stop.is_set():
+            line = response.fp.readline()
+            if not line:
+                break
+            if line.startswith(b"data:"):
+                if first:
+                    recorder.record(time.monotonic() - sent, response.status)
+                    first = False
+                recorder.event()
+    except (OSError, http.client.HTTPException):
+        if not stop.is_set():
+            recorder.error()
+    finally:
+        conn.close()
+
+# ====================================================
+# RUN
+# ====================================================
+def start_rings(args):
+    """
+    Start the engine and web server in this process with M rings, each with a
+    fight running for longer than the benchmark. Journals go to a scratch directory.
+    """
+    admin.ARGS = admin.parser.parse_args(["--host", "127.0.0.1", "--port", "0", "--server", args.server,
+                                          "--threads", str(args.threads),
+                                          "--judges", str(args.judges), "--headless"])
+    admin.JOURNAL_DIR = tempfile.mkdtemp(prefix="kickboxing-bench-")
+    for number in range(1, args.rings + 1):
+        ring = admin.add_ring(f"bench{number}")
+        ring.resume()
+        ring.new_fight(1, int(args.duration) + 60, 0, args.judges)
+        # Point fighting has the tatami actions but no early stop: the fight runs for the whole benchmark.
+        ring.fight.set_info(discipline="Point Fighting", red_name=f"Red {number}", blue_name=f"Blue {number}")
+        ring.fight.start()
+        ring.publish()
+    admin.use_ring(admin.rings["bench1"])
+    admin.start_web_server()
+
+def run(args):
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)   # No access log line per request
+    if args.seed is not None:
+        random.seed(args.seed)
+    start_rings(args)
+    port = admin.web_server.port
+    stop = threading.Event()          # Stops the clients
+    engine_stop = threading.Event()   # Stops the engine, once the clients are done
+    engine = threading.Thread(target=admin.run_engine, args=(engine_stop,), daemon=True)
+    engine.start()
+
+    judges = Recorder("judge taps")
+    spectators = Recorder(f"spectators ({args.spectator_mode})")
+    spectator_client = polling_spectator if args.spectator_mode == "poll" else streaming_spectator
+    clients = []
+    for ring_id, ring in admin.rings.items():
+        for token in ring.judge_tokens.values():
+            clients.append(threading.Thread(target=judge_client, args=(port, ring_id, token, args, stop, judges)))
+        for _ in range(args.spectators):
+            clients.append(threading.Thread(target=spectator_client, args=(port, ring_id, args, stop, spectators)))
+    for client in clients:
+        client.daemon = True
+        client.start()
+
+    started = time.monotonic()
+    time.sleep(args.duration)
+    stop.set()
+    elapsed = time.monotonic() - started
+    for client in clients:
+        client.join(timeout=CONNECT_TIMEOUT_SEC)
+    time.sleep(admin.DRAIN_INTERVAL_MS / 1000 * 2)   # Let the last taps drain
+    engine_stop.set()
+    engine.join()
+
+    queue_stats = {ring_id: ring.score_queue.stats() for ring_id, ring in admin.rings.items()}
+    admin.web_server.shutdown()
+    for ring in admin.rings.values():
+        ring.journal.flush(timeout=2)
+    shutil.rmtree(admin.JOURNAL_DIR, ignore_errors=True)
+
+    return {
+        "config": {"rings": args.rings, "judges": args.judges, "spectators": args.spectators,
+                   "spectator_mode": args.spectator_mode, "tap_rate": args.tap_rate,
+                   "batch": args.batch, "server": args.server, "duration": args.duration},
+        "results": {judges.name: judges.summary(elapsed), spectators.name: spectators.summary(elapsed)},
+        "score_queue": {
+            "applied": sum(stats["applied"] for stats in queue_stats.values()),
+            "max_depth": max((stats["max_depth"] for stats in queue_stats.values()), default=0),
+            "max_drain_latency_ms": max((stats["max_drain_latency_ms"] for stats in queue_stats.values()),
+                                        default=0),
+        },
+    }
+
+# ====================================================
+# REPORT & BASELINE
+# ====================================================
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "errors")   # max_ms is one sample: too noisy to gate on
+HIGHER_IS_BETTER = ("throughput", "events_per_sec")
+
+def print_report(report):
+    config = report["config"]
+    print(f"{config['rings']} rings x {config['judges']} judges at {config['tap_rate']} taps/s, "
+          f"{config['spectators']} {config['spectator_mode']} spectators per ring, "
+          f"{config['server']} server, {config['duration']:g} s")
+    for name, result in report["results"].items():
+        line = f"  {name:<22} {result['requests']:>7} req {result['throughput']:>8} req/s"
+        if "p50_ms" in result:
+            line += (f"  p50 {result['p50_ms']:>7} ms  p95 {result['p95_ms']:>7} ms"
+                     f"  p99 {result['p99_ms']:>7} ms  max {result['max_ms']:>7} ms")
+        if "events" in result:
+            line += f"  {result['events']} updates ({result['events_per_sec']}/s)"
+        if result["errors"]:
+            line += f"  {result['errors']} errors"
+        print(line)
+        print(f"  {'':<22} statuses {result['statuses']}")
+        if result.get("rejected"):
+            print(f"  Warning: {result['rejected']} of {result['requests']} taps were rejected "
+                  f"(fight over or clock stopped?); their latencies do not measure scoring.")
+    queue = report["score_queue"]
+    print(f"  score queue: {queue['applied']} applied, max depth {queue['max_depth']}, "
+          f"max drain {queue['max_drain_latency_ms']} ms")
+
+def compare(report, baseline, tolerance):
+    """
+    Print every metric next to its baseline; returns the number of regressions.
+    """
+    if baseline.get("config") != report["config"]:
+        print("Note: the baseline was run with different settings:", baseline.get("config"))
+    regressions = 0
+    for name, result in report["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric not in result or metric not in old:
+                continue
+            before, after = old[metric], result[metric]
+            change = (after - before) / before if before else (1.0 if after > before else 0.0)
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            # Sub-millisecond jitter is not a regression.
+            if metric.endswith("_ms") and abs(after - before) < 1:
+                worse = False
+            regressions += worse
+            print(f"  {name:<22} {metric:<15} {before:>10} -> {after:>10}  {change:+7.1%}"
+                  + ("  REGRESSION" if worse else ""))
+    return regressions
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    report = run(args)
+    print_report(report)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.baseline}:")
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import pytest
+
+# admin.py is a script, not a package: make it importable from the repository root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import admin
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Replace time.monotonic() with a clock that only moves when told to.
+    """
+    fake = FakeClock()
+    monkeypatch.setattr(admin.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    """
+    Journals (and anything else kept next to them) go to a scratch directory.
+    """
+    monkeypatch.setattr(admin, "JOURNAL_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def make_ring(journal_dir):
+    """
+    Create unregistered rings journalling to the scratch directory; their
+    judge tokens are dropped from the global index afterwards.
+    """
+    made = []
+
+    def make(ring_id):
+        ring = admin.Ring(ring_id)
+        made.append(ring)
+        return ring
+    yield make
+    for ring in made:
+        ring.set_judge_tokens({})
+
+
+@pytest.fixture
+def live_ring(journal_dir):
+    """
+    A registered ring with a three-judge point fighting bout running.
+    """
+    ring = admin.add_ring("test")
+    ring.resume()
+    ring.new_fight(3, 180, 45, 3)
+    ring.fight.set_info(discipline="Point Fighting")
+    ring.fight.start()
+    yield ring
+    ring.set_judge_tokens({})
+    admin.rings.pop("test", None)
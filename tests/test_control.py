@@ -0,0 +1,74 @@
+"""
+Headless control endpoints: driving a fight without the admin window.
+"""
+import threading
+
+import pytest
+
+import admin
+
+TOKEN = {"X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def client(live_ring, monkeypatch):
+    """
+    A test client for a --headless server with the engine loop running.
+    """
+    monkeypatch.setattr(admin, "admin_token", "secret")
+    live_ring.new_fight(3, 180, 45, 3)
+    stop = threading.Event()
+    engine = threading.Thread(target=admin.run_engine, args=(stop,), daemon=True)
+    engine.start()
+    yield admin.app.test_client()
+    stop.set()
+    engine.join()
+    extra = admin.rings.pop("extra", None)
+    if extra is not None:
+        extra.set_judge_tokens({})
+
+
+def test_control_needs_the_admin_token(client, monkeypatch):
+    assert client.post("/ring/test/control/start").status_code == 403
+    assert client.post("/ring/test/control/start", headers={"X-Admin-Token": "nope"}).status_code == 403
+    monkeypatch.setattr(admin, "admin_token", None)   # Not --headless
+    assert client.post("/ring/test/control/start", headers=TOKEN).status_code == 404
+
+
+def test_drive_a_fight(client, live_ring):
+    response = client.post("/ring/test/control/new_fight", headers=TOKEN,
+                           json={"total_rounds": 5, "round_duration": 90, "judges": 5})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert sorted(body["judges"]) == ["1", "2", "3", "4", "5"]
+    assert body["judges"]["1"] == f"/ring/test/final_judge/{live_ring.judge_tokens[1]}"
+    assert live_ring.fight.total_rounds == 5 and live_ring.fight.round_duration == 90
+
+    assert client.post("/ring/test/control/start", headers=TOKEN).status_code == 409   # No fighters yet
+    info = {"red_name": "Ana", "red_club": "A", "blue_name": "Bea", "blue_club": "B",
+            "discipline": "Point Fighting"}
+    assert client.post("/ring/test/control/info", headers=TOKEN, json=info).status_code == 200
+    assert client.post("/ring/test/control/start", headers=TOKEN).get_json()["state"]["started"]
+    assert live_ring.fight.timer_running
+    assert client.post("/ring/test/control/stop", headers=TOKEN).status_code == 200
+    assert not live_ring.fight.timer_running
+
+    assert client.post("/ring/test/control/info", headers=TOKEN, json={"red_name": "X"}).status_code == 409
+    assert client.post("/ring/test/control/new_fight", headers=TOKEN).status_code == 409
+    assert client.post("/ring/test/control/new_fight", headers=TOKEN, json={"force": True}).status_code == 200
+    assert not live_ring.fight.started
+
+
+def test_control_validates_input(client):
+    assert client.post("/ring/test/control/new_fight", headers=TOKEN,
+                       json={"round_duration": 61}).status_code == 400
+    assert client.post("/ring/test/control/info", headers=TOKEN, json={"nickname": "X"}).status_code == 400
+    assert client.post("/ring/test/control/info", headers=TOKEN, json={"discipline": "Boxing"}).status_code == 400
+    assert client.post("/ring/nowhere/control/start", headers=TOKEN).status_code == 404
+
+
+def test_new_fight_creates_a_ring(client):
+    response = client.post("/ring/extra/control/new_fight", headers=TOKEN, data={"judges": "3"})
+    assert response.status_code == 200
+    assert "extra" in admin.rings
+    assert response.get_json()["ring"] == "extra"
@@ -0,0 +1,71 @@
+"""
+Fight state engine: the clock.
+"""
+import pytest
+
+import admin
+
+
+def test_clock_counts_down_only_while_running(clock):
+    fight = admin.FightState(total_rounds=2, round_duration=60, break_duration=30)
+    assert fight.tick() is None
+    assert fight.start()
+    assert not fight.start()
+    clock.advance(10.2)
+    assert fight.tick() == "tick"
+    assert fight.time_left == 50
+    fight.stop()
+    clock.advance(100)
+    assert fight.tick() is None
+    assert fight.remaining() == pytest.approx(49.8)
+    fight.start()
+    clock.advance(9.8)
+    assert fight.clock_text() == "00:40"
+
+
+def test_clock_rounds_breaks_and_end(clock):
+    fight = admin.FightState(total_rounds=2, round_duration=60, break_duration=30)
+    fight.start()
+    clock.advance(60)
+    assert not fight.can_score()
+    assert fight.tick() == "break"
+    assert fight.round_text() == "Break after Round 1"
+    assert fight.time_left == 30
+    clock.advance(30)
+    assert fight.tick() == "round"
+    assert fight.current_round == 2
+    assert fight.can_score()
+    clock.advance(60)
+    assert fight.tick() == "end"
+    assert not fight.timer_running
+
+
+def test_clock_catches_up_after_a_stall(clock):
+    fight = admin.FightState(total_rounds=2, round_duration=60, break_duration=30)
+    fight.start()
+    clock.advance(95)   # Past the round and the break, 5 s into round 2
+    assert fight.tick() == "break"
+    assert fight.tick() == "round"
+    assert fight.tick() == "tick"
+    assert fight.remaining() == pytest.approx(55)
+
+
+def test_pause_during_break_keeps_the_break(clock):
+    fight = admin.FightState(total_rounds=2, round_duration=60, break_duration=30)
+    fight.start()
+    clock.advance(60)
+    fight.tick()
+    clock.advance(10)
+    fight.stop()
+    clock.advance(500)
+    fight.start()
+    assert fight.mode == "break"
+    assert fight.remaining() == pytest.approx(20)
+
+
+def test_next_display_change(clock):
+    fight = admin.FightState(total_rounds=1, round_duration=60, break_duration=0)
+    assert fight.next_display_change() is None
+    fight.start()
+    clock.advance(0.3)
+    assert fight.next_display_change() == pytest.approx(0.7)
@@ -0,0 +1,73 @@
+"""
+Fight journal: group commit and replay after a crash.
+"""
+import pytest
+
+import admin
+
+
+def test_replay_restores_an_interrupted_fight(make_ring):
+    ring = make_ring("replay")
+    ring.resume()
+    ring.new_fight(3, 120, 45, 3)
+    ring.fight.set_info(red_name="Ana", blue_name="Bea", discipline="Point Fighting")
+    ring.fight.start()
+    ring.fight.apply_score(1, "red", "HIGH KICK RED", seq=1)
+    ring.fight.apply_score(2, "blue", "POINT BLUE", seq=1)
+    ring.fight.apply_warning("blue")
+    assert ring.journal.flush(timeout=5)
+    with open(admin.journal_path("replay"), "a", encoding="utf-8") as f:
+        f.write('{"ts": 1, "kind": "sco')   # Torn record from a crash mid-write
+
+    restored = make_ring("replay")
+    assert restored.resume()
+    fight = restored.fight
+    assert fight.fight_id == ring.fight.fight_id
+    assert fight.info["red_name"] == "Ana"
+    assert fight.scores == ring.fight.scores
+    assert fight.blue_warnings == 1
+    assert fight.judge_seq == {1: 1, 2: 1}
+    assert restored.judge_seq == {1: 1, 2: 1}
+    assert restored.judge_tokens == ring.judge_tokens
+    assert fight.started and not fight.timer_running
+
+
+def test_replay_resumes_the_clock_after_a_quiet_stretch(make_ring, clock):
+    ring = make_ring("quiet")
+    ring.resume()
+    ring.new_fight(3, 180, 45, 3)
+    ring.fight.start()
+    for _ in range(150):   # The clock loop keeps running; nobody taps
+        clock.advance(1)
+        admin.tick_ring(ring)
+    assert ring.journal.flush(timeout=5)
+
+    restored = make_ring("quiet")
+    assert restored.resume()
+    assert restored.fight.remaining() == pytest.approx(30)
+    assert restored.fight.current_round == 1
+
+
+def test_clock_checkpoints_once_per_displayed_second(make_ring, clock):
+    ring = make_ring("checkpoints")
+    ring.resume()
+    ring.new_fight(3, 180, 45, 3)
+    ring.fight.start()
+    appended = ring.journal.appended
+    for _ in range(40):
+        clock.advance(0.25)
+        admin.tick_ring(ring)
+    assert ring.journal.appended - appended == 11   # 03:00, then 02:59 down to 02:50
+
+
+def test_replay_of_a_finished_fight_starts_fresh(make_ring):
+    ring = make_ring("done")
+    ring.resume()
+    ring.new_fight(3, 120, 45, 3)
+    ring.fight.start()
+    ring.fight.ko("red")
+    assert ring.journal.flush(timeout=5)
+    restored = make_ring("done")
+    assert not restored.resume()
+    assert restored.fight.over
+    assert restored.fight.winner_text == "WINNER BLUE (KO)"
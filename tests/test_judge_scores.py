@@ -0,0 +1,78 @@
+"""
+Batched judge scores: sequence numbers, retries and gaps.
+"""
+import threading
+
+import pytest
+
+import admin
+
+
+@pytest.fixture
+def engine(live_ring):
+    """
+    The live ring, with its score queue drained as run_engine() would.
+    """
+    stop = threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            admin.drain_rings()
+            stop.wait(0.005)
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    yield live_ring
+    stop.set()
+    thread.join()
+
+
+def batch(*seqs, action="POINT RED"):
+    return [{"seq": seq, "color": action.rsplit(" ", 1)[1].lower(), "action": action} for seq in seqs]
+
+
+def test_batch_is_applied_once(engine):
+    ack = admin.submit_score_batch(engine, 1, batch(1, 2, 3))
+    assert (ack["acked"], ack["applied"], ack["rejected"]) == (3, True, [])
+    assert ack["totals"] == {"red": 3, "blue": 0}
+    ack = admin.submit_score_batch(engine, 1, batch(2, 3, 4))   # Retry of a batch that was half lost
+    assert ack["acked"] == 4
+    assert ack["totals"] == {"red": 4, "blue": 0}
+
+
+def test_batch_stops_at_a_gap(engine):
+    assert admin.submit_score_batch(engine, 2, batch(1))["acked"] == 1
+    ack = admin.submit_score_batch(engine, 2, batch(3, 4))
+    assert ack["acked"] == 1
+    assert ack["totals"] == {"red": 1, "blue": 0}
+    ack = admin.submit_score_batch(engine, 2, batch(2, 4))
+    assert ack["acked"] == 2
+    assert ack["totals"] == {"red": 2, "blue": 0}
+
+
+def test_batch_judges_are_independent(engine):
+    admin.submit_score_batch(engine, 1, batch(1, 2))
+    ack = admin.submit_score_batch(engine, 3, batch(1, action="POINT BLUE"))
+    assert ack["acked"] == 1
+    assert ack["totals"] == {"red": 0, "blue": 1}
+
+
+def test_rejected_action_uses_up_its_number(engine):
+    engine.fight.stop()
+    ack = admin.submit_score_batch(engine, 1, batch(1, 2))
+    assert ack["acked"] == 2
+    assert [item["seq"] for item in ack["rejected"]] == [1, 2]
+    assert ack["rejected"][0]["status"] == 403
+    engine.fight.start()
+    ack = admin.submit_score_batch(engine, 1, batch(2, 3))
+    assert ack["acked"] == 3
+    assert ack["totals"] == {"red": 1, "blue": 0}
+
+
+def test_batch_route_validates_input(engine):
+    client = admin.app.test_client()
+    token = engine.judge_tokens[1]
+    assert client.post(f"/ring/test/judge_scores/{token}", json={"actions": "x"}).status_code == 400
+    too_many = batch(*range(1, admin.SCORE_BATCH_MAX + 2))
+    assert client.post(f"/ring/test/judge_scores/{token}", json={"actions": too_many}).status_code == 413
+    response = client.post(f"/ring/test/judge_scores/{token}", json={"actions": batch(1)})
+    assert response.get_json()["acked"] == 1
@@ -0,0 +1,25 @@
+"""
+Tk loop monitor: the stall watchdog.
+"""
+import time
+
+import admin
+
+
+def test_watchdog_ignores_start_up_and_catches_a_stall(monkeypatch):
+    monkeypatch.setattr(admin, "LOOP_STALL_MS", 50)
+    monitor = admin.LoopMonitor()
+    time.sleep(0.1)   # Building the window and starting the server, before the first tick
+    monitor.start_watchdog()
+    try:
+        for _ in range(5):
+            time.sleep(0.02)
+            monitor.last_beat = time.monotonic()   # The scheduler ticking
+        assert monitor.stall_count == 0
+        time.sleep(0.15)   # A blocked loop
+        assert monitor.stall_count == 1
+        monitor.last_beat = time.monotonic()
+        time.sleep(0.03)
+        assert monitor.stalls[-1]["duration_ms"] >= 50
+    finally:
+        monitor.stop_watchdog()
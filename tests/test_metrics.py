@@ -0,0 +1,49 @@
+"""
+/metrics: the registry and its Prometheus text output.
+"""
+import admin
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = admin.Metrics()
+    for value in (0.002, 0.002, 0.3, 10):
+        registry.observe("kickboxing_http_request_duration_seconds", ("judge_scores", "POST"), value)
+    text = registry.render(admin.METRIC_FAMILIES, {})
+    prefix = 'kickboxing_http_request_duration_seconds_bucket{route="judge_scores",method="POST",le='
+    buckets = {line[len(prefix):].split('"')[1]: int(line.rsplit(" ", 1)[1])
+               for line in text.splitlines() if line.startswith(prefix)}
+    assert buckets["0.001"] == 0
+    assert buckets["0.0025"] == 2
+    assert buckets["0.5"] == 3
+    assert buckets["5.0"] == 3
+    assert buckets["+Inf"] == 4
+    assert 'kickboxing_http_request_duration_seconds_count{route="judge_scores",method="POST"} 4' in text
+    assert 'kickboxing_http_request_duration_seconds_sum{route="judge_scores",method="POST"} 10.304000' in text
+
+
+def test_counters_gauges_and_label_escaping():
+    registry = admin.Metrics()
+    registry.inc("kickboxing_scores_rejected_total", ("clock_stopped",))
+    registry.inc("kickboxing_scores_rejected_total", ("clock_stopped",), 2)
+    registry.inc("kickboxing_streams_refused_total", ())
+    text = registry.render(admin.METRIC_FAMILIES, {"kickboxing_spectators": {('ring "A"',): 3}})
+    assert "# TYPE kickboxing_scores_rejected_total counter" in text
+    assert 'kickboxing_scores_rejected_total{reason="clock_stopped"} 3' in text
+    assert "kickboxing_streams_refused_total 1" in text
+    assert "# TYPE kickboxing_spectators gauge" in text
+    assert 'kickboxing_spectators{ring="ring \\"A\\""} 3' in text
+
+
+def test_metrics_route_reports_requests_and_rings(live_ring):
+    client = admin.app.test_client()
+    client.get("/ring/test/public/state.json")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    text = response.get_data(as_text=True)
+    assert 'kickboxing_spectators{ring="test"} 0' in text
+    assert 'kickboxing_score_queue_depth{ring="test"} 0' in text
+    assert "kickboxing_http_requests_total{" in text
+    for line in text.splitlines():
+        if line.startswith("# TYPE"):
+            assert line.split()[2] in admin.METRIC_FAMILIES
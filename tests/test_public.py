@@ -0,0 +1,67 @@
+"""
+Public scoreboards: state deltas for streams, versioned polling.
+"""
+import json
+
+import admin
+
+
+def test_publish_sends_only_changed_keys():
+    broadcaster = admin.StateBroadcaster()
+    subscription = broadcaster.subscribe()
+    broadcaster.publish({"timer_info": "03:00", "red_name": "Ana"})
+    assert json.loads(subscription.get_nowait()) == {"timer_info": "03:00", "red_name": "Ana", "version": 1}
+    broadcaster.publish({"timer_info": "03:00", "red_name": "Ana"})
+    assert subscription.empty()
+    broadcaster.publish({"timer_info": "02:59", "red_name": "Ana"})
+    assert json.loads(subscription.get_nowait()) == {"timer_info": "02:59", "version": 2}
+    version, state, body = broadcaster.current()
+    assert version == 2
+    assert json.loads(body) == dict(state, version=2)
+
+
+def test_a_screen_that_stops_reading_is_dropped():
+    broadcaster = admin.StateBroadcaster()
+    subscription = broadcaster.subscribe()
+    for second in range(admin.SSE_CLIENT_BACKLOG + 1):
+        broadcaster.publish({"timer_info": second})
+    assert broadcaster.client_count() == 0
+    assert subscription.qsize() == admin.SSE_CLIENT_BACKLOG
+
+
+def test_stream_starts_with_the_full_state(live_ring):
+    live_ring.publish()
+    response = admin.app.test_client().get("/ring/test/public/stream", buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    assert next(chunks).startswith(b"retry:")
+    first = next(chunks).decode()
+    assert first.startswith("data: ")
+    state = json.loads(first[len("data: "):])
+    assert state["version"] == live_ring.broadcaster.current()[0]
+    assert state["round_info"] == "Round: 1 / 3"
+    assert live_ring.broadcaster.client_count() == 1
+    response.close()
+    assert live_ring.broadcaster.client_count() == 0
+
+
+def test_state_json_answers_an_unchanged_poll_with_304(live_ring):
+    client = admin.app.test_client()
+    live_ring.publish()
+    first = client.get("/ring/test/public/state.json")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert json.loads(first.data)["version"] == live_ring.broadcaster.current()[0]
+
+    assert client.get("/ring/test/public/state.json", headers={"If-None-Match": etag}).status_code == 304
+    live_ring.fight.apply_warning("red")
+    live_ring.publish()
+    changed = client.get("/ring/test/public/state.json", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert json.loads(changed.data)["red_warnings"] == 1
+
+
+def test_etags_differ_between_runs():
+    assert admin.StateBroadcaster().etag(1) != admin.StateBroadcaster().etag(1)
@@ -0,0 +1,53 @@
+"""
+Results store: completed fights in SQLite.
+"""
+import sqlite3
+
+import admin
+
+
+def test_results_store_keeps_one_row_per_fight(make_ring, journal_dir, monkeypatch):
+    store = admin.ResultsStore(str(journal_dir / "results.sqlite3"))
+    monkeypatch.setattr(admin, "results_store", store)
+    ring = make_ring("store")
+    ring.resume()
+    ring.new_fight(3, 120, 45, 3)
+    ring.fight.set_info(red_name="Ana", blue_name="Bea", discipline="Point Fighting")
+    ring.fight.start()
+    ring.fight.apply_score(1, "red", "POINT RED")
+    ring.fight.end_by_points("red")
+    ring.publish()
+    ring.publish()
+    assert store.queued == 1
+    assert ring.journal.flush(timeout=5)
+
+    # A restart replays the finished fight and hands it to the store again.
+    restored = make_ring("store")
+    assert not restored.resume()
+    assert store.queued == 2
+    assert store.flush(timeout=5)
+
+    conn = sqlite3.connect(store.path)
+    assert conn.execute("SELECT fight_id, red_name, winner FROM fights").fetchall() == [
+        (ring.fight.fight_id, "Ana", "red")]
+    assert conn.execute("SELECT COUNT(*) FROM judge_scores").fetchone() == (9,)
+    assert conn.execute("SELECT red, blue FROM judge_scores WHERE judge = 1 AND round = 1").fetchone() == (1, 0)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    conn.close()
+
+
+def test_next_fight_gets_its_own_row(make_ring, journal_dir, monkeypatch):
+    store = admin.ResultsStore(str(journal_dir / "results.sqlite3"))
+    monkeypatch.setattr(admin, "results_store", store)
+    ring = make_ring("store")
+    ring.resume()
+    for loser in ("red", "blue"):
+        ring.new_fight(3, 120, 45, 3)
+        ring.fight.start()
+        ring.fight.ko(loser)
+        ring.publish()
+    assert store.flush(timeout=5)
+    conn = sqlite3.connect(store.path)
+    assert conn.execute("SELECT result FROM fights ORDER BY rowid").fetchall() == [
+        ("WINNER BLUE (KO)",), ("WINNER RED (KO)",)]
+    conn.close()
@@ -0,0 +1,90 @@
+"""
+Rings: isolated per-mat state, judge token index, and reopening on launch.
+"""
+import os
+
+import pytest
+
+import admin
+
+
+@pytest.fixture
+def registry(journal_dir):
+    """
+    An empty ring registry, restored afterwards.
+    """
+    saved = dict(admin.rings)
+    admin.rings.clear()
+    yield admin.rings
+    for ring in admin.rings.values():
+        ring.set_judge_tokens({})
+    admin.rings.clear()
+    admin.rings.update(saved)
+
+
+def journal_a_fight(ring_id, finished):
+    ring = admin.Ring(ring_id)
+    ring.resume()
+    ring.new_fight(3, 120, 45, 3)
+    ring.fight.start()
+    if finished:
+        ring.fight.ko("red")
+    ring.journal.close()
+    ring.set_judge_tokens({})
+
+
+def test_open_rings_brings_back_only_unfinished_fights(registry, journal_dir):
+    journal_a_fight("old", finished=True)
+    journal_a_fight("live", finished=False)
+    journal_a_fight("1", finished=True)
+    admin.add_ring("1")
+    admin.open_rings(3, 180, 45, 3)
+
+    assert sorted(registry) == ["1", "live"]
+    assert registry["live"].fight.started and not registry["live"].fight.over
+    assert not registry["1"].fight.started and not registry["1"].fight.over
+    assert sorted(admin.journalled_ring_ids()) == ["1", "live"]
+    archived = sorted(os.listdir(admin.journal_archive_dir()))
+    assert [name.split(".")[0] for name in archived] == ["fight_journal_1", "fight_journal_old"]
+
+    # The launch ring's new fight is journalled in a fresh file.
+    assert registry["1"].journal.flush(timeout=5)
+    with open(admin.journal_path("1"), encoding="utf-8") as f:
+        assert '"kind": "ko"' not in f.read()
+    for ring in registry.values():
+        ring.journal.close()
+
+
+def test_token_index_finds_the_judge_across_rings(registry):
+    rings = [admin.add_ring(ring_id) for ring_id in ("1", "2")]
+    for ring in rings:
+        ring.resume()
+        ring.new_fight(3, 120, 45, 3)
+    for ring in rings:
+        for judge_num, token in ring.judge_tokens.items():
+            assert admin.judge_for_token(token) == (ring, judge_num)
+    assert admin.judge_for_token("not-a-token") == (None, None)
+    assert len(admin.token_index) >= 6
+
+
+def test_token_index_follows_new_fights_and_panel_changes(registry):
+    ring = admin.add_ring("1")
+    ring.resume()
+    ring.new_fight(3, 120, 45, 3)
+    old = dict(ring.judge_tokens)
+    ring.new_fight(3, 120, 45, 3)
+    assert all(admin.judge_for_token(token) == (None, None) for token in old.values())
+    kept = dict(ring.judge_tokens)
+    ring.configure(3, 120, 45, 5)
+    assert {judge_num: ring.judge_tokens[judge_num] for judge_num in kept} == kept
+    assert admin.judge_for_token(ring.judge_tokens[5]) == (ring, 5)
+
+
+def test_a_token_only_scores_on_its_own_ring(registry):
+    rings = [admin.add_ring(ring_id) for ring_id in ("1", "2")]
+    for ring in rings:
+        ring.resume()
+        ring.new_fight(3, 120, 45, 3)
+    token = rings[0].judge_tokens[1]
+    response = admin.app.test_client().post(f"/ring/2/judge_scores/{token}", json={"actions": []})
+    assert response.status_code == 403
@@ -0,0 +1,78 @@
+"""
+Admin window scheduler: named tasks on one fixed-cadence tick.
+"""
+import pytest
+
+import admin
+
+
+class FakeRoot:
+    def after(self, ms, func):
+        return "after#1"
+
+
+@pytest.fixture
+def scheduler(monkeypatch, clock):
+    monkeypatch.setattr(admin, "root", FakeRoot())
+    monitor = admin.LoopMonitor()
+    monkeypatch.setattr(monitor, "start_watchdog", lambda: None)
+    monkeypatch.setattr(admin, "loop_monitor", monitor)
+    return admin.Scheduler(admin.TICK_MS)
+
+
+def run_for(scheduler, clock, seconds, step=0.016):
+    for _ in range(round(seconds / step)):
+        clock.advance(step)
+        scheduler._tick()
+
+
+def test_same_name_replaces_the_task(scheduler, clock):
+    runs = []
+    scheduler.every("blink", 500, lambda: runs.append("first"))
+    scheduler.every("blink", 500, lambda: runs.append("second"))
+    run_for(scheduler, clock, 1.1)
+    assert runs == ["second", "second"]
+
+
+def test_cancel_and_once(scheduler, clock):
+    runs = []
+    scheduler.every("blink", 100, lambda: runs.append("blink"))
+    scheduler.once("hide_notice", 50, lambda: runs.append("hide"))
+    run_for(scheduler, clock, 0.25)
+    scheduler.cancel("blink")
+    assert not scheduler.scheduled("blink")
+    assert not scheduler.scheduled("hide_notice")
+    run_for(scheduler, clock, 1)
+    assert runs.count("hide") == 1
+    assert runs.count("blink") == 2
+
+
+def test_a_task_can_cancel_another_in_the_same_tick(scheduler, clock):
+    runs = []
+    scheduler.every("stop_blinking", 100, lambda: scheduler.cancel("blink"))
+    scheduler.every("blink", 100, lambda: runs.append("blink"))
+    run_for(scheduler, clock, 0.2)
+    assert runs == []
+
+
+def test_returned_delay_overrides_the_interval(scheduler, clock):
+    runs = []
+
+    def clock_task():
+        runs.append(clock.now)
+        return 300
+    scheduler.every("clock", 1000, clock_task, delay_ms=0)
+    run_for(scheduler, clock, 1)
+    assert len(runs) == 4
+
+
+def test_a_late_task_runs_once_and_a_failing_one_does_not_stop_the_others(scheduler, clock, capsys):
+    runs = []
+    scheduler.every("widget_view", 16, lambda: runs.append("view"))
+    scheduler.every("broken", 16, lambda: 1 / 0)
+    clock.advance(1)   # A long stall
+    scheduler._tick()
+    scheduler._tick()
+    assert runs == ["view"]
+    assert "ZeroDivisionError" in capsys.readouterr().err
+    assert scheduler.scheduled("broken")
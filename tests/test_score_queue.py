@@ -0,0 +1,46 @@
+"""
+Score inbox: taps are queued by the web threads and applied once per frame.
+"""
+import threading
+
+import admin
+
+
+def queue_taps(ring, taps, judges=(1, 2, 3), action="POINT RED"):
+    done = []
+    for _ in range(taps):
+        for judge_num in judges:
+            event = threading.Event()
+            ring.score_queue.put(judge_num, "red", action, done=event)
+            done.append(event)
+    return done
+
+
+def test_drain_applies_every_queued_tap(live_ring):
+    done = queue_taps(live_ring, 4)
+    admin.drain_rings()
+    assert all(event.is_set() for event in done)
+    assert live_ring.fight.scores == {judge_num: {"red": 4, "blue": 0} for judge_num in (1, 2, 3)}
+    stats = live_ring.score_queue.stats()
+    assert (stats["enqueued"], stats["applied"], stats["rejected"], stats["depth"]) == (12, 12, 0, 0)
+
+
+def test_taps_after_the_early_stop_are_rejected(live_ring):
+    live_ring.fight.set_info(discipline="Kick Light")
+    done = queue_taps(live_ring, 20)
+    admin.drain_rings()
+    assert all(event.is_set() for event in done)
+    # Judges 1 and 2 reach the 15-point margin on the same pass; judge 3 is one tap behind.
+    assert [live_ring.fight.card(j)["red"] for j in (1, 2, 3)] == [15, 15, 14]
+    assert live_ring.fight.over and live_ring.fight.winner_color == "red"
+    stats = live_ring.score_queue.stats()
+    assert (stats["applied"], stats["rejected"]) == (44, 16)
+
+
+def test_taps_queued_before_a_knockout_are_rejected(live_ring):
+    done = queue_taps(live_ring, 2)
+    live_ring.fight.ko("blue")
+    admin.drain_rings()
+    assert all(event.is_set() for event in done)
+    assert live_ring.fight.card(1) == {"red": 0, "blue": 0}
+    assert live_ring.score_queue.stats()["rejected"] == 6
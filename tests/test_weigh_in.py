@@ -0,0 +1,50 @@
+"""
+Weigh-in classifier: age and weight category boundaries.
+"""
+import pytest
+
+import admin
+
+
+@pytest.mark.parametrize("discipline, gender, age, weight, expected", [
+    ("Point Fighting", "Male", 7, 18, ("Children", "-18 kg")),
+    ("Point Fighting", "Male", 9, 18.1, ("Children", "-21 kg")),
+    ("Point Fighting", "Male", 10, 36, ("Younger Cadets", "-37 kg")),
+    ("Point Fighting", "Male", 40, 94, ("Seniors", "-94 kg")),
+    ("Point Fighting", "Male", 40, 94.1, ("Seniors", "+94 kg")),
+    ("Point Fighting", "Female", 41, 65.5, ("Masters", "+65 kg")),
+    ("Point Fighting", "Female", 55, 55, ("Masters", "-55 kg")),
+    ("Full Contact", "Male", 15, 41, ("Younger Juniors", "-42 kg")),
+    ("Full Contact", "Male", 18, 91, ("Older Juniors", "-91 kg")),
+    ("Full Contact", "Female", 19, 71, ("Seniors", "+70 kg")),
+])
+def test_classify_athlete_boundaries(discipline, gender, age, weight, expected):
+    assert admin.classify_athlete(discipline, gender, age, weight) == expected + ("",)
+
+
+@pytest.mark.parametrize("discipline, age", [
+    ("Point Fighting", 6),
+    ("Point Fighting", 56),
+    ("Full Contact", 14),
+    ("Full Contact", 41),
+])
+def test_classify_athlete_outside_age_categories(discipline, age):
+    age_category, weight_category, problem = admin.classify_athlete(discipline, "Male", age, 60)
+    assert (age_category, weight_category) == ("", "")
+    assert "no age category" in problem
+
+
+def test_classify_athlete_unknown_discipline():
+    assert "unknown discipline" in admin.classify_athlete("Boxing", "Male", 20, 70)[2]
+
+
+def test_classify_weigh_in_rows():
+    rows = [
+        {"name": "Ana", "gender": "f", "age": "16", "discipline": "Kick Light", "weight": "54,5 kg"},
+        {"name": "Bo", "gender": "x", "age": "16", "discipline": "Kick Light", "weight": "54"},
+        {"name": "Cy", "gender": "M", "age": "old", "discipline": "Kick Light", "weight": "54"},
+    ]
+    out = list(admin.classify_weigh_in(rows))
+    assert (out[0]["age_category"], out[0]["weight_category"], out[0]["problem"]) == ("Juniors", "-55 kg", "")
+    assert "unknown gender" in out[1]["problem"]
+    assert out[2]["problem"] == "age or weight is not a number"
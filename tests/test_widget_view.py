@@ -0,0 +1,53 @@
+"""
+Admin window widget view: dirty-tracked label updates.
+"""
+import admin
+
+
+class FakeLabel:
+    def __init__(self):
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append(options)
+
+
+def test_flush_configures_only_what_changed():
+    view = admin.WidgetView(16)
+    red, blue = FakeLabel(), FakeLabel()
+    view.set(red, text="1")
+    view.set(red, text="2", fg="red")   # Same frame: only the last value counts
+    view.set(blue, text="0")
+    view.flush()
+    assert red.calls == [{"text": "2", "fg": "red"}]
+    assert blue.calls == [{"text": "0"}]
+
+    view.set(red, text="2", fg="red")
+    view.set(blue, text="1")
+    view.flush()
+    assert len(red.calls) == 1
+    assert blue.calls[-1] == {"text": "1"}
+    view.set(red, text="3", fg="red")
+    view.flush()
+    assert red.calls[-1] == {"text": "3"}
+    assert view.configs == 4
+
+
+def test_nothing_pending_means_no_config_calls():
+    view = admin.WidgetView(16)
+    label = FakeLabel()
+    view.set(label, text="00:10")
+    view.flush()
+    view.flush()
+    assert len(label.calls) == 1
+
+
+def test_a_forgotten_widget_is_redrawn_in_full():
+    view = admin.WidgetView(16)
+    label = FakeLabel()
+    view.set(label, text="A")
+    view.flush()
+    view.forget(label)
+    view.set(label, text="A")
+    view.flush()
+    assert label.calls == [{"text": "A"}, {"text": "A"}]